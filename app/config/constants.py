@@ -45,17 +45,33 @@ def resolve_resource_dir(rel_path):
 
 # 统一配置文件
 SETTINGS_FILE = os.path.join(BASE_DIR, "settings.json")
+# 配置写盘合并窗口（秒）：窗口内的多次修改只写一次盘
+SETTINGS_SAVE_DELAY = 0.5
+# 轮询 settings.json 外部修改的间隔（毫秒）：只 stat，文件变了才重新解析
+SETTINGS_POLL_INTERVAL_MS = 2000
 
 # 旧配置文件（用于迁移）
 OLD_FLEXIBLE_MODE_FILE = os.path.join(BASE_DIR, "flexible_mode.txt")
 OLD_REMINDER_SETTINGS_FILE = os.path.join(BASE_DIR, "reminder_settings.txt")
 
 START_TIME_FILE = os.path.join(BASE_DIR, "start_time.txt")
+# 启动时间二进制日志（旁边还有 .idx 按天索引），取代逐行追加的 start_time.txt
+START_TIME_JOURNAL = os.path.join(BASE_DIR, "start_time.journal")
 LOG_FILE = os.path.join(BASE_DIR, "app.log")
+# 更新下载镜像的成功率 / 耗时记录（utils/mirror_stats.py），用于给镜像排序
+MIRROR_STATS_FILE = os.path.join(BASE_DIR, "mirror_stats.json")
+# 上一次查到的最新版本信息及其 ETag（utils/release_cache.py）
+RELEASE_CACHE_FILE = os.path.join(BASE_DIR, "release_cache.json")
 ICON_FILE = resolve_resource("images/icon.png")
 
 DEFAULT_TIMER_IMAGE = resolve_resource("images/timer1.png")
 IMAGE_DIRECTORY = resolve_resource_dir("images/timers")
+# 倒计时宠物图的逻辑尺寸（像素）
+PET_IMAGE_SIZE = (60, 60)
+# 构建时预处理好的透明图（bake_assets.py 生成，随 images/ 一起打包）
+BAKED_ASSET_DIR = os.path.join(RESOURCE_DIR, "images", "baked")
+# 透明化后图片的磁盘缓存（按内容哈希命名，首次写入时创建）
+IMAGE_CACHE_DIR = os.path.join(BASE_DIR, "image_cache")
 
 # 源码运行时保证图片目录存在；打包运行时图片由 --add-data 提供，无需创建
 if not getattr(sys, 'frozen', False):
@@ -64,6 +80,8 @@ if not getattr(sys, 'frozen', False):
 
 WINDOW_SIZE_WIDTH = 200
 WINDOW_SIZE_HEIGHT = 200
+# 置顶看门狗检查间隔（毫秒）：平时靠事件驱动，看门狗只兜底
+STAY_ON_TOP_WATCHDOG_MS = 5000
 
 DIALOG_POSITION_X = 700
 DIALOG_POSITION_Y = 500
@@ -78,6 +96,8 @@ DEFAULT_WORK_HOURS = 8.5
 DEFAULT_FIXED_START_HOUR = 9.0
 DEFAULT_JOB_RECORD_BEFORE_END_MINUTES = 60
 DEFAULT_CHECK_UPDATE_DELAY = 10
+# 最新版本信息的缓存有效期（秒）：期内的检查不联网，过期后发条件请求
+DEFAULT_UPDATE_CHECK_TTL = 3600
 DEFER_UPDATE_DAYS = 7
 
 # 默认设置
@@ -86,6 +106,7 @@ DEFAULT_SETTINGS = {
     "run_on_startup": False,
     "auto_check_update": True,
     "check_update_delay": DEFAULT_CHECK_UPDATE_DELAY,
+    "update_check_ttl": DEFAULT_UPDATE_CHECK_TTL,
     "defer_update_until": None,
     "work_hours": DEFAULT_WORK_HOURS,
     "fixed_start_hour": DEFAULT_FIXED_START_HOUR,
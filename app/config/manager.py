@@ -6,14 +6,25 @@ from app.config.constants import (
     OLD_FLEXIBLE_MODE_FILE,
     OLD_REMINDER_SETTINGS_FILE,
     DEFAULT_SETTINGS,
+    DEFAULT_UPDATE_CHECK_TTL,
     DEFER_UPDATE_DAYS,
+    SETTINGS_SAVE_DELAY,
 )
+from app.config.persistence import SettingsWriter
+from app.utils.lazy import LazyProxy
 from app.utils.logger import logger
 
 
 class ConfigManager:
-    def __init__(self):
+    def __init__(self, settings_file=SETTINGS_FILE, save_delay=SETTINGS_SAVE_DELAY):
+        self._settings_file = settings_file
         self._settings = DEFAULT_SETTINGS.copy()
+        self._settings["reminders"] = dict(DEFAULT_SETTINGS["reminders"])
+        self._writer = SettingsWriter(settings_file, self._snapshot, delay=save_delay,
+                                      on_written=self._remember_signature)
+        # 最近一次读/写时 settings.json 的 (mtime_ns, size)，用于判断文件是否被外部修改
+        self._signature = None
+        self._listeners = []
         logger.debug("ConfigManager initializing...")
         self._migrate_old_files()
         self._load()
@@ -25,35 +36,120 @@ class ConfigManager:
 
     # ── 文件读写 ──────────────────────────────────────────
 
+    def _read_file(self):
+        """读取并与默认值合并，返回新的配置字典（不修改 self._settings）。"""
+        with open(self._settings_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # 合并：保留旧 key 缺失时用默认值
+        merged = DEFAULT_SETTINGS.copy()
+        merged.update(data)
+        # reminders 子字典也要合并（总是新建，避免改到 DEFAULT_SETTINGS 里的共享字典）
+        merged["reminders"] = dict(DEFAULT_SETTINGS["reminders"])
+        if "reminders" in data and isinstance(data["reminders"], dict):
+            merged["reminders"].update(data["reminders"])
+        return merged
+
     def _load(self):
         try:
-            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            # 合并：保留旧 key 缺失时用默认值
-            merged = DEFAULT_SETTINGS.copy()
-            merged.update(data)
-            # reminders 子字典也要合并
-            if "reminders" in data and isinstance(data["reminders"], dict):
-                merged["reminders"] = {**DEFAULT_SETTINGS["reminders"], **data["reminders"]}
-            self._settings = merged
-            logger.debug(f"Settings loaded from {SETTINGS_FILE}")
+            # 先取签名再读：读的过程中文件又被改，下次轮询还能发现
+            signature = self._file_signature()
+            self._settings = self._read_file()
+            self._signature = signature
+            logger.debug(f"Settings loaded from {self._settings_file}")
         except FileNotFoundError:
-            logger.info(f"Settings file not found, creating default: {SETTINGS_FILE}")
+            logger.info(f"Settings file not found, creating default: {self._settings_file}")
             self._save()
         except Exception as e:
             logger.error(f"Failed to load settings: {e}", exc_info=True)
 
-    def _save(self):
+    def _file_signature(self):
         try:
-            with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-                json.dump(self._settings, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Settings saved to {SETTINGS_FILE}")
+            st = os.stat(self._settings_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _remember_signature(self):
+        """写盘完成回调：记下自己写出的文件签名，避免把自己的写入当成外部修改。"""
+        self._signature = self._file_signature()
+
+    # ── 热加载 ────────────────────────────────────────────
+
+    def subscribe(self, callback):
+        """订阅外部修改 settings.json 引起的配置变化：callback(key, old, new)。
+
+        key 为顶层键名；reminders 子项按 ``reminders.<name>`` 逐项通知。
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def reload_if_changed(self) -> list:
+        """文件 mtime/size 变化时重新解析，并按键通知订阅者；返回变化的键列表。
+
+        只做一次 stat，文件没变时不读不解析，适合定时轮询。
+        本地还有未落盘的修改时跳过（以本地修改为准，写盘后签名会刷新）。
+        """
+        signature = self._file_signature()
+        if signature is None or signature == self._signature or self._writer.pending:
+            return []
+        try:
+            new_settings = self._read_file()
         except Exception as e:
-            logger.error(f"Failed to save settings: {e}", exc_info=True)
+            # 可能正被编辑器写到一半；不更新签名，下次轮询重试
+            logger.warning(f"Settings reload skipped, file unreadable: {e}")
+            return []
+        self._signature = signature
+        old_flat = self._flatten(self._settings)
+        new_flat = self._flatten(new_settings)
+        changed = [key for key in sorted(set(old_flat) | set(new_flat))
+                   if old_flat.get(key) != new_flat.get(key)]
+        self._settings = new_settings
+        if not changed:
+            return []
+        logger.info(f"Settings reloaded from disk, changed: {changed}")
+        for key in changed:
+            for callback in list(self._listeners):
+                try:
+                    callback(key, old_flat.get(key), new_flat.get(key))
+                except Exception as e:
+                    logger.error(f"Settings listener failed for '{key}': {e}", exc_info=True)
+        return changed
+
+    @staticmethod
+    def _flatten(settings):
+        flat = {k: v for k, v in settings.items() if k != "reminders"}
+        for name, value in (settings.get("reminders") or {}).items():
+            flat[f"reminders.{name}"] = value
+        return flat
+
+    def _save(self):
+        """请求保存：由 SettingsWriter 合并窗口期内的修改并在后台线程写盘。"""
+        self._writer.schedule()
+
+    def _snapshot(self):
+        """写盘线程调用：浅拷贝当前配置（dict 拷贝在 GIL 下是原子的），
+        避免序列化过程中 GUI 线程改动字典导致迭代出错。"""
+        data = dict(self._settings)
+        if isinstance(data.get("reminders"), dict):
+            data["reminders"] = dict(data["reminders"])
+        return data
+
+    def flush(self):
+        """立即把尚未落盘的修改写入 settings.json（退出前调用）。"""
+        self._writer.flush()
+
+    @property
+    def save_count(self) -> int:
+        """实际写盘次数（测试断言用）。"""
+        return self._writer.write_count
 
     def _migrate_old_files(self):
         """将旧的 flexible_mode.txt / reminder_settings.txt 迁移到 settings.json"""
-        if os.path.exists(SETTINGS_FILE):
+        if os.path.exists(self._settings_file):
             return  # 已有新配置，不覆盖
 
         migrated = False
@@ -81,7 +177,9 @@ class ConfigManager:
                 pass
 
         if migrated:
+            # 删除旧文件前必须确认新配置已落盘
             self._save()
+            self.flush()
             logger.info("Migrated old config files to settings.json")
             # 删除旧文件
             for old_file in (OLD_FLEXIBLE_MODE_FILE, OLD_REMINDER_SETTINGS_FILE):
@@ -140,6 +238,17 @@ class ConfigManager:
         self._save()
         logger.info(f"check_update_delay changed: {old} -> {value}")
 
+    @property
+    def update_check_ttl(self) -> int:
+        return self._settings.get("update_check_ttl", DEFAULT_UPDATE_CHECK_TTL)
+
+    @update_check_ttl.setter
+    def update_check_ttl(self, value: int):
+        old = self._settings.get("update_check_ttl", DEFAULT_UPDATE_CHECK_TTL)
+        self._settings["update_check_ttl"] = value
+        self._save()
+        logger.info(f"update_check_ttl changed: {old} -> {value}")
+
     def should_auto_check(self) -> bool:
         """是否应该执行自动检测：开关打开 且 defer 已过期/不存在"""
         if not self.auto_check_update:
@@ -238,6 +347,7 @@ class ConfigManager:
             "run_on_startup": self.run_on_startup,
             "auto_check_update": self.auto_check_update,
             "check_update_delay": self.check_update_delay,
+            "update_check_ttl": self.update_check_ttl,
             "work_hours": self.work_hours,
             "fixed_start_hour": self.fixed_start_hour,
             "job_record_before_end_minutes": self.job_record_before_end_minutes,
@@ -246,7 +356,7 @@ class ConfigManager:
 
     def apply_changes(self, flexible_mode=None, run_on_startup=None,
                       auto_check_update=None, check_update_delay=None,
-                      work_hours=None, fixed_start_hour=None,
+                      update_check_ttl=None, work_hours=None, fixed_start_hour=None,
                       job_record_before_end_minutes=None, reminders=None):
         """批量写入（避免多次 save）"""
         changes = []
@@ -262,6 +372,9 @@ class ConfigManager:
         if check_update_delay is not None:
             changes.append(f"check_update_delay: {self._settings.get('check_update_delay')} -> {check_update_delay}")
             self._settings["check_update_delay"] = check_update_delay
+        if update_check_ttl is not None:
+            changes.append(f"update_check_ttl: {self._settings.get('update_check_ttl')} -> {update_check_ttl}")
+            self._settings["update_check_ttl"] = update_check_ttl
         if work_hours is not None:
             changes.append(f"work_hours: {self._settings.get('work_hours')} -> {work_hours}")
             self._settings["work_hours"] = work_hours
@@ -279,4 +392,5 @@ class ConfigManager:
             logger.info(f"Settings batch update: {'; '.join(changes)}")
 
 
-config_manager = ConfigManager()
+# 第一次访问属性时才创建（读配置 / 迁移旧文件），导入本模块不做任何 I/O
+config_manager = LazyProxy(ConfigManager)
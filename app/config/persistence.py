@@ -0,0 +1,90 @@
+"""settings.json 写盘层：合并短时间内的多次修改，后台线程原子写入。
+
+ConfigManager 的每个 setter 都会请求保存，同步写盘会卡 Qt GUI 线程，
+连续修改还会重复写同一个文件。SettingsWriter 把一个时间窗口内的保存
+请求合并成一次写盘，在后台线程里先写临时文件再 ``os.replace``，
+保证崩溃时 settings.json 要么是旧内容要么是新内容，不会写出半个文件。
+"""
+import json
+import os
+import threading
+
+from app.utils.logger import logger
+
+
+class SettingsWriter:
+    """合并写盘请求的 settings.json 写入器。
+
+    - ``schedule()``：标记有待写入的修改；窗口内只写一次；
+    - ``flush()``：立即同步写入尚未落盘的修改（退出程序前调用）；
+    - ``write_count``：实际写盘次数，测试用来断言 N 次修改只写一次。
+
+    delay 为 0 时 schedule() 直接同步写入。写盘成功后调用 on_written()。
+    """
+
+    def __init__(self, path, snapshot, delay=0.5, on_written=None):
+        self.path = path
+        self.delay = delay
+        self.write_count = 0
+        self._snapshot = snapshot
+        self._on_written = on_written
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer = None
+        self._dirty = False
+
+    @property
+    def pending(self) -> bool:
+        """是否有尚未落盘（或正在写）的修改。"""
+        return self._dirty or self._write_lock.locked()
+
+    def schedule(self):
+        """请求保存；窗口期内的后续请求合并进同一次写盘。"""
+        if self.delay <= 0:
+            self._dirty = True
+            self.flush()
+            return
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.delay, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """立即写入未落盘的修改（取消待执行的定时写入）。"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._write_if_dirty()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self._write_if_dirty()
+
+    def _write_if_dirty(self):
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            data = self._snapshot()
+            try:
+                self._write(data)
+            except Exception as e:
+                logger.error(f"Failed to save settings: {e}", exc_info=True)
+
+    def _write(self, data):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.write_count += 1
+        if self._on_written:
+            self._on_written()
+        logger.debug(f"Settings saved to {self.path} (write #{self.write_count})")
@@ -1,4 +1,5 @@
 import os
+import time
 import random
 import datetime
 from PyQt5.QtCore import Qt, QTimer, QEvent, QObject
@@ -6,22 +7,48 @@ from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import QWidget, QLabel, QMessageBox, QApplication, QSystemTrayIcon, QVBoxLayout
 
 from app.config.constants import (
-    ICON_FILE, IMAGE_DIRECTORY, WINDOW_SIZE_WIDTH, WINDOW_SIZE_HEIGHT
+    ICON_FILE, IMAGE_DIRECTORY, PET_IMAGE_SIZE, WINDOW_SIZE_WIDTH, WINDOW_SIZE_HEIGHT,
+    SETTINGS_POLL_INTERVAL_MS, STAY_ON_TOP_WATCHDOG_MS,
 )
 from app.config.manager import config_manager
 from app.services import time_service, system_service, update_service, keyboard_service
+from app.services.update_service import GITHUB_PROXY_MIRRORS
 from app.ui import (
     TrayMenu,
     SettingsDialog,
     CustomTimerDialog,
     ReminderDialog,
     CustomAsciiHelpDialog,
+    MirrorStatusDialog,
+    DisplayState,
+    StayOnTopGuardian,
+    TickScheduler,
+    ReminderScheduler,
+    AsyncPixmapLoader,
     ascii_art,
 )
-from app.utils.image import transparent_pixmap
+from app.ui.tick_scheduler import ms_until_display_change
+from app.utils.image_index import ImageDirectoryIndex
 from app.utils.logger import logger
 
 
+WINDOW_FLAGS = Qt.FramelessWindowHint | Qt.Tool | Qt.WindowStaysOnTopHint
+
+# 显示模式重掷 / 待机形象轮换周期（秒），下班前多久切到犯困场景（毫秒）
+MODE_ROLL_SECONDS = 60
+IDLE_SWITCH_SECONDS = 20
+SLEEPY_BEFORE_MS = 10 * 60 * 1000
+# 庆祝动画播放时长（秒）
+CELEBRATE_SECONDS = 4
+
+# 统一提醒调度里的提醒名
+REMINDER_CHECKOUT = 'checkout'
+REMINDER_JOB_RECORD = 'job_record'
+REMINDER_CUSTOM = 'custom'
+REMINDER_CELEBRATE_END = 'celebrate_end'
+REMINDER_UPDATE_CHECK = 'update_check'
+
+
 class _DragFilter(QObject):
     """让鼠标落在子控件（图片 / ASCII 标签）上也能拖动整个窗口。
 
@@ -55,16 +82,34 @@ class MainWindow(QWidget):
         super().__init__()
         self.app = app
         logger.debug("MainWindow.__init__ start")
+        # 无论以哪种方式退出（托盘 Quit、注销 / 关机、app.quit()），都把合并窗口内
+        # 还没写盘的设置落盘；exit_app 里的 flush 之后这里再调用是空操作
+        self.app.aboutToQuit.connect(config_manager.flush)
+        # 所有提醒（下班 / 日志 / 自定义倒计时 / 庆祝结束 / 更新检查）共用一个调度器
+        self._reminders = ReminderScheduler(self)
+        # 下班 / 日志提醒当天已弹出的日期，配置热加载时不再重复弹
+        self._fired_reminders = {}
+        # 宠物图片目录索引：首次取图时扫描，之后目录变化才重新扫描
+        self._image_index = ImageDirectoryIndex(IMAGE_DIRECTORY, parent=self)
+        # 宠物图片在线程池里解码 + 透明化，完成后再贴到 countdown_label
+        self._pet_loader = AsyncPixmapLoader(self)
+        self._pet_loader.ready.connect(self._on_pet_image_ready)
+        self._pet_loader.failed.connect(self._on_pet_image_failed)
+        self._pet_image_path = None
+        self._screen_handle = None
         self._setup_ui()
         self._setup_tray_menu()
         self._setup_timers()
         self._setup_keyboard_hook()
         self._schedule_auto_update_check()
+        self._setup_display_ticks()
         logger.info("MainWindow initialization complete")
 
     def _setup_ui(self):
         logger.debug("Setting up UI components")
         self.setFocusPolicy(Qt.StrongFocus)
+        # 记录各标签上一次显示的内容，内容不变时跳过 setText/adjustSize 等重绘
+        self._display_state = DisplayState()
 
         # 图片模式：随机轮换图片
         self.countdown_label = QLabel(self)
@@ -85,11 +130,6 @@ class MainWindow(QWidget):
         self.ascii_label.setContextMenuPolicy(Qt.CustomContextMenu)
         self.ascii_label.customContextMenuRequested.connect(self.show_context_menu)
 
-        self.display_timer = QTimer(self)
-        self.display_timer.timeout.connect(self.update_timer_display)
-        self.display_timer.start(100)
-        logger.debug("Display timer started (100ms interval)")
-
         self.time_label = QLabel('', self)
         self.time_label.setAlignment(Qt.AlignCenter)
         self.time_label.setStyleSheet("background: transparent; color: #000000; font-size: 10px; font-weight: bold;")
@@ -110,13 +150,15 @@ class MainWindow(QWidget):
         layout.addWidget(self.time_label, 0, Qt.AlignHCenter)
 
         self.setParent(None)
-        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Tool | Qt.WindowStaysOnTopHint)
+        self.setWindowFlags(WINDOW_FLAGS)
         screen_rect = QApplication.primaryScreen().availableGeometry()
         x = screen_rect.right() - WINDOW_SIZE_WIDTH - 10
         y = screen_rect.top() + 10
         self.setGeometry(x, y, WINDOW_SIZE_WIDTH, WINDOW_SIZE_HEIGHT)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.show()
+        # 置顶由守护按事件处理（被遮挡/隐藏/最小化），不再每帧重设窗口标志
+        self._stay_on_top = StayOnTopGuardian(self, WINDOW_FLAGS, STAY_ON_TOP_WATCHDOG_MS)
         logger.debug(f"Window positioned at ({x}, {y}), size=({WINDOW_SIZE_WIDTH}x{WINDOW_SIZE_HEIGHT})")
 
         self._setup_ascii_animation()
@@ -129,40 +171,86 @@ class MainWindow(QWidget):
         if is_first_start:
             time_service.write_start_time(current_time)
 
+        # 下班/日志提醒都以本次启动时间为基准；配置热加载时用它重新计算
+        self._start_time = current_time
+        # 启动时已过点的提醒照旧立即弹出；之后的热加载只安排还没到的
+        self._schedule_checkout_reminder(catch_up=True)
+        self._schedule_job_record_reminder(catch_up=True)
+
+        if is_first_start and config_manager.get_reminder_setting('checkin_reminder'):
+            # 推迟到事件循环启动后弹出：打卡提醒已改为非模态，不再阻塞初始化；
+            # 延迟到主窗口显示完成后再弹出体验更好。
+            QTimer.singleShot(0, self.show_checkin_reminder)
+
+        config_manager.subscribe(self._on_setting_changed)
+        self._settings_watch_timer = QTimer(self)
+        self._settings_watch_timer.timeout.connect(config_manager.reload_if_changed)
+        self._settings_watch_timer.start(SETTINGS_POLL_INTERVAL_MS)
+
+    def _calculate_reminder_times(self):
         is_flexible = config_manager.is_flexible
         _, work_end_time, job_record_time = time_service.calculate_work_end_time(
-            start_time=current_time, is_flexible=is_flexible
+            start_time=self._start_time, is_flexible=is_flexible
         )
-
         self.timer_expiry = work_end_time
-        logger.info(f"Timer setup: now={current_time.strftime('%H:%M')}, "
-                     f"flexible={is_flexible}, work_end={work_end_time.strftime('%H:%M')}")
-
-        checkout_enabled = config_manager.get_reminder_setting('checkout_reminder')
-        if checkout_enabled:
-            delay = time_service.calculate_remaining_seconds(work_end_time)
-            self.timer_type = delay
-            logger.info(f"Checkout reminder enabled, delay={delay:.0f}s "
-                        f"({delay/60:.1f}min)")
-            self.reminder_timer = QTimer(self)
-            self.reminder_timer.timeout.connect(self.show_checkout_reminder)
-            self.reminder_timer.setSingleShot(True)
-            self.reminder_timer.start(int(delay * 1000))
-        else:
+        logger.info(f"Timer setup: start={self._start_time.strftime('%H:%M')}, "
+                    f"flexible={is_flexible}, work_end={work_end_time.strftime('%H:%M')}")
+        return work_end_time, job_record_time
+
+    def _schedule_checkout_reminder(self, catch_up=False):
+        """按当前配置（重新）安排下班提醒；关闭时停掉已有定时器。"""
+        if not config_manager.get_reminder_setting('checkout_reminder'):
             logger.info("Checkout reminder is DISABLED in settings")
+            self._reminders.cancel(REMINDER_CHECKOUT)
+            return
+        work_end_time, _ = self._calculate_reminder_times()
+        delay = time_service.calculate_remaining_seconds(work_end_time)
+        self.timer_type = delay
+        logger.info(f"Checkout reminder enabled, delay={delay:.0f}s "
+                    f"({delay/60:.1f}min)")
+        self._schedule_daily_reminder(REMINDER_CHECKOUT, work_end_time,
+                                      self.show_checkout_reminder, catch_up)
+
+    def _schedule_job_record_reminder(self, catch_up=False):
+        """按当前配置（重新）安排工作日志提醒；关闭时停掉已有定时器。"""
+        if not config_manager.get_reminder_setting('job_record_reminder'):
+            self._reminders.cancel(REMINDER_JOB_RECORD)
+            return
+        _, job_record_time = self._calculate_reminder_times()
+        self._schedule_daily_reminder(REMINDER_JOB_RECORD, job_record_time,
+                                      self.show_job_record_warning, catch_up)
 
-        job_record_enabled = config_manager.get_reminder_setting('job_record_reminder')
-        if job_record_enabled:
-            delay2 = time_service.calculate_remaining_seconds(job_record_time)
-            self.reminder_timer2 = QTimer(self)
-            self.reminder_timer2.timeout.connect(self.show_job_record_warning)
-            self.reminder_timer2.setSingleShot(True)
-            self.reminder_timer2.start(int(delay2 * 1000))
+    def _schedule_daily_reminder(self, name, deadline, callback, catch_up):
+        """安排每天只弹一次的提醒（下班 / 日志）。
 
-        if is_first_start and config_manager.get_reminder_setting('checkin_reminder'):
-            # 推迟到事件循环启动后弹出：打卡提醒已改为非模态，不再阻塞初始化；
-            # 延迟到主窗口显示完成后再弹出体验更好。
-            QTimer.singleShot(0, self.show_checkin_reminder)
+        今天已经弹过的不再安排；catch_up 为 False（配置热加载）时，
+        新截止时间已过也不安排，避免改一下配置就立刻弹窗。
+        """
+        if self._fired_reminders.get(name) == datetime.date.today():
+            logger.debug(f"Reminder {name} already fired today, not rescheduling")
+            self._reminders.cancel(name)
+            return
+        if not catch_up and deadline <= datetime.datetime.now():
+            logger.info(f"Reminder {name} deadline {deadline.strftime('%H:%M')} already passed, "
+                        f"not rescheduling")
+            self._reminders.cancel(name)
+            return
+        self._reminders.add(name, deadline, callback)
+
+    def _mark_reminder_fired(self, name):
+        self._fired_reminders[name] = datetime.date.today()
+
+    def _on_setting_changed(self, key, old, new):
+        """settings.json 被外部修改：只重排受影响的提醒定时器，无需重启。"""
+        logger.info(f"Setting changed on disk: {key}: {old} -> {new}")
+        if key in ('flexible_mode', 'work_hours', 'fixed_start_hour'):
+            self._schedule_checkout_reminder()
+            self._schedule_job_record_reminder()
+        elif key == 'reminders.checkout_reminder':
+            self._schedule_checkout_reminder()
+        elif key in ('reminders.job_record_reminder', 'job_record_before_end_minutes'):
+            self._schedule_job_record_reminder()
+        self._tick_scheduler.wake()
 
     def _setup_tray_menu(self):
         logger.debug("Setting up tray menu")
@@ -172,6 +260,7 @@ class MainWindow(QWidget):
         self.tray_menu.custom_ascii_action.triggered.connect(self.show_custom_ascii_help)
         self.tray_menu.reload_animations_action.triggered.connect(self.reload_ascii_animations)
         self.tray_menu.settings_action.triggered.connect(self.show_settings_dialog)
+        self.tray_menu.mirror_status_action.triggered.connect(self.show_mirror_status)
         self.tray_menu.exit_action.triggered.connect(self.exit_app)
         self.tray_menu.tray_icon.activated.connect(self.on_tray_icon_activated)
 
@@ -187,7 +276,7 @@ class MainWindow(QWidget):
             return
         delay_ms = config_manager.check_update_delay * 1000
         logger.info(f"Scheduling auto update check in {config_manager.check_update_delay}s")
-        QTimer.singleShot(delay_ms, self._check_for_updates)
+        self._reminders.add_after(REMINDER_UPDATE_CHECK, delay_ms / 1000.0, self._check_for_updates)
 
     def _check_for_updates(self):
         import threading
@@ -197,42 +286,82 @@ class MainWindow(QWidget):
     def _do_check_updates(self):
         logger.debug("Checking for updates in background thread")
         try:
-            has_update, latest_version, current_version = update_service.check_for_updates()
+            has_update, latest_version, current_version = update_service.check_for_updates(
+                max_age=config_manager.update_check_ttl)
             logger.info(f"Update check result: has_update={has_update}, latest={latest_version}, current={current_version}")
             if has_update:
                 QApplication.postEvent(self, QEvent(QEvent.User))
         except Exception as e:
             logger.error(f"Error checking for updates: {e}", exc_info=True)
 
-    def update_timer_display(self):
-        seconds = 0
-        if hasattr(self, 'reminder_timer') and self.reminder_timer and self.reminder_timer.isActive():
-            seconds = self.reminder_timer.remainingTime() / 1000.0
+    def _setup_display_ticks(self):
+        """显示刷新改为按需唤醒：对齐到下一次秒数跳变，窗口不可见时停摆。"""
+        self._tick_scheduler = TickScheduler(self, self._on_display_tick)
+        self._tick_scheduler.suspended.connect(self._on_display_suspended)
+        self._tick_scheduler.resumed.connect(self._on_display_resumed)
+        self._tick_scheduler.start()
+        logger.debug("Display tick scheduler started")
+
+    def _on_display_tick(self):
+        self.update_timer_display()
+        return self._next_tick_delay_ms()
+
+    def _next_tick_delay_ms(self):
+        """下一次需要刷新的时间：倒计时秒数跳变 / 重掷显示模式 / 换待机场景 / 进入犯困，取最早。"""
+        now = time.monotonic()
+        delays = [
+            (self._last_mode_roll + MODE_ROLL_SECONDS - now) * 1000,
+            (self._last_idle_switch + IDLE_SWITCH_SECONDS - now) * 1000,
+        ]
+        remaining = self._remaining_ms(REMINDER_CHECKOUT)
+        if remaining is not None:
+            delays.append(ms_until_display_change(remaining))
+            if remaining > SLEEPY_BEFORE_MS:
+                delays.append(remaining - SLEEPY_BEFORE_MS + 1)
+        custom = self._remaining_ms(REMINDER_CUSTOM)
+        if custom is not None:
+            delays.append(ms_until_display_change(custom))
+        return max(0, min(delays))
+
+    def _remaining_ms(self, name):
+        seconds = self._reminders.remaining(name)
+        return None if seconds is None else int(seconds * 1000)
+
+    def _on_display_suspended(self):
+        # 窗口不可见时 ASCII 动画也没必要继续跑
+        self._ascii_timer.stop()
+
+    def _on_display_resumed(self):
+        # 可能刚从睡眠 / 锁屏回来：按墙上时间补发已经到期的提醒
+        self._reminders.recheck()
+        if self._display_mode == 'ascii':
+            self._ensure_ascii_running()
 
-        custom_timer_seconds = 0
-        if hasattr(self, 'custom_timer') and self.custom_timer and self.custom_timer.isActive():
-            custom_timer_seconds = self.custom_timer.remainingTime() / 1000.0
+    def update_timer_display(self):
+        seconds = self._reminders.remaining(REMINDER_CHECKOUT) or 0
+        custom_timer_seconds = self._reminders.remaining(REMINDER_CUSTOM) or 0
 
         display_text = '⏳ {:.0f}s'.format(seconds)
         if custom_timer_seconds > 0:
             display_text += '  ⏱️ {:.0f}s'.format(custom_timer_seconds)
-        self.time_label.setText(display_text)
-        self.time_label.adjustSize()
-
-        # 每 60s 重新掷一次显示模式：一半概率图片 / 一半概率 ASCII 动画
-        now = datetime.datetime.now()
-        if getattr(self, '_last_mode_roll', None) is None:
-            self._last_mode_roll = now
-        elif (now - self._last_mode_roll).total_seconds() > 60:
+        self._display_state.update('time_label', display_text, self._apply_time_text)
+
+        # 每 60s 重新掷一次显示模式：一半概率图片 / 一半概率 ASCII 动画；
+        # 每 20s 换一个待机形象。两者都并入同一次唤醒，不再各开定时器
+        now = time.monotonic()
+        if now - self._last_idle_switch >= IDLE_SWITCH_SECONDS:
+            self._last_idle_switch = now
+            self._switch_idle_scene()
+        if now - self._last_mode_roll >= MODE_ROLL_SECONDS:
             self._last_mode_roll = now
             self._roll_mode()
 
         # 按应用状态刷新 ASCII 场景（待机 / 自定义计时→时钟 / 快下班→犯困）
         self._refresh_ascii_scene()
 
-        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Tool | Qt.WindowStaysOnTopHint)
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.show()
+    def _apply_time_text(self, text):
+        self.time_label.setText(text)
+        self.time_label.adjustSize()
 
     # ── ASCII 动画播放器 ───────────────────────────────────
 
@@ -246,9 +375,9 @@ class MainWindow(QWidget):
         self._ascii_timer = QTimer(self)
         self._ascii_timer.timeout.connect(self._advance_ascii_frame)
 
-        self._scene_timer = QTimer(self)
-        self._scene_timer.timeout.connect(self._switch_idle_scene)
-        self._scene_timer.start(20000)
+        # 换待机场景 / 重掷显示模式的计时起点（由显示刷新调度统一检查）
+        self._last_idle_switch = time.monotonic()
+        self._last_mode_roll = time.monotonic()
 
         # 启动时掷一次显示模式：一半概率随机图片，一半概率 ASCII 动画
         self._display_mode = random.choice(['image', 'ascii'])
@@ -278,9 +407,10 @@ class MainWindow(QWidget):
         logger.info("Reloaded ascii animations (external: %s)", len(loaded))
 
     def _advance_ascii_frame(self):
-        scene = ascii_art.SCENES[self._scene_name]
-        self._frame_index = (self._frame_index + 1) % len(scene["frames"])
-        self.ascii_label.setText(ascii_art.render_frame(scene, self._frame_index))
+        # 帧文本在场景加载时已预渲染好，这里只做查表
+        frames = ascii_art.rendered_frames(ascii_art.SCENES[self._scene_name])
+        self._frame_index = (self._frame_index + 1) % len(frames)
+        self._display_state.update('ascii_label', frames[self._frame_index], self.ascii_label.setText)
 
     def _set_scene(self, name):
         """切换场景并重置播放（fps/颜色/文本格式跟着场景走）。"""
@@ -290,16 +420,22 @@ class MainWindow(QWidget):
         self._frame_index = 0
         scene = ascii_art.SCENES[name]
         if scene.get("rainbow"):
-            self.ascii_label.setTextFormat(Qt.RichText)
-            self.ascii_label.setStyleSheet("background: transparent;")
+            style = (Qt.RichText, "background: transparent;")
         else:
-            self.ascii_label.setTextFormat(Qt.PlainText)
-            self.ascii_label.setStyleSheet(
-                "background: transparent; color: {};".format(scene["color"]))
+            style = (Qt.PlainText, "background: transparent; color: {};".format(scene["color"]))
+        # 同色场景之间切换不必重设样式表（setStyleSheet 会触发重新 polish）
+        self._display_state.update('ascii_style', style, self._apply_ascii_style)
         self._ascii_timer.setInterval(int(1000 / scene["fps"]))
         self._ascii_timer.start()
         self._advance_ascii_frame()
 
+    def _apply_ascii_style(self, style):
+        text_format, stylesheet = style
+        self.ascii_label.setTextFormat(text_format)
+        self.ascii_label.setStyleSheet(stylesheet)
+        # 文本格式变了，同样的文本也要按新格式重新设置
+        self._display_state.invalidate('ascii_label')
+
     def _ensure_ascii_running(self):
         """确保 ASCII 播放器在跑（从图片模式切回来时定时器可能已停）。"""
         if self._scene_name is None:
@@ -315,6 +451,9 @@ class MainWindow(QWidget):
         if self._display_mode == 'ascii':
             self.ascii_label.show()
             self.countdown_label.hide()
+            # 还没加载完的图片作废；下次轮到图片模式必须重新请求
+            if self._pet_loader.cancel('pet'):
+                self._display_state.invalidate('countdown_pixmap')
             self._ensure_ascii_running()
         else:
             self.countdown_label.show()
@@ -329,28 +468,58 @@ class MainWindow(QWidget):
         self._apply_mode()
 
     def _pick_random_image(self):
-        """从 images/timers/ 随机选一张图显示（保留原有随机换图逻辑）。"""
-        try:
-            image_files = [
-                f for f in os.listdir(IMAGE_DIRECTORY)
-                if f.lower().endswith(('.png', '.jpg', '.jpeg'))
-            ]
-        except OSError as e:
-            logger.error(f"Failed to list image directory: {e}")
-            image_files = []
-        if not image_files:
+        """从 images/timers/（含子目录）随机选一张图显示，目录列表走缓存索引。"""
+        entry = self._image_index.choice()
+        if entry is None:
             logger.warning("No pet images found, falling back to ASCII animation")
             self._display_mode = 'ascii'
             self._apply_mode()
             return
-        image_path = os.path.join(IMAGE_DIRECTORY, random.choice(image_files))
-        pixmap = transparent_pixmap(image_path).scaled(
-            60, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self._pet_image_path = entry.path
+        if self._show_pet_image():
+            logger.debug(f"Picked pet image: {os.path.basename(entry.path)}")
+
+    def _show_pet_image(self):
+        # 比较键带上 DPR：同一张图换到缩放比例不同的屏幕上也要重新取
+        # （每个 DPR 单独缓存，拖回原来的屏幕直接命中，SVG 不会重新解析）
+        image_path = self._pet_image_path
+        return self._display_state.update(
+            'countdown_pixmap', image_path, self._apply_pet_image,
+            token=(image_path, self.devicePixelRatioF()))
+
+    def _watch_screen_changes(self):
+        # 原生窗口创建 / 重建后 windowHandle 会换成新对象，需要重新连接
+        handle = self.windowHandle()
+        if handle is not None and handle is not self._screen_handle:
+            handle.screenChanged.connect(self._on_screen_changed)
+            self._screen_handle = handle
+
+    def _on_screen_changed(self, screen):
+        logger.debug(f"Window moved to screen {screen.name() if screen else None}, "
+                     f"DPR {self.devicePixelRatioF()}")
+        if self._display_mode == 'image' and self._pet_image_path is not None:
+            self._show_pet_image()
+
+    def _apply_pet_image(self, image_path):
+        # 先缩到目标尺寸附近再去背景，大图不再整张跑一遍透明化；
+        # 结果按 (文件, 尺寸, DPR) 缓存，再次轮到同一张图时直接复用。
+        # 处理在线程池里进行，GUI 线程不等待，完成后由 _on_pet_image_ready 贴图
+        self._pet_loader.request('pet', image_path, target_size=PET_IMAGE_SIZE,
+                                 device_pixel_ratio=self.devicePixelRatioF())
+
+    def _on_pet_image_ready(self, slot, image_path, pixmap):
         self.countdown_label.setPixmap(pixmap)
-        logger.debug(f"Picked pet image: {os.path.basename(image_path)}")
+
+    def _on_pet_image_failed(self, slot, image_path):
+        # 图片坏了 / 解码失败：作废记录的令牌，否则下次选中同一张图会被当成“已显示”跳过；
+        # 把它移出索引（目录变化重新扫描后才回来），再换一张，没图可换时回退到 ASCII
+        self._display_state.invalidate('countdown_pixmap')
+        self._image_index.discard(image_path)
+        if self._display_mode == 'image':
+            self._pick_random_image()
 
     def _refresh_ascii_scene(self):
-        """按应用状态决定目标场景并切换（每 100ms 刷新，切场景很廉价）。
+        """按应用状态决定目标场景并切换（每次显示刷新时调用，场景没变时直接返回）。
 
         仅 ASCII 模式生效；图片模式下不动动画（等 _roll_mode 掷回来）。
         """
@@ -360,13 +529,12 @@ class MainWindow(QWidget):
         self._set_scene(target)
 
     def _decide_scene(self):
-        custom = getattr(self, 'custom_timer', None)
-        if custom is not None and custom.isActive():
+        if REMINDER_CUSTOM in self._reminders:
             return 'clock'
         if self._celebrating:
             return 'celebrate'
-        rem = getattr(self, 'reminder_timer', None)
-        if rem is not None and rem.isActive() and rem.remainingTime() < 10 * 60 * 1000:
+        remaining = self._remaining_ms(REMINDER_CHECKOUT)
+        if remaining is not None and remaining < SLEEPY_BEFORE_MS:
             return 'sleepy'
         return self._idle_scene
 
@@ -376,10 +544,11 @@ class MainWindow(QWidget):
         self._display_mode = 'ascii'
         self._apply_mode()
         self._refresh_ascii_scene()
-        QTimer.singleShot(4000, self._stop_celebrate)
+        self._reminders.add_after(REMINDER_CELEBRATE_END, CELEBRATE_SECONDS, self._stop_celebrate)
 
     def _stop_celebrate(self):
         self._celebrating = False
+        self._tick_scheduler.wake()
 
     def show_checkin_reminder(self):
         logger.info("Showing check-in reminder dialog")
@@ -387,10 +556,12 @@ class MainWindow(QWidget):
 
     def show_job_record_warning(self):
         logger.info("Showing job record reminder dialog")
+        self._mark_reminder_fired(REMINDER_JOB_RECORD)
         ReminderDialog.show_job_record(self)
 
     def show_checkout_reminder(self):
         logger.info("Checkout reminder triggered!")
+        self._mark_reminder_fired(REMINDER_CHECKOUT)
         is_flexible = config_manager.is_flexible
         logger.info(f"Checkout reminder: is_flexible={is_flexible}")
         ReminderDialog.show_checkout(self, is_flexible, self.shutdown_computer)
@@ -407,6 +578,13 @@ class MainWindow(QWidget):
         dialog = CustomAsciiHelpDialog(self)
         dialog.show_centered()
 
+    def show_mirror_status(self):
+        """托盘 Mirror Status...：更新镜像的成功率 / 耗时记分板。"""
+        logger.debug("Opening mirror status dialog (non-modal)")
+        mirrors = ["direct"] + list(GITHUB_PROXY_MIRRORS)
+        dialog = MirrorStatusDialog(self, mirrors=mirrors)
+        dialog.show_centered()
+
     def show_settings_dialog(self):
         logger.debug("Opening settings dialog (non-modal)")
         dialog = SettingsDialog(self, update_callback=self.update_application)
@@ -415,15 +593,12 @@ class MainWindow(QWidget):
 
     def start_custom_countdown(self, minutes, message=""):
         logger.info(f"Starting custom countdown: {minutes} minutes, message: {message!r}")
-        if hasattr(self, 'custom_timer'):
-            self.custom_timer.stop()
+        if self._reminders.cancel(REMINDER_CUSTOM):
             logger.debug("Stopped previous custom timer")
 
         self.custom_timer_message = message
-        self.custom_timer = QTimer(self)
-        self.custom_timer.timeout.connect(self.show_custom_timer_reminder)
-        self.custom_timer.setSingleShot(True)
-        self.custom_timer.start(minutes * 60 * 1000)
+        self._reminders.add_after(REMINDER_CUSTOM, minutes * 60, self.show_custom_timer_reminder)
+        self._tick_scheduler.wake()
 
     def show_custom_timer_reminder(self):
         logger.info("Custom timer expired, showing reminder")
@@ -554,6 +729,8 @@ class MainWindow(QWidget):
     def exit_app(self):
         logger.info("Exiting application")
         keyboard_service.stop_listening()
+        self._pet_loader.shutdown()
+        config_manager.flush()
         self.app.quit()
 
     def closeEvent(self, event):
@@ -582,6 +759,8 @@ class MainWindow(QWidget):
             self.toggle_qq_window()
 
     def event(self, event):
+        if event.type() == QEvent.WinIdChange:
+            self._watch_screen_changes()
         if event.type() == QEvent.User:
             logger.info("Update available event received, showing non-modal dialog")
             ReminderDialog.show_update_available(
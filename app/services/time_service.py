@@ -1,36 +1,84 @@
 import datetime
-import os
-from app.config.constants import START_TIME_FILE
+from app.config.constants import START_TIME_FILE, START_TIME_JOURNAL
 from app.config.manager import config_manager
 from app.utils.logger import logger
+from app.utils.start_journal import StartTimeJournal, read_last_text_entry
 
 class TimeService:
+    def __init__(self, start_time_file=START_TIME_FILE, journal_file=START_TIME_JOURNAL):
+        self.start_time_file = start_time_file
+        self.journal = StartTimeJournal(journal_file)
+        self._migrated = False
+
+    def _ensure_journal(self):
+        """首次使用时把旧 start_time.txt 一次性迁移到二进制日志。
+
+        返回日志是否可用。迁移失败时不置位，下次调用重试（日志是原子替换写出
+        的，失败时不会留下半个日志）。
+        """
+        if self._migrated:
+            return True
+        try:
+            self.journal.migrate_from_text(self.start_time_file)
+        except Exception as e:
+            logger.error(f"Error migrating start time file: {e}")
+            return False
+        self._migrated = True
+        return True
+
     def get_last_start_time(self):
-        """Reads the last start time from the config file. Returns None if not found."""
+        """Reads the last start time from the journal. Returns None if not found.
+
+        日志不可用（迁移失败、目录只读、文件头损坏或没有一条有效记录等）时
+        退回倒序读取旧 start_time.txt。
+        """
+        self._ensure_journal()
         try:
-            with open(START_TIME_FILE, "r") as f:
-                lines = f.readlines()
-                if lines:
-                    last_line = lines[-1].strip()
-                    try:
-                        result = datetime.datetime.strptime(last_line, "%Y-%m-%d %H:%M:%S.%f")
-                        logger.debug(f"Read last start time from file: {result}")
-                        return result
-                    except ValueError:
-                        logger.warning(f"Invalid date format in start time file: '{last_line}'")
-                        return None
-                else:
-                    logger.debug("Start time file is empty")
-                    return None
+            if self.journal.exists():
+                result = self.journal.last()
+                if result is not None:
+                    logger.debug(f"Read last start time from journal: {result}")
+                    return result
+                logger.warning("Start time journal has no valid records, "
+                               "falling back to the text file")
+        except OSError as e:
+            logger.error(f"Error reading start time journal: {e}")
+        try:
+            result = read_last_text_entry(self.start_time_file)
+            logger.debug(f"Read last start time from file: {result}")
+            return result
         except FileNotFoundError:
-            logger.debug(f"Start time file not found: {START_TIME_FILE}")
+            logger.debug(f"Start time file not found: {self.start_time_file}")
+            return None
+        except OSError as e:
+            logger.error(f"Error reading start time file: {e}")
+            return None
+
+    def get_start_time_for_date(self, date):
+        """Returns the first start time recorded on the given date, or None."""
+        self._ensure_journal()
+        try:
+            return self.journal.find(date)
+        except OSError as e:
+            logger.error(f"Error reading start time journal: {e}")
             return None
 
     def write_start_time(self, start_time):
-        """Writes the start time to the config file."""
+        """Appends the start time to the journal.
+
+        迁移没成功时不能新建日志（那样只有今天一条，旧历史再也迁移不过来），
+        改为追加到旧 start_time.txt，下次迁移时一并带上。
+        """
+        if not self._ensure_journal():
+            try:
+                with open(self.start_time_file, "a") as f:
+                    f.write(start_time.strftime("%Y-%m-%d %H:%M:%S.%f") + "\n")
+                logger.info(f"Start time written to legacy file: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            except OSError as e:
+                logger.error(f"Error writing start time: {e}")
+            return
         try:
-            with open(START_TIME_FILE, "a") as f:
-                f.write(start_time.strftime("%Y-%m-%d %H:%M:%S.%f") + "\n")
+            self.journal.append(start_time)
             logger.info(f"Start time written: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         except Exception as e:
             logger.error(f"Error writing start time: {e}")
@@ -1,15 +1,29 @@
+import itertools
 import os
+import queue
+import socket
 import sys
 import tempfile
 import subprocess
-import requests
 import threading
+import time
+from app.config.constants import DEFAULT_UPDATE_CHECK_TTL
 from app.utils.version import is_newer_version
 from app.utils.logger import logger
+from app.utils.mirror_stats import mirror_scoreboard
+from app.utils.release_cache import release_cache
+from app.utils.ranged_download import (
+    DownloadFailed, RangesNotSupported, SegmentedDownload, supports_ranges, validator_from_headers,
+)
+
+# requests 导入耗时较长，只在检查/下载更新时（后台线程里）才在函数内导入，
+# 不拖慢应用冷启动（共享会话也在第一次请求时才创建，见 HttpClient）。
 
-# GitHub 下载代理镜像列表（按优先级排序，直连失败后自动回退）
+# GitHub 下载代理镜像列表（直连失败后自动回退）
 # 说明：
 #  - 这些是社区公益加速服务，随时可能失效；失效后按此格式替换/增删即可。
+#  - 这里的顺序只是初始顺序：实际尝试顺序按 mirror_stats.json 里记录的
+#    成功率和耗时排列，连续失败的镜像会暂时排到最后（见 utils/mirror_stats.py）。
 #  - 此类代理只代理 github.com 的下载/raw 链接，不代理 api.github.com 接口，
 #    因此检查更新始终直连 api.github.com（见 check_for_updates）。
 GITHUB_PROXY_MIRRORS = [
@@ -22,36 +36,278 @@ GITHUB_PROXY_MIRRORS = [
 ]
 
 
-def _build_proxy_urls(direct_url):
-    """为给定的 GitHub URL 生成直连 + 所有代理镜像的 URL 列表"""
-    urls = [direct_url]  # 直连排在第一位
+def _mirror_key(url):
+    """URL 在记分板里的名字：所用代理的前缀，直连为 "direct"。"""
+    for proxy in GITHUB_PROXY_MIRRORS:
+        if url.startswith(proxy.rstrip("/") + "/"):
+            return proxy
+    return "direct"
+
+
+def _build_proxy_urls(direct_url, ranked=True):
+    """为给定的 GitHub URL 生成直连 + 所有代理镜像的 URL 列表。
+
+    ranked=True 时按镜像记分板排序（没有记录时直连在前、镜像按列表顺序）。
+    """
+    urls = {"direct": direct_url}
     for proxy in GITHUB_PROXY_MIRRORS:
-        urls.append(proxy.rstrip("/") + "/" + direct_url)
-    return urls
+        urls[proxy] = proxy.rstrip("/") + "/" + direct_url
+    keys = mirror_scoreboard.rank(list(urls)) if ranked else list(urls)
+    return [urls[key] for key in keys]
 
 
 def _try_request(urls, timeout=30, stream=False, method="get"):
     """依次尝试多个 URL，返回第一个成功的响应；全部失败则抛出最后一个异常"""
+    if method != "get":
+        raise ValueError(f"Unsupported method: {method}")
     last_error = None
-    for i, url in enumerate(urls):
+    for url in urls:
+        source = _mirror_key(url)
+        started = time.monotonic()
         try:
-            source = "direct" if i == 0 else f"mirror[{i}]"
             logger.info(f"Trying {source}: {url[:80]}...")
-            if method == "get":
-                resp = requests.get(url, timeout=timeout, stream=stream)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
+            resp = http_client.get(url, timeout=timeout, stream=stream)
             if resp.status_code == 200:
+                mirror_scoreboard.record_success(source, time.monotonic() - started)
                 return resp, url
             else:
                 logger.warning(f"{source} returned HTTP {resp.status_code}")
                 last_error = Exception(f"HTTP {resp.status_code} from {source}")
         except Exception as e:
-            logger.warning(f"{'direct' if i == 0 else f'mirror[{i}]'} failed: {e}")
+            logger.warning(f"{source} failed: {e}")
             last_error = e
+        mirror_scoreboard.record_failure(source, last_error)
     raise last_error if last_error else Exception("All URLs failed")
 
 
+# 竞速下载：直连和排在前面的镜像同时发起请求，谁先送来有效的首字节就用谁。
+# 同时在飞的请求数（直连 + 前 3 个镜像）；某一路失败后依次补上后面的镜像
+MIRROR_RACE_WIDTH = 4
+DOWNLOAD_CHUNK_SIZE = 4096
+# Windows 可执行文件（PE）的文件头；代理出错时常返回 200 + HTML 错误页
+EXE_MAGIC = b"MZ"
+
+# 分段下载：支持 Range 的服务器上用几条连接并行下载，断线后可续传
+DOWNLOAD_CONNECTIONS = 4
+DOWNLOAD_SEGMENT_SIZE = 1024 * 1024
+# 小于这个大小的文件分段没有意义，直接单连接下载
+SEGMENTED_MIN_BYTES = 2 * DOWNLOAD_SEGMENT_SIZE
+
+
+# 共享 HTTP 会话：检查更新、竞速、顺序回退、分段下载都走同一个 requests.Session，
+# 按主机保留长连接，重复检查和后续下载不用每次都重新 TCP 握手 + TLS 握手。
+# 缓存连接池的主机数：api.github.com + 直连 + 各个镜像
+HTTP_POOL_CONNECTIONS = 2 + len(GITHUB_PROXY_MIRRORS)
+# 每个主机保留的空闲连接数：分段下载同时开 DOWNLOAD_CONNECTIONS 条
+HTTP_POOL_MAXSIZE = DOWNLOAD_CONNECTIONS
+# 检查更新接口：连接失败、5xx、限流时退避重试（0.5s、1s……，并遵守 Retry-After）
+API_RETRY = {
+    "total": 3, "connect": 3, "read": 1, "status": 2,
+    "backoff_factor": 0.5, "status_forcelist": (429, 500, 502, 503, 504),
+}
+# 下载：只重试一次建立连接（池里的空闲连接复用前 urllib3 会先检查是否已被
+# 服务器关掉）；地址之间的回退由竞速 / 顺序尝试负责，这里多重试只会拖慢换镜像
+DOWNLOAD_RETRY = {
+    "total": 1, "connect": 1, "read": 0, "status": 0, "backoff_factor": 0,
+}
+
+
+def _retry_policy(policy):
+    """把上面的重试配置变成 urllib3 的 Retry（只重试 GET，状态码重试用完后照常返回响应）。"""
+    from urllib3.util.retry import Retry
+
+    return Retry(allowed_methods=frozenset({"GET", "HEAD"}), raise_on_status=False,
+                 respect_retry_after_header=True, **policy)
+
+
+class HttpClient:
+    """按需创建的共享 requests.Session。
+
+    每个主机一个连接池（HTTPAdapter），GitHub API 与下载地址挂不同的重试
+    策略。requests 的 Session 可以被多个线程同时用来发 GET（竞速、分段
+    下载就是这样用的）。verify 为证书校验选项，与 requests 相同；
+    请求都要经过 get()，直接用 session 会丢掉 verify。
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=HTTP_POOL_MAXSIZE,
+                 api_retry=None, download_retry=None, verify=True):
+        self.pool_connections = pool_connections or HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize
+        self.api_retry = API_RETRY if api_retry is None else api_retry
+        self.download_retry = DOWNLOAD_RETRY if download_retry is None else download_retry
+        self.verify = verify
+        self._lock = threading.Lock()
+        self._session = None
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        for prefix, policy in (("http://", self.download_retry),
+                               ("https://", self.download_retry),
+                               (_api_prefix(UpdateService.GITHUB_API_URL), self.api_retry)):
+            session.mount(prefix, HTTPAdapter(pool_connections=self.pool_connections,
+                                              pool_maxsize=self.pool_maxsize,
+                                              max_retries=_retry_policy(policy)))
+        return session
+
+    def get(self, url, **kwargs):
+        # verify 按请求传：只设在 Session 上会被 REQUESTS_CA_BUNDLE 环境变量覆盖
+        kwargs.setdefault("verify", self.verify)
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        """关闭所有空闲连接；之后再请求会重新建会话。"""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+
+def _api_prefix(url):
+    """https://api.github.com/repos/... → https://api.github.com/（按主机挂重试策略）"""
+    scheme, rest = url.split("://", 1)
+    return f"{scheme}://{rest.split('/', 1)[0]}/"
+
+
+http_client = HttpClient()
+
+
+def _abort_response(resp):
+    """关闭响应。先 shutdown 底层 socket：只 close 的话，另一个线程里阻塞
+    在 recv 上的读取要等到超时才返回，连接也一直占着。"""
+    sock = getattr(getattr(resp.raw, "connection", None), "sock", None)
+    if sock is None:
+        # 服务器要求 Connection: close 时，http.client 已把 socket 移交给响应体的 fp
+        fp = getattr(getattr(resp.raw, "_fp", None), "fp", None)
+        sock = getattr(getattr(fp, "raw", None), "_sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    resp.close()
+
+
+class _MirrorRace:
+    """一次竞速：每个 URL 一个后台线程，只保留第一个合格的响应。
+
+    “合格”指 HTTP 200 且首字节通过 validate（例如以 MZ 开头）。决出胜者
+    后其余请求全部作废：已经连上的立即关闭连接，还在连接中的线程醒来后
+    发现已作废，自行关闭响应退出（线程是 daemon，不阻塞退出）。
+
+    每一路的结果记入镜像记分板：合格的记首字节耗时（输掉竞速的也算），
+    失败的记一次失败；因作废而中断的不记。
+    """
+
+    def __init__(self, urls, timeout, width, validate, probe_size):
+        self._urls = list(urls)
+        self._timeout = timeout
+        self._width = max(1, width)
+        self._validate = validate
+        self._probe_size = probe_size
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._done = False
+        self._responses = set()   # 还在读首字节的响应，作废时关闭
+
+    def run(self):
+        """返回 (response, url, first_bytes, chunks)；全部失败时抛出最后一个异常。"""
+        pending = list(self._urls)
+        running = 0
+        last_error = None
+        started = time.monotonic()
+        while pending or running:
+            while pending and running < self._width:
+                url = pending.pop(0)
+                logger.info(f"Racing {_mirror_key(url)}: {url[:80]}...")
+                threading.Thread(target=self._fetch, args=(url,), daemon=True).start()
+                running += 1
+            url, result, error = self._results.get()
+            running -= 1
+            if error is not None:
+                logger.warning(f"{_mirror_key(url)} failed: {error}")
+                last_error = error
+                continue
+            logger.info(f"Mirror race won by {_mirror_key(url)} in "
+                        f"{(time.monotonic() - started) * 1000:.0f}ms")
+            self._cancel_losers()
+            return (result[0], url) + result[1:]
+        raise last_error if last_error else Exception("All URLs failed")
+
+    def _cancel_losers(self):
+        with self._lock:
+            self._done = True
+            losers = list(self._responses)
+            self._responses.clear()
+        for resp in losers:
+            _abort_response(resp)
+        # 已经在队列里的合格响应也要关掉
+        while True:
+            try:
+                _, result, _ = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if result is not None:
+                result[0].close()
+
+    def _fetch(self, url):
+        source = _mirror_key(url)
+        started = time.monotonic()
+        resp = None
+        try:
+            resp = http_client.get(url, timeout=self._timeout, stream=True)
+            with self._lock:
+                if self._done:
+                    resp.close()
+                    return
+                self._responses.add(resp)
+            if resp.status_code != 200:
+                raise Exception(f"HTTP {resp.status_code} from {source}")
+            chunks = resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            first = b""
+            for chunk in chunks:
+                first += chunk
+                if len(first) >= self._probe_size:
+                    break
+            if self._validate is not None and not self._validate(first):
+                raise Exception(f"Invalid content from {source}: {first[:16]!r}")
+            mirror_scoreboard.record_success(source, time.monotonic() - started)
+            result, error = (resp, first, chunks), None
+        except Exception as e:
+            result, error = None, e
+        with self._lock:
+            if resp is not None:
+                self._responses.discard(resp)
+            if self._done or error is not None:
+                # 已经有胜者（连接可能就是被胜者关掉的），或者自己失败了
+                if resp is not None:
+                    resp.close()
+                if self._done:
+                    return
+            self._results.put((url, result, error))
+        if error is not None:
+            mirror_scoreboard.record_failure(source, error)
+
+
+def _race_request(urls, timeout=30, width=MIRROR_RACE_WIDTH, validate=None, probe_size=len(EXE_MAGIC)):
+    """同时向最多 width 个 URL 发起流式请求，返回最先送来合格首字节的那个。
+
+    返回 (response, url, first_bytes, chunks)：first_bytes 是已经读出的开头
+    部分，chunks 是同一响应剩下内容的 iter_content 迭代器，按顺序写出即为
+    完整文件。全部失败时抛出最后一个异常。
+    """
+    return _MirrorRace(urls, timeout, width, validate, probe_size).run()
+
+
 class UpdateService:
     APP_NAME = "MiniTools"
     EXE_NAME = "MiniTools.exe"
@@ -84,12 +340,15 @@ class UpdateService:
             # 导致每次启动都误判有更新。
             return None
 
-    def check_for_updates(self):
+    def check_for_updates(self, max_age=DEFAULT_UPDATE_CHECK_TTL):
         """检查更新。
 
         下载代理镜像（ghfast.top 等）只代理 github.com 的下载/raw 链接，
         不代理 api.github.com 接口，所以这里始终直连 API，避免对无效
         代理做无意义的等待。若直连失败则本次跳过检查（不影响应用运行）。
+
+        最新版本信息会缓存下来：max_age 秒内再次检查直接用缓存、不联网；
+        过期后带 ETag 发条件请求，304 即“没有变化”（max_age=0 总是重新验证）。
         """
         try:
             current_version = self.get_current_version()
@@ -97,9 +356,7 @@ class UpdateService:
                 logger.warning("Cannot determine current version, skipping update check")
                 return False, None, None
             logger.info(f"Checking for updates, current version: {current_version}")
-            response = requests.get(self.GITHUB_API_URL, timeout=15)
-            response.raise_for_status()
-            release_data = response.json()
+            release_data = self._latest_release(max_age)
             latest_version = release_data['tag_name'].lstrip('v')
 
             if is_newer_version(latest_version, current_version):
@@ -109,31 +366,74 @@ class UpdateService:
             logger.error(f"Error checking for updates: {e}")
             return False, None, self.get_current_version()
 
-    def download_update(self, progress_callback=None):
-        """下载更新，支持 GitHub 代理镜像自动回退"""
+    def _latest_release(self, max_age):
+        """releases/latest 的内容（只保留用到的字段），优先用缓存。"""
+        url = self.GITHUB_API_URL
+        cached = release_cache.get(url)
+        if cached is not None and release_cache.is_fresh(cached, max_age):
+            logger.info("Using cached release info (checked within TTL)")
+            return cached["data"]
+
+        response = http_client.get(url, timeout=15,
+                                   headers=release_cache.conditional_headers(cached))
+        if response.status_code == 304 and cached is not None:
+            logger.info("Release unchanged since last check (HTTP 304)")
+            response.close()
+            return release_cache.touch(cached)["data"]
+        response.raise_for_status()
+        release_data = {"tag_name": response.json()["tag_name"]}
+        release_cache.store(url, release_data, response.headers)
+        return release_data
+
+    def download_update(self, progress_callback=None, race=True, segmented=True):
+        """下载更新，支持 GitHub 代理镜像自动回退。
+
+        race=True（默认）时直连与前几个镜像同时竞速，用最先送来有效 exe
+        文件头的那一路，其余立即取消；race=False 时按顺序逐个尝试。
+
+        segmented=True 且服务器支持 Range 时改为多连接分段下载（见
+        utils/ranged_download.py），中断后再次调用会从上次的进度续传；
+        不支持 Range 的服务器退回单连接流式下载。
+
+        各镜像的成功 / 失败、首字节耗时和下载速度记入镜像记分板，结束时写盘。
+        """
+        import requests
+
         callback = progress_callback or self._download_progress_callback
 
         try:
             download_urls = _build_proxy_urls(self.GITHUB_DOWNLOAD_URL)
-            response, used_url = _try_request(download_urls, timeout=30, stream=True)
+            if race:
+                response, used_url, first_bytes, chunks = _race_request(
+                    download_urls, timeout=30, validate=lambda data: data.startswith(EXE_MAGIC))
+            else:
+                response, used_url = _try_request(download_urls, timeout=30, stream=True)
+                first_bytes, chunks = b"", response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
             logger.info(f"Downloading from: {used_url[:80]}...")
 
             total_size = int(response.headers.get('content-length', 0))
-            downloaded_size = 0
 
             temp_dir = tempfile.gettempdir()
             temp_exe_path = os.path.join(temp_dir, f"{self.APP_NAME}_new.exe")
 
-            with open(temp_exe_path, "wb") as exe_file:
-                for chunk in response.iter_content(chunk_size=4096):
-                    if chunk:
-                        exe_file.write(chunk)
-                        downloaded_size += len(chunk)
-                        if total_size > 0 and callback:
-                            progress = int((downloaded_size / total_size) * 100)
-                            callback(progress, f"Downloading update... {progress}%")
-                        elif callback:
-                            callback(None, f"Downloading update... {downloaded_size} bytes")
+            source = _mirror_key(used_url)
+            downloaded_size = None
+            if segmented and total_size >= SEGMENTED_MIN_BYTES and supports_ranges(response):
+                # 竞速请求只用来挑地址、拿文件大小和 ETag，正文改由分段连接下载
+                validator = validator_from_headers(response.headers)
+                _abort_response(response)
+                urls = [used_url] + [url for url in download_urls if url != used_url]
+                downloaded_size = self._download_segmented(
+                    urls, temp_exe_path, total_size, validator, callback)
+                if downloaded_size is None:
+                    response, used_url = _try_request([used_url], timeout=30, stream=True)
+                    first_bytes, chunks = b"", response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            if downloaded_size is None:
+                started = time.monotonic()
+                downloaded_size = self._download_stream(
+                    response, first_bytes, chunks, temp_exe_path, total_size, callback)
+                mirror_scoreboard.record_throughput(
+                    source, downloaded_size, time.monotonic() - started)
 
             # 校验 1：文件大小与服务器声明一致（代理可能中途截断）
             if total_size > 0 and downloaded_size != total_size:
@@ -141,19 +441,25 @@ class UpdateService:
                 error = (f"Download incomplete: expected {total_size} bytes, "
                          f"got {downloaded_size} bytes.")
                 logger.error(error)
+                mirror_scoreboard.record_failure(source, error)
                 return False, None, error
 
             # 校验 2：必须是以 MZ 开头的 PE 可执行文件，
             # 防止代理返回 200 + HTML 错误页时把垃圾内容当作 exe 安装。
             with open(temp_exe_path, "rb") as f:
-                if f.read(2) != b"MZ":
+                if f.read(len(EXE_MAGIC)) != EXE_MAGIC:
                     os.remove(temp_exe_path)
                     error = ("Downloaded file is not a valid executable "
                              "(the proxy may have returned an error page).")
                     logger.error(error)
+                    mirror_scoreboard.record_failure(source, error)
                     return False, None, error
 
             return True, temp_exe_path, None
+        except DownloadFailed as e:
+            error = f"Download interrupted: {e}. Try again to resume from where it stopped."
+            logger.error(error)
+            return False, None, error
         except requests.exceptions.Timeout:
             error = "Download timed out. Please check your network connection and try again."
             logger.error(error)
@@ -166,6 +472,51 @@ class UpdateService:
             error = f"An error occurred: {str(e)}"
             logger.error(error)
             return False, None, error
+        finally:
+            mirror_scoreboard.save()
+
+    @staticmethod
+    def _download_stream(response, first_bytes, chunks, path, total_size, callback):
+        """单连接流式写入 path，返回写入的字节数。"""
+        downloaded_size = 0
+        with response, open(path, "wb") as exe_file:
+            for chunk in itertools.chain((first_bytes,), chunks):
+                if chunk:
+                    exe_file.write(chunk)
+                    downloaded_size += len(chunk)
+                    if total_size > 0 and callback:
+                        progress = int((downloaded_size / total_size) * 100)
+                        callback(progress, f"Downloading update... {progress}%")
+                    elif callback:
+                        callback(None, f"Downloading update... {downloaded_size} bytes")
+        return downloaded_size
+
+    @staticmethod
+    def _download_segmented(urls, path, total_size, validator, callback):
+        """多连接分段下载到 path，返回字节数；服务器实际不支持 Range 时返回 None。"""
+        def report(done, total):
+            if callback:
+                progress = int(done * 100 / total)
+                callback(progress, f"Downloading update... {progress}% "
+                                   f"({DOWNLOAD_CONNECTIONS} connections)")
+
+        download = SegmentedDownload(urls, path, total_size, validator,
+                                     connections=DOWNLOAD_CONNECTIONS,
+                                     segment_size=DOWNLOAD_SEGMENT_SIZE,
+                                     session=http_client)
+        started = time.monotonic()
+        try:
+            download.run(progress=report)
+        except RangesNotSupported as e:
+            logger.warning(f"Falling back to single-stream download: {e}")
+            download.discard()
+            return None
+        logger.info(f"Segmented download finished: {download.downloaded_bytes} bytes fetched, "
+                    f"{download.resumed_bytes} bytes resumed")
+        # 分片主要从第一个地址（竞速胜者）下载，速度记在它名下
+        mirror_scoreboard.record_throughput(_mirror_key(urls[0]), download.downloaded_bytes,
+                                            time.monotonic() - started)
+        return os.path.getsize(path)
 
     def prepare_updater_script(self, temp_exe_path, local_exe_path):
         """Prepare the updater batch script."""
@@ -4,7 +4,13 @@ from .dialogs import (
     CustomTimerDialog,
     ReminderDialog,
     CustomAsciiHelpDialog,
+    MirrorStatusDialog,
 )
+from .display_state import DisplayState
+from .stay_on_top import StayOnTopGuardian
+from .tick_scheduler import TickScheduler
+from .reminder_scheduler import ReminderScheduler
+from .pixmap_loader import AsyncPixmapLoader
 from . import ascii_art
 
 __all__ = [
@@ -13,5 +19,11 @@ __all__ = [
     'CustomTimerDialog',
     'ReminderDialog',
     'CustomAsciiHelpDialog',
+    'MirrorStatusDialog',
+    'DisplayState',
+    'StayOnTopGuardian',
+    'TickScheduler',
+    'ReminderScheduler',
+    'AsyncPixmapLoader',
     'ascii_art'
 ]
\ No newline at end of file
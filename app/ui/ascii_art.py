@@ -25,7 +25,10 @@ from app.utils.logger import logger
 # fps     : 播放帧率（帧/秒）
 # rainbow : 是否逐行渐变着色
 # frames  : 每帧为一个 list[str]，行与行对齐（宽度不一致会由 normalize 补齐）
-SCENES = {
+#
+# 模块导入时只定义数据，不做任何计算/文件 I/O：normalize() 与外部动画加载
+# 推迟到第一次访问 SCENES / IDLE_SCENES / EXTERNAL_SCENES 时（见 ensure_loaded）。
+_SCENES = {
     "cat": {
         "color": "#000000",
         "fps": 2,
@@ -1254,7 +1257,7 @@ SCENES = {
 }
 
 # 待机场景：平时随机轮换这些（替代原图片 60s 随机换图）
-IDLE_SCENES = ["cat", "bunny", "coffee", "worker", "dice",
+_IDLE_SCENES = ["cat", "bunny", "coffee", "worker", "dice",
                "penguin", "dog", "robot", "ghost", "fish", "chick", "duck",
                "panda", "dancer", "ninja", "heart", "star", "sun", "fireworks",
                "fire", "snow", "rain", "butterfly", "frog", "crab", "owl",
@@ -1267,7 +1270,7 @@ IDLE_SCENES = ["cat", "bunny", "coffee", "worker", "dice",
 
 def normalize():
     """把所有场景的帧补齐到统一宽高，避免逐帧播放时文字跳动。"""
-    for scene in SCENES.values():
+    for scene in _SCENES.values():
         frames = scene["frames"]
         max_h = max(len(f) for f in frames)
         max_w = max(max(len(r) for r in f) for f in frames)
@@ -1278,9 +1281,8 @@ def normalize():
                 f[i] = row.ljust(max_w)
         scene["_width"] = max_w
         scene["_height"] = max_h
-
-
-normalize()
+        # 预渲染每帧的最终文本；外部动画替换场景时是新的 dict，会在这里重新生成
+        scene["_rendered"] = [_render_frame_uncached(scene, i) for i in range(len(frames))]
 
 
 # ── 外部场景导入 ─────────────────────────────────────────
@@ -1402,7 +1404,9 @@ def load_external_scenes(directory=None):
     if directory is None:
         directory = EXTERNAL_SCENES_DIR
     loaded = []
-    os.makedirs(directory, exist_ok=True)
+    # 目录不存在就是没有外部动画；由“Custom Animations...”对话框按需创建
+    if not os.path.isdir(directory):
+        return loaded
     for filename in sorted(os.listdir(directory)):
         if filename.startswith((".", "_")):
             continue
@@ -1421,21 +1425,49 @@ def load_external_scenes(directory=None):
         except Exception as e:
             logger.error("External ascii scene load failed: %s: %s", filename, e)
             continue
-        if name in SCENES:
+        if name in _SCENES:
             logger.warning("External ascii scene '%s' overrides builtin", name)
-        SCENES[name] = scene
+        _SCENES[name] = scene
         loaded.append(name)
         logger.info("External ascii scene loaded: %s <- %s", name, filename)
     if loaded:
         normalize()
         for name in loaded:
-            if not SCENES[name].get("_external_no_idle") and name not in IDLE_SCENES:
-                IDLE_SCENES.append(name)
+            if not _SCENES[name].get("_external_no_idle") and name not in _IDLE_SCENES:
+                _IDLE_SCENES.append(name)
     return loaded
 
 
-# 启动时自动加载用户放入 ascii_animations/ 的外部动画
-EXTERNAL_SCENES = load_external_scenes()
+# ── 延迟初始化 ───────────────────────────────────────────
+
+_LAZY_NAMES = ("SCENES", "IDLE_SCENES", "EXTERNAL_SCENES")
+_loaded = False
+
+
+def ensure_loaded():
+    """首次使用时归一化内置场景并加载外部动画（只执行一次）。
+
+    之后 SCENES / IDLE_SCENES / EXTERNAL_SCENES 成为普通模块属性，
+    访问不再经过 __getattr__。
+    """
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    normalize()
+    try:
+        external = load_external_scenes()
+    except OSError as e:
+        logger.error("External ascii scenes unavailable: %s", e)
+        external = []
+    globals().update(SCENES=_SCENES, IDLE_SCENES=_IDLE_SCENES, EXTERNAL_SCENES=external)
+
+
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        ensure_loaded()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ── 颜色工具 ──────────────────────────────────────────────
@@ -1447,12 +1479,8 @@ def _row_colors(color, n):
 
 # ── 渲染 ──────────────────────────────────────────────────
 
-def render_frame(scene, index):
-    """返回场景第 index 帧的显示文本。
-
-    rainbow 场景返回富文本（每行一个 <span> 颜色 + <br>），
-    否则返回多行纯文本（颜色由 QLabel 的 QSS 控制）。
-    """
+def _render_frame_uncached(scene, index):
+    """逐行拼出场景第 index 帧的显示文本（不查缓存）。"""
     frame = scene["frames"][index % len(scene["frames"])]
     if scene.get("rainbow"):
         colors = _row_colors(scene["color"], len(frame))
@@ -1460,3 +1488,22 @@ def render_frame(scene, index):
                  for row, c in zip(frame, colors)]
         return "<br>".join(lines)
     return "\n".join(frame)
+
+
+def rendered_frames(scene):
+    """返回场景所有帧的预渲染文本列表（normalize 时生成，缺失时现算并缓存）。"""
+    rendered = scene.get("_rendered")
+    if rendered is None or len(rendered) != len(scene["frames"]):
+        rendered = [_render_frame_uncached(scene, i) for i in range(len(scene["frames"]))]
+        scene["_rendered"] = rendered
+    return rendered
+
+
+def render_frame(scene, index):
+    """返回场景第 index 帧的显示文本（查预渲染缓存）。
+
+    rainbow 场景返回富文本（每行一个 <span> 颜色 + <br>），
+    否则返回多行纯文本（颜色由 QLabel 的 QSS 控制）。
+    """
+    rendered = rendered_frames(scene)
+    return rendered[index % len(rendered)]
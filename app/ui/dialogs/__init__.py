@@ -2,10 +2,12 @@ from .settings_dialog import SettingsDialog
 from .custom_timer_dialog import CustomTimerDialog
 from .reminder_dialog import ReminderDialog
 from .custom_ascii_help import CustomAsciiHelpDialog
+from .mirror_status import MirrorStatusDialog
 
 __all__ = [
     'SettingsDialog',
     'CustomTimerDialog',
     'ReminderDialog',
     'CustomAsciiHelpDialog',
+    'MirrorStatusDialog',
 ]
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""更新镜像状态对话框（浅色非模态）：显示镜像记分板。
+
+每个下载镜像的成功次数、成功率、首字节耗时、下载速度、退避状态和最近
+一次失败原因，排列顺序就是下次下载时尝试的顺序。数据来自
+utils/mirror_stats.py（mirror_stats.json），命令行可用
+``python -m app.utils.mirror_stats`` 查看同一张表。
+"""
+from PyQt5.QtWidgets import QPlainTextEdit, QMessageBox
+from PyQt5.QtGui import QFontDatabase
+
+from app.ui.dialogs.common import LightDialog
+from app.utils.logger import logger
+from app.utils.mirror_stats import mirror_scoreboard
+
+
+class MirrorStatusDialog(LightDialog):
+    """「Mirror Status...」诊断弹窗。
+
+    mirrors 为要列出的镜像名（含没有记录的）；为 None 时只列出有记录的。
+    """
+
+    def __init__(self, parent=None, mirrors=None, scoreboard=None):
+        super().__init__("更新镜像状态 · Mirror Status", parent)
+        logger.debug("MirrorStatusDialog opening")
+        self._mirrors = list(mirrors) if mirrors is not None else None
+        self._scoreboard = scoreboard or mirror_scoreboard
+        self._build_body()
+        self._build_buttons()
+        self.refresh()
+
+    # ── 内容区 ────────────────────────────────────────────
+
+    def _build_body(self):
+        self.setMinimumWidth(760)
+
+        self.add_hero("📡", "更新镜像状态",
+                      "按下次下载的尝试顺序排列；连续失败的镜像会暂时排到最后")
+
+        mono = QFontDatabase.systemFont(QFontDatabase.FixedFont)
+        mono.setPointSize(10)
+        table = QPlainTextEdit()
+        table.setReadOnly(True)
+        table.setLineWrapMode(QPlainTextEdit.NoWrap)
+        table.setFont(mono)
+        table.setFixedHeight(220)
+        table.setStyleSheet(
+            "QPlainTextEdit { background: #f7f8fa; color: #333333;"
+            "  border: 1px solid #e6e8eb; border-radius: 8px;"
+            "  padding: 8px; }"
+        )
+        self.content_layout.addWidget(table)
+        self._table_edit = table
+
+    # ── 底部按钮行 ───────────────────────────────────────
+
+    def _build_buttons(self):
+        reset_btn = self.make_button("重置统计", on_click=self._reset)
+        refresh_btn = self.make_button("刷新", on_click=self.refresh)
+        done_btn = self.make_primary_button("完成 OK", on_click=self.accept)
+
+        self.button_layout.addWidget(reset_btn)
+        self.button_layout.addStretch()
+        self.button_layout.addWidget(refresh_btn)
+        self.button_layout.addWidget(done_btn)
+
+    # ── 逻辑 ────────────────────────────────────────────
+
+    def refresh(self):
+        self._table_edit.setPlainText(self._scoreboard.format_table(self._mirrors))
+
+    def _reset(self):
+        answer = QMessageBox.question(self, "重置统计", "清空所有镜像的成功率和耗时记录？")
+        if answer != QMessageBox.Yes:
+            return
+        self._scoreboard.reset()
+        logger.info("Mirror stats reset from diagnostics dialog")
+        self.refresh()
+
+    def table_text(self):
+        """供测试/调试使用：返回当前显示的表格。"""
+        return self._table_edit.toPlainText()
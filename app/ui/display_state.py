@@ -0,0 +1,50 @@
+"""显示状态脏检查：只在内容真正变化时才去动 Qt 控件。
+
+主窗口每 100ms 刷新一次倒计时，但显示的是取整后的秒数，十次里有九次
+文本和上次一样；setText / adjustSize / setStyleSheet 每次都会触发重绘甚至
+重新布局。DisplayState 记住每个显示目标上一次应用的值，相同就跳过，
+并分别统计应用 / 跳过次数，方便验证刷新次数确实下降。
+"""
+
+
+class DisplayState:
+    """按目标名记录上一次应用的值。
+
+    ``update(key, value, apply)``：value 与上次不同才调用 ``apply(value)``。
+    比较用的值可以通过 token 单独给出（例如图片用文件路径代替 QPixmap 本身）。
+    """
+
+    _MISSING = object()
+
+    def __init__(self):
+        self._last = {}
+        self.applied = 0
+        self.skipped = 0
+        self._per_key = {}
+
+    def update(self, key, value, apply, token=_MISSING):
+        """value（或 token）变化时调用 apply(value) 并返回 True，否则跳过返回 False。"""
+        if token is self._MISSING:
+            token = value
+        counts = self._per_key.setdefault(key, [0, 0])
+        if self._last.get(key, self._MISSING) == token:
+            self.skipped += 1
+            counts[1] += 1
+            return False
+        apply(value)
+        self._last[key] = token
+        self.applied += 1
+        counts[0] += 1
+        return True
+
+    def invalidate(self, key=None):
+        """忘记上一次的值（控件被外部改过时调用），下次 update 必定应用。"""
+        if key is None:
+            self._last.clear()
+        else:
+            self._last.pop(key, None)
+
+    def stats(self):
+        """{目标名: {"applied": n, "skipped": m}}"""
+        return {key: {"applied": applied, "skipped": skipped}
+                for key, (applied, skipped) in self._per_key.items()}
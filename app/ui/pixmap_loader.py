@@ -0,0 +1,125 @@
+"""异步宠物图片加载：解码和透明化放到线程池，GUI 线程只负责贴图。
+
+图片解码、numpy 透明化原来直接在 _apply_mode / _pick_random_image 这些槽
+函数里同步执行，大图会卡住界面。AsyncPixmapLoader 把 ``transparent_image``
+（只用 QImage，线程安全；numpy 的大部分运算会释放 GIL）丢进 QThreadPool，
+完成后通过排队信号回到 GUI 线程，转成 QPixmap 放进 pixmap_cache 再发出
+``ready``。
+
+每个请求属于一个“槽位”（例如 'pet'），同一槽位的新请求会让旧请求作废：
+还在排队的任务开始前发现自己已作废就直接返回，已经在算的结果到达后丢弃。
+"""
+import itertools
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+from app.utils.image import cached_pixmap, remember_pixmap, transparent_image
+from app.utils.logger import logger
+
+
+class _JobSignals(QObject):
+    finished = pyqtSignal(int, QImage)
+
+
+class _ImageJob(QRunnable):
+
+    def __init__(self, request_id, path, target_size, device_pixel_ratio, is_stale, signals):
+        super().__init__()
+        self._request_id = request_id
+        self._path = path
+        self._target_size = target_size
+        self._device_pixel_ratio = device_pixel_ratio
+        self._is_stale = is_stale
+        self._signals = signals
+
+    def run(self):
+        image = QImage()
+        if not self._is_stale(self._request_id):
+            try:
+                image = transparent_image(self._path, self._target_size, self._device_pixel_ratio)
+            except Exception as e:
+                logger.error(f"Background image job failed for {self._path}: {e}", exc_info=True)
+        # 无论是否作废都要回报，GUI 线程据此清理记录
+        self._signals.finished.emit(self._request_id, image)
+
+
+class AsyncPixmapLoader(QObject):
+    """ready(slot, path, pixmap) / failed(slot, path) 都在 GUI 线程发出。"""
+
+    ready = pyqtSignal(str, str, QPixmap)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._signals = _JobSignals(self)
+        self._signals.finished.connect(self._on_job_finished, Qt.QueuedConnection)
+        self._ids = itertools.count(1)
+        self._requests = {}   # request_id -> (slot, path, target_size, dpr)
+        self._slots = {}      # slot -> 当前有效的 request_id
+        self.completed_count = 0
+        self.stale_count = 0
+
+    @property
+    def pending_count(self):
+        return len(self._requests)
+
+    def request(self, slot, path, target_size=None, device_pixel_ratio=1.0):
+        """请求加载 path；同一槽位的旧请求作废。返回请求 id。"""
+        self.cancel(slot)
+        request_id = next(self._ids)
+        self._requests[request_id] = (slot, path, target_size, device_pixel_ratio)
+        self._slots[slot] = request_id
+
+        pixmap = cached_pixmap(path, target_size, device_pixel_ratio)
+        if pixmap is not None:
+            # 命中内存缓存也走事件循环回调，调用方看到的时序一致
+            QTimer.singleShot(0, lambda: self._deliver(request_id, pixmap))
+            return request_id
+
+        self._pool.start(_ImageJob(request_id, path, target_size, device_pixel_ratio,
+                                   self._is_stale, self._signals))
+        return request_id
+
+    def cancel(self, slot):
+        """作废槽位上未完成的请求；返回是否真的有请求被作废。"""
+        request_id = self._slots.pop(slot, None)
+        if request_id is None or self._requests.pop(request_id, None) is None:
+            return False
+        self.stale_count += 1
+        logger.debug(f"Cancelled stale image request #{request_id} ({slot})")
+        return True
+
+    def shutdown(self, timeout_ms=1000):
+        """作废所有请求并等待正在运行的任务结束（退出程序前调用）。"""
+        for slot in list(self._slots):
+            self.cancel(slot)
+        self._pool.clear()
+        self._pool.waitForDone(timeout_ms)
+
+    def _is_stale(self, request_id):
+        # 在工作线程里调用：只做一次字典成员判断，GIL 下是原子的
+        return request_id not in self._requests
+
+    def _on_job_finished(self, request_id, image):
+        request = self._requests.get(request_id)
+        if request is None:
+            return
+        slot, path, target_size, device_pixel_ratio = request
+        self._deliver(request_id, remember_pixmap(path, image, target_size, device_pixel_ratio))
+
+    def _deliver(self, request_id, pixmap):
+        request = self._requests.pop(request_id, None)
+        if request is None:
+            return
+        slot, path = request[0], request[1]
+        if self._slots.get(slot) == request_id:
+            del self._slots[slot]
+        if pixmap.isNull():
+            logger.warning(f"Failed to load image: {path}")
+            self.failed.emit(slot, path)
+            return
+        self.completed_count += 1
+        self.ready.emit(slot, path, pixmap)
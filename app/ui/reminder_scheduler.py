@@ -0,0 +1,150 @@
+"""统一提醒调度：所有命名提醒共用一个最小堆 + 一个单次 QTimer。
+
+原来下班提醒、日志提醒、自定义倒计时、庆祝结束、自动更新检查各自一个
+QTimer / singleShot，启动时按“还有多少毫秒”一次性设好。电脑睡眠 / 休眠
+后这些相对延迟会漂移，提醒明显迟到。
+
+ReminderScheduler 记录的是绝对的墙上时间截止点（``time.time()`` 时间戳），
+按截止时间放进最小堆，只让一个 QTimer 对准堆顶：
+
+- ``add / reschedule / cancel`` 都是 O(log n)（取消采用惰性删除，出堆时丢弃）；
+- 每次醒来重新读墙上时间，到期的提醒全部触发，同一时刻到期的共用一次唤醒；
+- 单次睡眠最长 ``max_sleep_ms``，睡眠 / 休眠回来后最多晚这么久就能补发；
+  也可以在窗口恢复显示等时机主动调用 ``recheck()``。
+"""
+import datetime
+import heapq
+import itertools
+import math
+import time
+
+from PyQt5.QtCore import QObject, Qt, QTimer
+
+from app.utils.logger import logger
+
+# 单次睡眠上限（毫秒）：QTimer 的相对延迟在系统睡眠期间可能不走，
+# 封顶后醒来按墙上时间重新判断
+MAX_SLEEP_MS = 30 * 1000
+
+
+def _to_timestamp(deadline):
+    if isinstance(deadline, datetime.datetime):
+        return deadline.timestamp()
+    return float(deadline)
+
+
+class ReminderScheduler(QObject):
+    """按名字管理的提醒。deadline 可以是 datetime 或 ``time.time()`` 时间戳。"""
+
+    def __init__(self, parent=None, clock=time.time, max_sleep_ms=MAX_SLEEP_MS):
+        super().__init__(parent)
+        self._clock = clock
+        self._max_sleep_ms = max_sleep_ms
+        self._heap = []       # [deadline, seq, name]；取消后 name 置 None
+        self._entries = {}    # name -> 堆里对应的条目
+        self._callbacks = {}
+        self._seq = itertools.count()
+        self.wakeup_count = 0
+        self.fired_count = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        # 默认的 CoarseTimer 允许提前 5% 触发，醒来时提醒还没到期只能空转一次
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def add(self, name, deadline, callback):
+        """安排（或替换）名为 name 的提醒，到 deadline 时调用 callback()。"""
+        self._discard(name)
+        self._callbacks[name] = callback
+        self._push(name, _to_timestamp(deadline))
+        self._rearm()
+
+    def add_after(self, name, seconds, callback):
+        self.add(name, self._clock() + seconds, callback)
+
+    def reschedule(self, name, deadline):
+        """只改截止时间，沿用原来的回调；name 不存在时抛 KeyError。"""
+        if name not in self._entries:
+            raise KeyError(name)
+        self._discard(name, keep_callback=True)
+        self._push(name, _to_timestamp(deadline))
+        self._rearm()
+
+    def cancel(self, name):
+        """取消提醒；返回是否真的有这个提醒。"""
+        if name not in self._entries:
+            return False
+        self._discard(name)
+        self._rearm()
+        return True
+
+    def deadline(self, name):
+        entry = self._entries.get(name)
+        return entry[0] if entry is not None else None
+
+    def remaining(self, name):
+        """距离提醒触发还有多少秒（不会小于 0）；没有该提醒时返回 None。"""
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        return max(0.0, entry[0] - self._clock())
+
+    def recheck(self):
+        """按当前墙上时间触发所有到期提醒并重新对准下一个（睡眠唤醒后调用）。"""
+        self._fire_due()
+        self._rearm()
+
+    def _push(self, name, deadline):
+        entry = [deadline, next(self._seq), name]
+        self._entries[name] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _discard(self, name, keep_callback=False):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            entry[2] = None
+        if not keep_callback:
+            self._callbacks.pop(name, None)
+        # 作废条目过多时重建堆，避免反复取消让堆无限膨胀
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._heap = [e for e in self._heap if e[2] is not None]
+            heapq.heapify(self._heap)
+
+    def _fire_due(self):
+        now = self._clock()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, name = heapq.heappop(self._heap)
+            if name is None:
+                continue
+            del self._entries[name]
+            due.append((name, self._callbacks.pop(name)))
+        # 先全部出堆再回调：回调里可以安全地 add / cancel
+        for name, callback in due:
+            self.fired_count += 1
+            logger.debug(f"Reminder fired: {name}")
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Reminder {name!r} callback failed: {e}", exc_info=True)
+
+    def _rearm(self):
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._timer.stop()
+            return
+        delay_ms = (self._heap[0][0] - self._clock()) * 1000
+        # 向上取整：宁可晚 1ms，也不要提前醒来空转一次
+        self._timer.start(int(max(0, min(self._max_sleep_ms, math.ceil(delay_ms)))))
+
+    def _on_timeout(self):
+        self.wakeup_count += 1
+        self.recheck()
@@ -0,0 +1,115 @@
+"""置顶守护：窗口被遮挡 / 隐藏 / 最小化时把它找回来，而不是每帧重设窗口标志。
+
+原来的做法是每 100ms 调用一次 setWindowFlags + show()。Windows 上修改窗口
+标志会销毁并重建原生窗口，是整个程序最贵的操作。这里改为：
+
+- 事件驱动：窗口失去激活（可能被别的窗口盖住）→ raise_()；
+  被外部隐藏 / 最小化 → 下一轮事件循环里重新显示；
+- 程序自己要隐藏 / 最小化时走 hide_window() / minimize_window()，守护不会
+  把窗口找回来（显示刷新也就能随之挂起），直到窗口再次正常显示；
+- 慢速看门狗：每隔一段时间检查一次，只有置顶标志真的丢了才重设窗口标志。
+
+recreate_count 统计原生窗口实际被重建的次数（WinIdChange 事件），
+reapply_count 统计本守护主动重设窗口标志的次数。
+"""
+from PyQt5.QtCore import QEvent, QObject, Qt, QTimer
+
+from app.utils.logger import logger
+
+
+class StayOnTopGuardian(QObject):
+
+    def __init__(self, window, flags, watchdog_interval_ms=5000):
+        super().__init__(window)
+        self._window = window
+        self._flags = flags
+        self._restore_pending = False
+        self._hidden_by_app = False
+        self.recreate_count = 0
+        self.reapply_count = 0
+        self.raise_count = 0
+        self.restore_count = 0
+        window.installEventFilter(self)
+
+        self._watchdog = QTimer(self)
+        self._watchdog.timeout.connect(self.check)
+        self._watchdog.start(watchdog_interval_ms)
+
+    @property
+    def hidden_by_app(self) -> bool:
+        return self._hidden_by_app
+
+    def hide_window(self):
+        """程序主动隐藏窗口：不算被外部隐藏，守护不恢复。"""
+        self._hidden_by_app = True
+        self._window.hide()
+
+    def minimize_window(self):
+        """程序主动最小化窗口：同上。"""
+        self._hidden_by_app = True
+        self._window.showMinimized()
+
+    def eventFilter(self, obj, event):
+        if obj is self._window:
+            etype = event.type()
+            if etype == QEvent.WinIdChange:
+                # 销毁（句柄变 0）和重建各发一次，只统计新句柄出现
+                win_id = self._window.effectiveWinId()
+                if win_id is None or not int(win_id):
+                    return False
+                self.recreate_count += 1
+                logger.debug(f"Native window re-created (#{self.recreate_count})")
+            elif etype == QEvent.WindowDeactivate:
+                # 失去激活通常意味着别的窗口到了前面；raise_ 只调整 z 序，不重建窗口
+                self._raise()
+            elif etype == QEvent.Hide or (etype == QEvent.WindowStateChange
+                                          and self._window.isMinimized()):
+                if not self._hidden_by_app:
+                    self._schedule_restore()
+            elif etype in (QEvent.Show, QEvent.WindowStateChange):
+                # 重新正常显示（托盘 Show Window / 任务栏还原）后恢复守护
+                if self._window.isVisible() and not self._window.isMinimized():
+                    self._hidden_by_app = False
+        return False
+
+    def _raise(self):
+        self.raise_count += 1
+        self._window.raise_()
+
+    def _schedule_restore(self):
+        # 不能在 Hide 事件里直接 show()，推迟到下一轮事件循环
+        if not self._restore_pending:
+            self._restore_pending = True
+            QTimer.singleShot(0, self._restore)
+
+    def _restore(self):
+        self._restore_pending = False
+        if self._hidden_by_app:
+            return
+        window = self._window
+        if window.isMinimized():
+            window.showNormal()
+        elif not window.isVisible():
+            window.show()
+        else:
+            return
+        self.restore_count += 1
+        logger.debug("Stay-on-top guardian restored hidden window")
+
+    def check(self):
+        """看门狗：置顶标志丢失才重设（会重建原生窗口），否则只保证可见并置前。"""
+        window = self._window
+        if (window.windowFlags() & self._flags) != self._flags:
+            self.reapply_count += 1
+            logger.info("Window flags lost, re-applying stay-on-top flags")
+            window.setWindowFlags(window.windowFlags() | self._flags)
+            window.setAttribute(Qt.WA_TranslucentBackground)
+            if not self._hidden_by_app:
+                window.show()
+            return
+        if self._hidden_by_app:
+            return
+        if not window.isVisible() or window.isMinimized():
+            self._restore()
+        else:
+            self._raise()
@@ -0,0 +1,124 @@
+"""自适应刷新调度：按需唤醒，窗口不可见时完全停摆。
+
+倒计时只显示整秒，原来固定 100ms 刷新一次，窗口隐藏 / 锁屏时也照跑，
+10Hz 的唤醒让笔记本 CPU 整天进不了深度休眠。TickScheduler 只用一个单次
+QTimer：每次回调返回“距离下一次需要刷新还有多少毫秒”（下一个秒数跳变、
+下一次显示模式重掷、下一次换场景里最早的那个），到点再醒。
+
+窗口隐藏、最小化或原生窗口未暴露（被遮挡 / 锁屏时平台会撤销 expose）时
+停止调度；重新可见时立即刷新一次并恢复。
+"""
+from PyQt5.QtCore import QEvent, QObject, Qt, QTimer, pyqtSignal
+
+from app.utils.logger import logger
+
+# 两次唤醒的最小 / 最大间隔（毫秒）
+MIN_TICK_MS = 20
+MAX_TICK_MS = 60 * 1000
+
+
+def ms_until_display_change(remaining_ms):
+    """倒计时按 '{:.0f}' 四舍五入显示秒数时，距离显示值下一次变化的毫秒数。
+
+    显示值在剩余时间跨过 k*1000+500 毫秒时变化；+1 保证醒来时已经跨过。
+    """
+    remaining_ms = int(remaining_ms)
+    if remaining_ms < 500:
+        return remaining_ms + 1
+    return (remaining_ms - 500) % 1000 + 1
+
+
+class TickScheduler(QObject):
+    """callback() 执行一次刷新并返回下一次唤醒的延迟（毫秒）。"""
+
+    suspended = pyqtSignal()
+    resumed = pyqtSignal()
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self._widget = widget
+        self._callback = callback
+        self._window_handle = None
+        self._suspended = False
+        self.tick_count = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        # CoarseTimer 可能提前 5% 醒来，秒数还没跳变就白白刷新一次
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+        widget.installEventFilter(self)
+        self._watch_window_handle()
+
+    @property
+    def is_suspended(self) -> bool:
+        return self._suspended
+
+    def is_widget_visible(self):
+        widget = self._widget
+        if not widget.isVisible() or widget.isMinimized():
+            return False
+        handle = widget.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def wake(self):
+        """状态变了（启动计时器 / 结束庆祝等），尽快刷新一次。"""
+        if not self._suspended:
+            self._timer.start(0)
+
+    def start(self):
+        self._suspended = False
+        self._timer.start(0)
+
+    def _tick(self):
+        if not self.is_widget_visible():
+            self._suspend()
+            return
+        self.tick_count += 1
+        try:
+            delay = self._callback()
+        except Exception as e:
+            logger.error(f"Display tick failed: {e}", exc_info=True)
+            delay = 1000
+        self._timer.start(max(MIN_TICK_MS, min(MAX_TICK_MS, int(delay))))
+
+    def _suspend(self):
+        if self._suspended:
+            return
+        self._suspended = True
+        self._timer.stop()
+        logger.debug("Display ticks suspended (window not visible)")
+        self.suspended.emit()
+
+    def _resume(self):
+        if not self._suspended or not self.is_widget_visible():
+            return
+        self._suspended = False
+        logger.debug("Display ticks resumed")
+        self.resumed.emit()
+        self._timer.start(0)
+
+    def _watch_window_handle(self):
+        # 原生窗口重建后 windowHandle 会换成新对象，需要重新挂过滤器
+        handle = self._widget.windowHandle()
+        if handle is not None and handle is not self._window_handle:
+            handle.installEventFilter(self)
+            self._window_handle = handle
+
+    def eventFilter(self, obj, event):
+        etype = event.type()
+        if obj is self._widget:
+            if etype == QEvent.WinIdChange:
+                self._watch_window_handle()
+            elif etype in (QEvent.Hide, QEvent.WindowStateChange):
+                if not self.is_widget_visible():
+                    self._suspend()
+                else:
+                    self._resume()
+            elif etype == QEvent.Show:
+                # Show 事件发出时窗口可能还没 expose，推迟到下一轮事件循环再判断
+                QTimer.singleShot(0, self._resume)
+        elif obj is self._window_handle and etype == QEvent.Expose:
+            QTimer.singleShot(0, self._resume if self.is_widget_visible() else self._suspend)
+        return False
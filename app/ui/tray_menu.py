@@ -53,6 +53,10 @@ class TrayMenu:
         self.settings_action = QAction("Settings...", self.parent)
         self.menu.addAction(self.settings_action)
 
+        # Update mirror diagnostics (success rate / latency scoreboard)
+        self.mirror_status_action = QAction("Mirror Status...", self.parent)
+        self.menu.addAction(self.mirror_status_action)
+
         self.menu.addSeparator()
 
         # Quit
@@ -1,6 +1,18 @@
-"""图片工具：加载图片资源时自动把白色背景转成透明。"""
-import numpy as np
-from PyQt5.QtGui import QImage, QPixmap, QIcon
+"""图片工具：加载图片资源时自动把白色背景转成透明（SVG 直接渲染成透明图）。
+
+numpy 导入耗时约 100ms，只在真正处理图片时才在函数内导入，不拖慢应用冷启动。
+按路径加载的结果会放进进程内的 LRU 缓存（pixmap_cache），同一张图不重复处理；
+同时写入磁盘缓存（image_cache.disk_image_cache），下次启动直接读取，不用导入 numpy；
+打包进 exe 的内置图片在构建时已经烘焙好（image_cache.baked_assets），首次启动也不用处理。
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QImage, QImageReader, QPainter, QPixmap, QIcon
+
+from app.utils.image_cache import baked_assets, disk_image_cache
 
 # 背景透明化阈值（针对白底 255,255,255）
 # 像素到白色的距离 < TRANSPARENT_DIST → 完全透明
@@ -9,94 +21,463 @@ from PyQt5.QtGui import QImage, QPixmap, QIcon
 TRANSPARENT_DIST = 40.0
 OPAQUE_DIST = 140.0
 
+# 指定 target_size 时先把图片缩到 目标尺寸 × SUPERSAMPLE 再去背景，
+# 最后平滑缩到目标尺寸：多留的分辨率让抗锯齿边缘不会被阈值“切硬”
+SUPERSAMPLE = 4
 
-def _to_rgba_array(image):
-    """QImage -> RGBA numpy 数组（返回可写副本）。"""
+# 整数核：到白色的平方距离与平方阈值比较；背景像素的不透明度系数查表
+# （定点数，×2^_ALPHA_SHIFT），表的最后一项是 1.0，留给非背景像素
+_OPAQUE_D2 = int(OPAQUE_DIST * OPAQUE_DIST)
+_ALPHA_SHIFT = 16
+# 小于这个像素数的图复用线程内的临时缓冲；更大的图用完即释放，不常驻内存
+_SCRATCH_KEEP_PIXELS = 1024 * 1024
+
+# 处理结果缓存的字节预算（按位图实际占用估算）
+PIXMAP_CACHE_BYTES = 32 * 1024 * 1024
+
+# 磁盘缓存键里的处理版本：阈值 / 超采样 / 算法变化时旧条目自动失效
+DISK_CACHE_VERSION = ("transparent-v1", TRANSPARENT_DIST, OPAQUE_DIST, SUPERSAMPLE)
+
+# SVG 是矢量图、自带透明背景：按 (文件, 尺寸, DPR) 直接渲染一次，
+# 不超采样也不去白底（图里本来的白色部分要保留）
+SVG_EXTENSIONS = ('.svg', '.svgz')
+SVG_CACHE_VERSION = ("svg-v1",)
+
+
+class _QImagePixels:
+    """通过 __array_interface__ 把 QImage 的像素暴露给 numpy。
+
+    numpy 数组的 base 就是这个对象，它持有 QImage 的引用：只要视图还在，
+    像素内存就不会被释放。
+    """
+
+    def __init__(self, image):
+        self.image = image
+        # 先用非 const 的 bits() 让像素数据只属于这个 QImage；detach 后的新数据
+        # 行跨度可能和原来不同，所以之后再读 bytesPerLine
+        address = int(image.bits())
+        self.__array_interface__ = {
+            'version': 3,
+            'typestr': '|u1',
+            'shape': (image.height(), image.width(), 4),
+            'strides': (image.bytesPerLine(), 4, 1),   # 行尾填充字节直接跳过
+            'data': (address, False),
+        }
+
+
+def rgba_view(image):
+    """QImage -> (独占像素的 RGBA8888 QImage, 其像素的可写 numpy 视图)。
+
+    视图形状为 (h, w, 4)，直接指向 QImage 的内存：原地改数组就是改图片，
+    处理完把同一个 QImage 交给 QPixmap.fromImage，中间不再整帧拷贝。
+
+    - 格式不是 RGBA8888 时 convertToFormat 本来就会生成新图；已经是时
+      bits() 会让共享数据分离（detach），调用方手里的原图不受影响；
+    - 行跨度按 bytesPerLine 处理，行尾有填充字节时视图跳过填充；
+    - 视图持有 QImage 的引用，单独保留视图也不会悬空。
+    """
+    import numpy as np
     image = image.convertToFormat(QImage.Format_RGBA8888)
-    w, h = image.width(), image.height()
-    ptr = image.bits()
-    ptr.setsize(image.byteCount())
-    return np.frombuffer(ptr, np.uint8).reshape((h, w, 4)).copy()
+    if image.isNull():
+        return image, np.zeros((0, 0, 4), dtype=np.uint8)
+    return image, np.asarray(_QImagePixels(image))
 
 
-def _from_rgba_array(arr):
-    """RGBA numpy 数组 -> QPixmap。"""
-    h, w = arr.shape[:2]
-    image = QImage(arr.data, w, h, arr.strides[0], QImage.Format_RGBA8888)
-    return QPixmap.fromImage(image.copy())
+def _to_rgba_array(image):
+    """QImage -> RGBA numpy 数组（独立副本，不引用 QImage 内存）。"""
+    return rgba_view(image)[1].copy()
 
 
 def _flood_fill_background(white_mask):
-    """从图像四条边开始 flood fill，标记与边缘连通的背景区域。
+    """从图像四条边开始 flood fill，标记与边缘连通的背景区域（4 邻接）。
 
     只返回与边缘连通的白色像素，内部白色区域不会被标记为背景。
+
+    原来的实现逐轮膨胀，最多 h+w 轮、每轮扫全图，大图要卡好几秒。现在按
+    连通分量做一次标记，总耗时与像素数成线性：
+
+    1. 把每行的白色像素压成行程（run），一次 diff 得到所有行程的起止；
+    2. 相邻两行中列区间重叠的行程互相连通，用 searchsorted 一次求出；
+    3. 在行程图上做并查集（批量挂接 + 路径压缩，通常几轮就收敛）；
+    4. 与边缘行程同根的行程就是背景，用差分 + cumsum 还原成像素掩码。
+
+    结果与旧实现逐位一致；唯一的区别是旧实现膨胀 h+w 轮后会截断，
+    蛇形通道这类测地距离更长的背景以前填不满，现在能完整标记。
     """
+    import numpy as np
     h, w = white_mask.shape
-    bg = np.zeros((h, w), dtype=bool)
-    # 从四条边上的白色像素开始
-    bg[0, :] = white_mask[0, :]
-    bg[-1, :] = white_mask[-1, :]
-    bg[:, 0] = white_mask[:, 0]
-    bg[:, -1] = white_mask[:, -1]
-
-    # 迭代膨胀直到收敛
-    for _ in range(h + w):
-        expanded = np.zeros_like(bg)
-        expanded[1:, :] |= bg[:-1, :]
-        expanded[:-1, :] |= bg[1:, :]
-        expanded[:, 1:] |= bg[:, :-1]
-        expanded[:, :-1] |= bg[:, 1:]
-        expanded &= white_mask
-        new_bg = bg | expanded
-        if np.array_equal(new_bg, bg):
+    # 每行末尾补一列 False，保证行程不会跨行；width 为补列后的行宽
+    width = w + 1
+    padded = np.zeros((h, width + 1), dtype=np.int8)
+    padded[:, 1:w + 1] = white_mask
+    edges = np.diff(padded, axis=1).ravel()
+    starts = np.flatnonzero(edges == 1)     # 行程起点（展平下标，含）
+    ends = np.flatnonzero(edges == -1)      # 行程终点（展平下标，不含）
+    n = starts.size
+    if n == 0:
+        return np.zeros((h, w), dtype=bool)
+    rows = starts // width
+
+    # 行程 a 与下一行的行程 b 相连 ⇔ b.start < a.end 且 b.end > a.start
+    first = np.searchsorted(ends, starts + width, side='right')
+    stop = np.searchsorted(starts, ends + width, side='left')
+    counts = np.maximum(stop - first, 0)
+    u = np.repeat(np.arange(n), counts)
+    v = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(u.size)
+
+    parent = np.arange(n)
+    while u.size:
+        pu, pv = parent[u], parent[v]
+        linked = pu != pv
+        if not linked.any():
             break
-        bg = new_bg
+        pu, pv = pu[linked], pv[linked]
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
 
-    return bg
+    cols_start = starts - rows * width
+    cols_end = ends - rows * width
+    on_edge = (rows == 0) | (rows == h - 1) | (cols_start == 0) | (cols_end == w)
+    edge_root = np.zeros(n, dtype=bool)
+    edge_root[parent[on_edge]] = True
+    keep = edge_root[parent]
 
+    # 行程互不重叠，前缀和只会是 0 / 1：int8 原地累加后直接当 bool 视图返回
+    delta = np.zeros(h * width, dtype=np.int8)
+    delta[starts[keep]] = 1
+    delta[ends[keep]] = -1
+    np.cumsum(delta, out=delta)
+    return delta.view(np.bool_).reshape(h, width)[:, :w]
 
-def transparent_pixmap(path_or_pixmap):
-    """加载图片并去掉白色背景，返回 QPixmap。
 
-    - 传入路径或 QPixmap 均可；文件不存在或解码失败时原样返回（避免崩溃）。
-    - 只处理与图像边缘连通的白色背景，内部白色像素保持不变；
-      抗锯齿边缘按到白色的距离线性过渡，保留半透明轮廓。
+def _to_qsize(size):
+    """target_size 可以是 int（正方形）、(w, h) 或 QSize。"""
+    if isinstance(size, QSize):
+        return QSize(size)
+    if isinstance(size, int):
+        return QSize(size, size)
+    w, h = size
+    return QSize(int(w), int(h))
+
+
+def _load_image(source, work_size=None):
+    """读取图片为 QImage；给定 work_size 且图片更大时按比例缩小（只缩不放）。
+
+    传入路径时用 QImageReader 在解码阶段就缩小，JPEG 等格式可直接按
+    DCT 缩放解码，根本不会生成全分辨率位图。QImage 可以在任意线程使用。
     """
-    if isinstance(path_or_pixmap, QPixmap):
-        pixmap = path_or_pixmap
+    if isinstance(source, QPixmap):
+        image = source.toImage()
+    elif isinstance(source, QImage):
+        image = source
     else:
-        pixmap = QPixmap(path_or_pixmap)
-    if pixmap.isNull():
-        return pixmap
+        reader = QImageReader(source)
+        size = reader.size()
+        if work_size is not None and size.isValid() and (
+                size.width() > work_size.width() or size.height() > work_size.height()):
+            reader.setScaledSize(size.scaled(work_size, Qt.KeepAspectRatio))
+        return reader.read()
+    if work_size is None:
+        return image
+    if image.width() > work_size.width() or image.height() > work_size.height():
+        image = image.scaled(work_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+
+_alpha_lut = None
+_scratch = threading.local()
+
+
+def _alpha_ramp_lut():
+    """平方距离 d2（0 ~ _OPAQUE_D2）-> 定点不透明度系数。
+
+    系数和原来的浮点公式一致：clip((sqrt(d2) - T) / (O - T), 0, 1)，
+    只在第一次用到时计算一次（约 2 万项）。
+    """
+    global _alpha_lut
+    if _alpha_lut is None:
+        import numpy as np
+        dist = np.sqrt(np.arange(_OPAQUE_D2, dtype=np.float32))
+        factor = np.clip((dist - TRANSPARENT_DIST) / (OPAQUE_DIST - TRANSPARENT_DIST), 0.0, 1.0)
+        lut = np.empty(_OPAQUE_D2 + 1, dtype=np.int32)
+        lut[:-1] = np.rint(factor * (1 << _ALPHA_SHIFT))
+        lut[-1] = 1 << _ALPHA_SHIFT
+        _alpha_lut = lut
+    return _alpha_lut
+
+
+def _scratch_buffers(n):
+    """两块 n 个元素的 int32 临时缓冲；小图在同一线程内反复复用。"""
+    import numpy as np
+    if n > _SCRATCH_KEEP_PIXELS:
+        return np.empty(n, dtype=np.int32), np.empty(n, dtype=np.int32)
+    buffers = getattr(_scratch, 'buffers', None)
+    if buffers is None or buffers[0].size < n:
+        buffers = (np.empty(_SCRATCH_KEEP_PIXELS, dtype=np.int32),
+                   np.empty(_SCRATCH_KEEP_PIXELS, dtype=np.int32))
+        _scratch.buffers = buffers
+    return buffers[0][:n], buffers[1][:n]
+
+
+def remove_white_background(rgba, out=None):
+    """对 (h, w, 4) uint8 RGBA 数组做白底透明化，原地修改并返回结果数组。
+
+    - out 为 None 时直接改写 rgba；给出 out（同形状 uint8 数组，可跨调用复用）
+      时先拷贝到 out 再处理，rgba 保持不变；
+    - 全程整数运算：到白色的平方距离（int32）与平方阈值比较，不开 sqrt；
+      背景像素的新 alpha = alpha × 查表系数 >> 16，与原浮点实现最多差 1；
+    - 临时数组只有两块 int32 缓冲（线程内复用）和 flood fill 用的掩码，
+      不再为每个通道各拷一份 float32。
+    """
+    import numpy as np
+    if out is None:
+        out = rgba
+    elif out is not rgba:
+        np.copyto(out, rgba)
+    h, w = out.shape[:2]
+    d2, tmp = _scratch_buffers(h * w)
+    d2 = d2.reshape(h, w)
+    tmp = tmp.reshape(h, w)
+
+    # 每个像素到白色 (255,255,255) 的平方距离
+    np.subtract(255, out[..., 0], out=d2, dtype=np.int32)
+    np.multiply(d2, d2, out=d2)
+    for channel in (1, 2):
+        np.subtract(255, out[..., channel], out=tmp, dtype=np.int32)
+        np.multiply(tmp, tmp, out=tmp)
+        np.add(d2, tmp, out=d2)
 
-    arr = _to_rgba_array(pixmap.toImage())
+    # 接近白色的像素里，与边缘连通的才是背景
+    is_background = _flood_fill_background(d2 < _OPAQUE_D2)
 
-    r = arr[..., 0].astype(np.float32)
-    g = arr[..., 1].astype(np.float32)
-    b = arr[..., 2].astype(np.float32)
+    # 查表下标：背景像素用平方距离（背景一定 < _OPAQUE_D2），其余指向系数 1.0
+    np.logical_not(is_background, out=is_background)
+    np.putmask(d2, is_background, _OPAQUE_D2)
+    np.take(_alpha_ramp_lut(), d2, out=tmp, mode='clip')  # 下标必在范围内；clip 模式不额外拷贝 out
 
-    # 每个像素到白色 (255,255,255) 的欧氏距离
-    dist = np.sqrt((255.0 - r) ** 2 + (255.0 - g) ** 2 + (255.0 - b) ** 2)
+    alpha = out[..., 3]
+    np.multiply(tmp, alpha, out=tmp)
+    np.right_shift(tmp, _ALPHA_SHIFT, out=tmp)
+    np.copyto(alpha, tmp, casting='unsafe')
+    return out
 
-    # 距离 -> 不透明度系数（0~1）
-    alpha_factor = np.clip((dist - TRANSPARENT_DIST) / (OPAQUE_DIST - TRANSPARENT_DIST),
-                           0.0, 1.0)
 
-    # 标记接近白色的像素（用于 flood fill 遍历）
-    is_white = dist < OPAQUE_DIST
+def _remove_background(image):
+    """对 QImage 做白底透明化，返回新的 QImage（原地处理转换后的像素）。"""
+    image, arr = rgba_view(image)
+    remove_white_background(arr)
+    return image
 
-    # 从边缘 flood fill，找出与边缘连通的背景区域
-    is_background = _flood_fill_background(is_white)
 
-    # 只对背景区域应用透明化，内部白色像素保持原样
-    orig_alpha = arr[..., 3].astype(np.float32)
-    arr[..., 3] = np.where(is_background,
-                           (orig_alpha * alpha_factor).astype(np.uint8),
-                           arr[..., 3])
+class PixmapCache:
+    """透明化后 QPixmap 的 LRU 缓存，超出字节预算时淘汰最久未用的。
+
+    键为 (绝对路径, mtime_ns, 文件大小, 目标尺寸, devicePixelRatio)：文件被
+    替换或修改后 mtime / 大小变化，自然不会命中旧结果。
+    """
+
+    def __init__(self, max_bytes=PIXMAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()   # key -> (pixmap, nbytes)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def current_bytes(self):
+        return self._bytes
+
+    @staticmethod
+    def make_key(path, target_size=None, device_pixel_ratio=1.0):
+        """文件不存在时返回 None（不缓存）。"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        target = None
+        if target_size is not None:
+            target = (target_size.width(), target_size.height())
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size,
+                target, float(device_pixel_ratio))
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def put(self, key, pixmap):
+        nbytes = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+        if nbytes > self.max_bytes:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._items[key] = (pixmap, nbytes)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._items.popitem(last=False)
+            self._bytes -= evicted
+
+    def clear(self):
+        self._items.clear()
+        self._bytes = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": len(self._items), "bytes": self._bytes}
+
+
+pixmap_cache = PixmapCache()
+
+
+def is_svg(path):
+    return isinstance(path, str) and path.lower().endswith(SVG_EXTENSIONS)
+
+
+def rasterize_svg(path, target_size=None, device_pixel_ratio=1.0):
+    """用 QSvgRenderer 把 SVG 渲染成透明背景的 QImage（只用 QImage，线程安全）。
+
+    - target_size 是逻辑尺寸，按 SVG 自身宽高比缩放到其中；不给时用 SVG 声明的尺寸；
+    - 直接按物理像素（× device_pixel_ratio）渲染，高分屏上边缘同样锐利；
+    - 解析失败返回空 QImage。
+    """
+    from PyQt5.QtSvg import QSvgRenderer
+    renderer = QSvgRenderer(path)
+    if not renderer.isValid():
+        return QImage()
+    size = renderer.defaultSize()
+    if target_size is not None:
+        physical = _to_qsize(target_size) * device_pixel_ratio
+        size = size.scaled(physical, Qt.KeepAspectRatio) if not size.isEmpty() else physical
+    else:
+        size = size * device_pixel_ratio
+    if size.isEmpty():
+        return QImage()
+    image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+    renderer.render(painter)
+    painter.end()
+    if device_pixel_ratio != 1.0:
+        image.setDevicePixelRatio(device_pixel_ratio)
+    return image
+
+
+def _process(source, target, device_pixel_ratio):
+    if is_svg(source):
+        return rasterize_svg(source, target, device_pixel_ratio)
+    if target is None:
+        image = _load_image(source)
+        if image.isNull():
+            return image
+        image = _remove_background(image)
+    else:
+        physical = target * device_pixel_ratio
+        image = _load_image(source, physical * SUPERSAMPLE)
+        if image.isNull():
+            return image
+        image = _remove_background(image).scaled(
+            physical, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    if device_pixel_ratio != 1.0:
+        image.setDevicePixelRatio(device_pixel_ratio)
+    return image
+
+
+def asset_cache_key(path, target_size=None, device_pixel_ratio=1.0):
+    """transparent_image 处理 path 时使用的缓存键（磁盘缓存和预烘焙资源共用）。
+
+    文件读不到时返回 None。bake_assets.py 用它给烘焙结果命名，保证运行时
+    用同样的参数请求同一份内容时能对上。
+    """
+    target = _to_qsize(target_size) if target_size is not None else None
+    target_key = (target.width(), target.height()) if target is not None else None
+    version = SVG_CACHE_VERSION if is_svg(path) else DISK_CACHE_VERSION
+    return disk_image_cache.make_key(path, (version, target_key, float(device_pixel_ratio)))
+
+
+def transparent_image(source, target_size=None, device_pixel_ratio=1.0, use_cache=True):
+    """transparent_pixmap 的线程安全版本：只用 QImage，返回 QImage。
+
+    可以在工作线程里调用（QPixmap 只能在 GUI 线程创建）。传入路径时
+    先查构建时烘焙好的资源，再查磁盘缓存（命中时都不需要 numpy），
+    都未命中才处理并写回磁盘缓存。use_cache=False 时跳过这两层，总是重新处理。
+    """
+    target = _to_qsize(target_size) if target_size is not None else None
+    if isinstance(source, (QPixmap, QImage)) or not use_cache:
+        return _process(source, target, device_pixel_ratio)
+
+    disk_key = asset_cache_key(source, target, device_pixel_ratio)
+    if disk_key is not None:
+        image = baked_assets.load(disk_key)
+        if image is None:
+            image = disk_image_cache.load(disk_key)
+        if image is not None:
+            if device_pixel_ratio != 1.0:
+                image.setDevicePixelRatio(device_pixel_ratio)
+            return image
+    image = _process(source, target, device_pixel_ratio)
+    if disk_key is not None and not image.isNull():
+        disk_image_cache.store(disk_key, image)
+    return image
+
+
+def cached_pixmap(path, target_size=None, device_pixel_ratio=1.0):
+    """只查 pixmap_cache，不做任何处理；未命中返回 None（GUI 线程调用）。"""
+    target = _to_qsize(target_size) if target_size is not None else None
+    key = PixmapCache.make_key(path, target, device_pixel_ratio)
+    return pixmap_cache.get(key) if key is not None else None
+
+
+def remember_pixmap(path, image, target_size=None, device_pixel_ratio=1.0):
+    """把工作线程处理好的 QImage 转成 QPixmap 并放进 pixmap_cache（GUI 线程调用）。"""
+    pixmap = QPixmap.fromImage(image)
+    if pixmap.isNull():
+        return pixmap
+    target = _to_qsize(target_size) if target_size is not None else None
+    key = PixmapCache.make_key(path, target, device_pixel_ratio)
+    if key is not None:
+        pixmap_cache.put(key, pixmap)
+    return pixmap
+
+
+def transparent_pixmap(path_or_pixmap, target_size=None, device_pixel_ratio=1.0):
+    """加载图片并去掉白色背景，返回 QPixmap。
+
+    - 传入路径或 QPixmap 均可；文件不存在或解码失败时原样返回（避免崩溃）。
+    - 只处理与图像边缘连通的白色背景，内部白色像素保持不变；
+      抗锯齿边缘按到白色的距离线性过渡，保留半透明轮廓。
+    - 给定 target_size 时返回按比例缩放到该尺寸内的结果：先缩到
+      target_size × SUPERSAMPLE 再去背景，大图只处理一小部分像素。
+    - device_pixel_ratio > 1 时按物理像素处理（target_size 是逻辑尺寸），
+      并给结果设置对应的 devicePixelRatio，高分屏上不发虚。
+    - SVG 不走去背景流程，由 rasterize_svg 按物理像素直接渲染。
+    - 传入路径时结果进 pixmap_cache，再次请求同一文件 / 尺寸直接命中。
+    """
+    if isinstance(path_or_pixmap, QPixmap):
+        if path_or_pixmap.isNull():
+            return path_or_pixmap
+        return QPixmap.fromImage(
+            transparent_image(path_or_pixmap, target_size, device_pixel_ratio))
 
-    return _from_rgba_array(arr)
+    cached = cached_pixmap(path_or_pixmap, target_size, device_pixel_ratio)
+    if cached is not None:
+        return cached
+    image = transparent_image(path_or_pixmap, target_size, device_pixel_ratio)
+    return remember_pixmap(path_or_pixmap, image, target_size, device_pixel_ratio)
 
 
 def transparent_icon(path):
-    """加载图标并去掉白色背景，返回 QIcon。"""
+    """加载图标并去掉白色背景，返回 QIcon（与其他调用方共用 pixmap_cache）。"""
     return QIcon(transparent_pixmap(path))
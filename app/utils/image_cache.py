@@ -0,0 +1,247 @@
+"""透明化结果的磁盘缓存：冷启动直接读处理好的 RGBA，不再导入 numpy。
+
+内存里的 pixmap_cache 只在本次运行有效，每次启动图标、宠物图都要重新跑
+一遍 numpy 透明化（光导入 numpy 就要约 100ms）。这里把处理结果按
+“源文件内容哈希 + 处理参数”存成原始 RGBA 文件：
+
+    header <4sIIII>: magic b"WDTC", width, height, bytes_per_line, crc32(payload)
+    payload: height * bytes_per_line 字节 RGBA8888，可直接交给 QImage / mmap
+
+- 键里包含调用方给的版本参数（透明化阈值等），阈值一改旧条目自然失效；
+- 总大小超过上限时按文件 mtime（命中时会刷新）淘汰最久未用的条目；
+- 文件截断、校验和不对等任何损坏都当作未命中，并删掉坏文件。
+
+BakedAssets 是只读的另一层：打包前由 bake_assets.py 把内置图片按同样的键
+预处理成 PNG，连同 manifest.json 一起放进 images/baked/。打包后的程序
+第一次启动就能直接命中，不需要先跑一遍 numpy 再写磁盘缓存。
+"""
+import hashlib
+import json
+import os
+import struct
+import zlib
+
+from PyQt5.QtGui import QImage
+
+from app.config.constants import BAKED_ASSET_DIR, IMAGE_CACHE_DIR
+from app.utils.logger import logger
+
+IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_MAGIC = b"WDTC"
+_HEADER = struct.Struct("<4sIIII")
+_SUFFIX = ".rgba"
+
+
+class DiskImageCache:
+    """按内容哈希寻址的 RGBA 图片缓存目录（首次写入时才创建目录）。"""
+
+    def __init__(self, directory, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.corrupt = 0
+
+    def make_key(self, path, params):
+        """源文件内容 + 处理参数的哈希；文件读不到时返回 None。"""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr(params).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def load(self, key):
+        """命中返回 QImage（Format_RGBA8888），未命中或损坏返回 None。"""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        image = self._decode(blob)
+        if image is None:
+            self.corrupt += 1
+            self.misses += 1
+            logger.warning(f"Discarding corrupt image cache entry: {path}")
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # 刷新 mtime，作为 LRU 的“最近使用”时间
+        except OSError:
+            pass
+        self.hits += 1
+        return image
+
+    @staticmethod
+    def _decode(blob):
+        if len(blob) < _HEADER.size:
+            return None
+        magic, width, height, stride, crc = _HEADER.unpack_from(blob)
+        payload = blob[_HEADER.size:]
+        if (magic != _MAGIC or width == 0 or height == 0 or stride < width * 4
+                or len(payload) != height * stride or zlib.crc32(payload) != crc):
+            return None
+        return QImage(payload, width, height, stride, QImage.Format_RGBA8888).copy()
+
+    def store(self, key, image):
+        """写入一张图（先写临时文件再替换），随后按上限淘汰旧条目。"""
+        image = image.convertToFormat(QImage.Format_RGBA8888)
+        if image.isNull():
+            return
+        payload = image.constBits().asstring(image.byteCount())
+        header = _HEADER.pack(_MAGIC, image.width(), image.height(),
+                              image.bytesPerLine(), zlib.crc32(payload))
+        path = self._entry_path(key)
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write image cache entry {path}: {e}")
+            self._remove(tmp_path)
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(_SUFFIX):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                    total += st.st_size
+        except OSError:
+            return
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+                logger.debug(f"Evicted image cache entry: {os.path.basename(path)}")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def total_bytes(self):
+        try:
+            with os.scandir(self.directory) as it:
+                return sum(e.stat().st_size for e in it if e.name.endswith(_SUFFIX))
+        except OSError:
+            return 0
+
+    def clear(self):
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(_SUFFIX):
+                        self._remove(entry.path)
+        except OSError:
+            pass
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "corrupt": self.corrupt}
+
+
+BAKED_MANIFEST = "manifest.json"
+BAKED_MANIFEST_FORMAT = 1
+
+
+class BakedAssets:
+    """构建时生成的透明图索引：键与 DiskImageCache.make_key 相同，只读。
+
+    manifest.json::
+
+        {"format": 1, "assets": {key: {"file": "<key>.png", "source": "images/...",
+                                       "target": [w, h] | null, "dpr": 1.0}}}
+
+    清单在第一次查询时才读取；目录或清单不存在、格式不认识时视为空。
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._assets = None
+        self.hits = 0
+        self.misses = 0
+
+    def _load_manifest(self):
+        path = os.path.join(self.directory, BAKED_MANIFEST)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable baked asset manifest {path}: {e}")
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("format") != BAKED_MANIFEST_FORMAT:
+            logger.warning(f"Ignoring baked asset manifest with unknown format: {path}")
+            return {}
+        assets = manifest.get("assets")
+        return assets if isinstance(assets, dict) else {}
+
+    @property
+    def assets(self):
+        if self._assets is None:
+            self._assets = self._load_manifest()
+            if self._assets:
+                logger.debug(f"Loaded {len(self._assets)} baked assets from {self.directory}")
+        return self._assets
+
+    def __len__(self):
+        return len(self.assets)
+
+    def __contains__(self, key):
+        return key in self.assets
+
+    def load(self, key):
+        """命中返回 QImage，没有该键或文件读不出来返回 None。"""
+        entry = self.assets.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        path = os.path.join(self.directory, entry.get("file", ""))
+        image = QImage(path)
+        if image.isNull():
+            self.misses += 1
+            logger.warning(f"Baked asset listed in manifest but unreadable: {path}")
+            return None
+        self.hits += 1
+        return image
+
+    def reload(self):
+        """下次查询时重新读取清单（重新烘焙之后调用）。"""
+        self._assets = None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+disk_image_cache = DiskImageCache(IMAGE_CACHE_DIR)
+baked_assets = BakedAssets(BAKED_ASSET_DIR)
@@ -0,0 +1,158 @@
+"""宠物图片目录索引：缓存可用图片列表，目录变化时才重新扫描。
+
+原来每次轮到图片模式都要 ``os.listdir(IMAGE_DIRECTORY)`` 再按扩展名过滤，
+在重定向到网络的用户目录上一次就要几十毫秒，而且跑在 GUI 线程。
+ImageDirectoryIndex 扫描一次后把结果（名字 / 大小 / mtime / 格式）留在内存，
+``choice()`` 直接 O(1) 随机取，不碰文件系统；发现变化只做标记，
+下一次取图时才重新扫描。变化来源：
+
+- QFileSystemWatcher 报告目录（含子目录）变化；
+- 兜底：每隔 recheck_interval 秒由定时器 stat 一遍已知目录，任何一个
+  目录的 mtime 变了（网络盘上 watcher 可能收不到通知）。检查挂在定时器上，
+  不在取图路径里。
+"""
+import os
+import random
+from collections import namedtuple
+
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from app.utils.logger import logger
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.svg')
+
+ImageEntry = namedtuple('ImageEntry', 'path name size mtime_ns format')
+
+
+class ImageDirectoryIndex(QObject):
+    """递归索引 directory 下扩展名在 extensions 里的图片（跳过 . 开头的目录）。"""
+
+    changed = pyqtSignal()
+
+    def __init__(self, directory, extensions=IMAGE_EXTENSIONS, recursive=True,
+                 recheck_interval=30.0, watch=True, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.recursive = recursive
+        self.recheck_interval = recheck_interval
+        self._entries = ()
+        self._dir_mtimes = {}
+        self._dirty = True
+        self.scan_count = 0
+
+        self._watcher = None
+        if watch:
+            self._watcher = QFileSystemWatcher(self)
+            self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._recheck_timer = QTimer(self)
+        self._recheck_timer.timeout.connect(self.recheck)
+        if recheck_interval:
+            self._recheck_timer.start(int(recheck_interval * 1000))
+
+    def __len__(self):
+        self.ensure_fresh()
+        return len(self._entries)
+
+    @property
+    def entries(self):
+        self.ensure_fresh()
+        return self._entries
+
+    def invalidate(self):
+        """标记为过期，下次访问时重新扫描。"""
+        self._dirty = True
+
+    def choice(self, rng=random):
+        """随机取一张图片；目录为空时返回 None。"""
+        self.ensure_fresh()
+        if not self._entries:
+            return None
+        return rng.choice(self._entries)
+
+    def discard(self, path):
+        """把加载失败的图片移出候选，直到下次重新扫描（文件被替换 / 修好后会回来）。"""
+        entries = tuple(entry for entry in self._entries if entry.path != path)
+        if len(entries) == len(self._entries):
+            return False
+        self._entries = entries
+        logger.debug(f"Dropped unloadable image from index: {path}")
+        return True
+
+    def ensure_fresh(self):
+        """被标记为过期时重新扫描；否则不碰文件系统。"""
+        if self._dirty:
+            self.rescan()
+
+    def recheck(self):
+        """兜底检查（定时器触发）：已知目录的 mtime 变了就标记为过期。"""
+        if self._dirty or not self._directories_changed():
+            return
+        logger.debug(f"Image directory changed on disk: {self.directory}")
+        self._dirty = True
+
+    def rescan(self):
+        entries = []
+        dir_mtimes = {}
+        pending = [self.directory]
+        while pending:
+            current = pending.pop()
+            try:
+                dir_mtimes[current] = os.stat(current).st_mtime_ns
+                with os.scandir(current) as it:
+                    items = sorted(it, key=lambda e: e.name)
+            except OSError as e:
+                logger.error(f"Failed to list image directory {current}: {e}")
+                continue
+            for item in items:
+                try:
+                    if item.is_dir():
+                        if self.recursive and not item.name.startswith('.'):
+                            pending.append(item.path)
+                        continue
+                    ext = os.path.splitext(item.name)[1].lower()
+                    if ext not in self.extensions:
+                        continue
+                    st = item.stat()
+                except OSError:
+                    continue
+                entries.append(ImageEntry(item.path, item.name, st.st_size,
+                                          st.st_mtime_ns, ext[1:]))
+
+        old_dirs = set(self._dir_mtimes)
+        self._entries = tuple(entries)
+        self._dir_mtimes = dir_mtimes
+        self._dirty = False
+        self.scan_count += 1
+        self._update_watcher(old_dirs)
+        logger.debug(f"Indexed {len(entries)} images in {len(dir_mtimes)} directories "
+                     f"(scan #{self.scan_count})")
+        self.changed.emit()
+
+    def _directories_changed(self):
+        if not self._dir_mtimes:
+            # 上次目录不存在 / 不可读：看看现在有没有了
+            return os.path.isdir(self.directory)
+        for path, mtime in self._dir_mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _update_watcher(self, old_dirs):
+        if self._watcher is None:
+            return
+        new_dirs = set(self._dir_mtimes)
+        removed = [d for d in old_dirs - new_dirs if d in self._watcher.directories()]
+        if removed:
+            self._watcher.removePaths(removed)
+        added = sorted(new_dirs - set(self._watcher.directories()))
+        if added:
+            self._watcher.addPaths(added)
+
+    def _on_directory_changed(self, path):
+        logger.debug(f"Image directory watcher fired: {path}")
+        self._dirty = True
@@ -0,0 +1,41 @@
+"""延迟创建的模块级单例。
+
+``config_manager = LazyProxy(ConfigManager)`` 这样的写法让导入模块时不做
+任何初始化（读文件、迁移等），第一次访问属性时才真正创建实例，
+调用方仍然按普通对象使用：``config_manager.work_hours = 7.0``。
+"""
+import threading
+
+
+class LazyProxy:
+    """第一次访问属性时调用 factory() 创建实例，之后所有属性读写都转发给它。"""
+
+    def __init__(self, factory):
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_instance", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    def _lazy_get(self):
+        instance = self._lazy_instance
+        if instance is None:
+            with self._lazy_lock:
+                instance = self._lazy_instance
+                if instance is None:
+                    instance = self._lazy_factory()
+                    object.__setattr__(self, "_lazy_instance", instance)
+        return instance
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._lazy_instance is not None
+
+    def __getattr__(self, name):
+        return getattr(self._lazy_get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._lazy_get(), name, value)
+
+    def __repr__(self):
+        if self._lazy_instance is None:
+            return f"<LazyProxy for {self._lazy_factory!r} (not initialized)>"
+        return repr(self._lazy_instance)
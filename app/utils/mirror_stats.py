@@ -0,0 +1,224 @@
+"""下载镜像记分板：记录每个镜像的成功率、首字节耗时、吞吐和最近失败，持久化到磁盘。
+
+GITHUB_PROXY_MIRRORS 是写死的顺序，这些公益镜像随时可能失效，但每次下载
+都要先去碰一遍已经挂掉的镜像。MirrorScoreboard 把每次请求的结果记到
+``mirror_stats.json``（与 settings.json 同目录），下次按记录重新排序：
+
+- 有成功记录的镜像按“预期耗时”排在前面：(首字节耗时 + 1MB / 吞吐) / 成功率，
+  耗时和吞吐都用指数移动平均，成功率带平滑，偶尔一次失败不会被打入冷宫；
+- 没有记录的镜像保持原来的相对顺序，排在其后；
+- 连续失败的镜像进入退避：5 分钟起，每多失败一次翻倍，最长 1 天；退避中的
+  镜像排到最后（不会被删掉，其他都失败时仍会尝试），成功一次即解除。
+
+文件只在第一次用到时读取，写入采用临时文件替换；读写都加锁，竞速下载的
+多个线程可以同时记录。
+
+命令行查看：``python -m app.utils.mirror_stats``
+"""
+import json
+import os
+import threading
+import time
+
+from app.config.constants import MIRROR_STATS_FILE
+from app.utils.logger import logger
+
+STATS_VERSION = 1
+# 指数移动平均的权重：新样本占 30%
+EWMA_ALPHA = 0.3
+BACKOFF_BASE_SECONDS = 5 * 60
+BACKOFF_MAX_SECONDS = 24 * 60 * 60
+# 排序时估算“拉取 1MB 要多久”，把首字节耗时和吞吐折算到同一个尺度
+_REFERENCE_BYTES = 1024 * 1024
+_MAX_ERROR_LENGTH = 200
+
+
+def _ewma(old, sample):
+    return sample if old is None else old + EWMA_ALPHA * (sample - old)
+
+
+class MirrorScoreboard:
+    """按镜像名（代理前缀或 "direct"）记录下载表现。"""
+
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._mirrors = None
+        self._dirty = False
+
+    # ---- 持久化 ----
+
+    def _load(self):
+        if self._mirrors is not None:
+            return self._mirrors
+        self._mirrors = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return self._mirrors
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable mirror stats {self.path}: {e}")
+            return self._mirrors
+        if isinstance(data, dict) and data.get("version") == STATS_VERSION \
+                and isinstance(data.get("mirrors"), dict):
+            self._mirrors = {key: entry for key, entry in data["mirrors"].items()
+                             if isinstance(entry, dict)}
+        return self._mirrors
+
+    def save(self):
+        """有改动时写回磁盘（临时文件 + 替换）。"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": STATS_VERSION, "mirrors": self._mirrors}
+            tmp_path = self.path + ".tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Failed to save mirror stats: {e}")
+
+    def reset(self):
+        """清空所有记录（诊断界面的“重置”）。"""
+        with self._lock:
+            self._mirrors = {}
+            self._dirty = True
+        self.save()
+
+    # ---- 记录 ----
+
+    def _entry(self, key):
+        mirrors = self._load()
+        entry = mirrors.get(key)
+        if entry is None:
+            entry = mirrors[key] = {
+                "attempts": 0, "successes": 0, "consecutive_failures": 0,
+                "ttfb": None, "throughput": None,
+                "last_success": None, "last_failure": None, "last_error": None,
+                "backoff_until": None,
+            }
+        self._dirty = True
+        return entry
+
+    def record_success(self, key, ttfb):
+        """一次成功的请求；ttfb 为发出请求到拿到有效首字节的秒数。"""
+        with self._lock:
+            entry = self._entry(key)
+            entry["attempts"] += 1
+            entry["successes"] += 1
+            entry["consecutive_failures"] = 0
+            entry["backoff_until"] = None
+            entry["last_success"] = self._clock()
+            entry["ttfb"] = _ewma(entry["ttfb"], float(ttfb))
+
+    def record_failure(self, key, error):
+        """一次失败的请求；连续失败时退避时间翻倍。"""
+        with self._lock:
+            entry = self._entry(key)
+            entry["attempts"] += 1
+            entry["consecutive_failures"] += 1
+            now = self._clock()
+            entry["last_failure"] = now
+            entry["last_error"] = str(error)[:_MAX_ERROR_LENGTH]
+            backoff = min(BACKOFF_BASE_SECONDS * 2 ** (entry["consecutive_failures"] - 1),
+                          BACKOFF_MAX_SECONDS)
+            entry["backoff_until"] = now + backoff
+        logger.debug(f"Mirror {key} failed ({entry['consecutive_failures']} in a row), "
+                     f"backing off {backoff}s")
+
+    def record_throughput(self, key, nbytes, seconds):
+        """一次下载的平均速度（字节 / 秒）。"""
+        if nbytes <= 0 or seconds <= 0:
+            return
+        with self._lock:
+            entry = self._entry(key)
+            entry["throughput"] = _ewma(entry["throughput"], nbytes / seconds)
+
+    # ---- 查询 ----
+
+    def get(self, key):
+        """某个镜像的记录副本；没有记录时返回 None。"""
+        with self._lock:
+            entry = self._load().get(key)
+            return dict(entry) if entry is not None else None
+
+    def in_backoff(self, key):
+        entry = self.get(key)
+        return bool(entry and entry["backoff_until"] and entry["backoff_until"] > self._clock())
+
+    @staticmethod
+    def success_rate(entry):
+        """平滑后的成功率（拉普拉斯平滑：没有记录时为 0.5）。"""
+        return (entry["successes"] + 1) / (entry["attempts"] + 2)
+
+    @classmethod
+    def expected_cost(cls, entry):
+        """预计拉取 1MB 的秒数除以成功率，越小越好；从没成功过时返回 None。"""
+        if entry["ttfb"] is None:
+            return None
+        seconds = entry["ttfb"]
+        if entry["throughput"]:
+            seconds += _REFERENCE_BYTES / entry["throughput"]
+        return seconds / cls.success_rate(entry)
+
+    def rank(self, keys):
+        """按记录给镜像排序：表现好的 → 没有记录的（保持原顺序）→ 退避中的。"""
+        now = self._clock()
+        with self._lock:
+            mirrors = self._load()
+
+            def sort_key(item):
+                index, key = item
+                entry = mirrors.get(key)
+                if entry is None:
+                    return (1, 0.0, index)
+                if entry["backoff_until"] and entry["backoff_until"] > now:
+                    return (2, entry["backoff_until"], index)
+                cost = self.expected_cost(entry)
+                if cost is None:
+                    return (1, 0.0, index)
+                return (0, cost, index)
+
+            return [key for _, key in sorted(enumerate(keys), key=sort_key)]
+
+    def format_table(self, keys=None):
+        """记分板的纯文本表格（命令行 / 诊断对话框共用）。"""
+        with self._lock:
+            mirrors = dict(self._load())
+        keys = self.rank(keys if keys is not None else sorted(mirrors))
+        now = self._clock()
+        header = f"{'mirror':<28} {'ok/tries':>9} {'rate':>5} {'ttfb':>7} {'speed':>10}  status"
+        lines = [header, "-" * len(header)]
+        if not keys:
+            lines.append("(no downloads recorded yet)")
+        for key in keys:
+            entry = mirrors.get(key)
+            if entry is None:
+                lines.append(f"{key:<28} {'-':>9} {'-':>5} {'-':>7} {'-':>10}  no data")
+                continue
+            ttfb = f"{entry['ttfb'] * 1000:.0f}ms" if entry["ttfb"] is not None else "-"
+            speed = (f"{entry['throughput'] / 1024 / 1024:.1f}MB/s"
+                     if entry["throughput"] else "-")
+            if entry["backoff_until"] and entry["backoff_until"] > now:
+                status = (f"backoff {(entry['backoff_until'] - now) / 60:.0f}min"
+                          f" ({entry['consecutive_failures']} failures)")
+            else:
+                status = "ok"
+            if entry["last_failure"]:
+                when = time.strftime("%m-%d %H:%M", time.localtime(entry["last_failure"]))
+                status += f"; last failure {when}: {entry['last_error']}"
+            lines.append(
+                f"{key:<28} {entry['successes']:>4}/{entry['attempts']:<4} "
+                f"{self.success_rate(entry) * 100:>4.0f}% {ttfb:>7} {speed:>10}  {status}")
+        return "\n".join(lines)
+
+
+mirror_scoreboard = MirrorScoreboard(MIRROR_STATS_FILE)
+
+
+if __name__ == "__main__":
+    print(mirror_scoreboard.format_table())
@@ -0,0 +1,307 @@
+"""分段 Range 下载：多连接并行拉取同一个文件，中断后按清单续传。
+
+原来更新包用一条连接、4KB 一块地流式下载，中途断线只能从头再来；单条
+连接被镜像限速时也没有办法。SegmentedDownload 把文件切成固定大小的
+分片，几条连接各自用 ``Range: bytes=a-b`` 领取分片，写进预分配好的
+``<目标>.part`` 文件：
+
+- 旁边的 ``<目标>.part.json`` 记录文件大小、ETag / Last-Modified 和已完成的
+  分片；下次下载同一个文件（大小和校验值都对得上）时只补缺的分片；
+- 连接中途断开时从断点（当前偏移）重新请求剩下的字节，同一地址连续失败
+  几次后换下一个候选地址（其他镜像）；
+- 第一个地址（探测过的竞速胜者）对 Range 请求返回 200（不支持分段）时抛
+  RangesNotSupported，由调用方退回单连接下载；备用镜像返回 200 只算这个
+  地址失败，换下一个地址，已下载的分片不受影响；
+- 每个 206 响应都核对 Content-Range 的总长度和 ETag，不同镜像缓存了
+  不同版本时不会把两个文件拼在一起。
+
+requests 在函数内导入，与 update_service 一致。
+"""
+import json
+import os
+import queue
+import threading
+
+from app.utils.logger import logger
+
+DEFAULT_CONNECTIONS = 4
+DEFAULT_SEGMENT_SIZE = 1024 * 1024
+# 同一分片在同一地址上连续失败这么多次就换下一个地址
+MAX_ATTEMPTS_PER_URL = 3
+# 每次读取的块大小：连接中途断开时，最后一块没读完的数据会丢掉重下
+CHUNK_SIZE = 16 * 1024
+MANIFEST_VERSION = 1
+
+
+class RangesNotSupported(Exception):
+    """服务器不支持 Range 请求（返回 200 而不是 206）。"""
+
+
+class DownloadFailed(Exception):
+    """有分片在所有候选地址上都下载失败；已完成的分片留在清单里，可续传。"""
+
+
+def supports_ranges(response):
+    """响应头声明了 ``Accept-Ranges: bytes`` 且给出了 Content-Length。"""
+    accept = response.headers.get("Accept-Ranges", "").lower()
+    return "bytes" in accept and int(response.headers.get("Content-Length", 0) or 0) > 0
+
+
+def validator_from_headers(headers):
+    """用来判断“还是不是同一个文件”的响应头（没有的项为 None）。"""
+    return {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+
+def plan_segments(total_size, segment_size):
+    """[(start, end)]，end 含在内（与 Range 头的写法一致）。"""
+    return [(start, min(start + segment_size, total_size) - 1)
+            for start in range(0, total_size, segment_size)]
+
+
+class SegmentedDownload:
+    """把 urls 指向的同一个文件分段下载到 dest_path。
+
+    urls 按优先级排列（一般是竞速胜出的地址在前）；total_size 和 validator
+    来自探测请求的响应头。run() 成功后 dest_path 是完整文件，清单被删除。
+
+    session 为共享的会话（requests.Session，或任何有同样 get() 的对象，
+    连接池大小应不小于 connections）；不传时每条连接各建一个 Session，
+    下载结束后关闭。
+    """
+
+    def __init__(self, urls, dest_path, total_size, validator=None,
+                 connections=DEFAULT_CONNECTIONS, segment_size=DEFAULT_SEGMENT_SIZE,
+                 timeout=30, session=None):
+        self.urls = list(urls)
+        self.dest_path = dest_path
+        self.part_path = dest_path + ".part"
+        self.manifest_path = self.part_path + ".json"
+        self.total_size = total_size
+        self.validator = validator or {"etag": None, "last_modified": None}
+        self.connections = max(1, connections)
+        self.segment_size = segment_size
+        self.timeout = timeout
+        self.session = session
+
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._done = set()
+        self._error = None
+        self.downloaded_bytes = 0   # 本次实际从网络读到的字节
+        self.resumed_bytes = 0      # 从上一次中断的 .part 里沿用的字节
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def discard(self):
+        """删掉 .part 和清单（服务器不支持分段、改用单连接下载时调用）。"""
+        for path in (self.part_path, self.manifest_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # ---- 清单 ----
+
+    def _manifest_matches(self, manifest):
+        return (manifest.get("version") == MANIFEST_VERSION
+                and manifest.get("size") == self.total_size
+                and manifest.get("segment_size") == self.segment_size
+                and manifest.get("validator") == self.validator)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(manifest, dict) or not self._manifest_matches(manifest):
+            logger.info("Discarding partial download: remote file changed or manifest is stale")
+            return None
+        try:
+            if os.path.getsize(self.part_path) != self.total_size:
+                return None
+        except OSError:
+            return None
+        return manifest
+
+    def _save_manifest(self):
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "size": self.total_size,
+            "segment_size": self.segment_size,
+            "validator": self.validator,
+            "done": sorted(self._done),
+        }
+        tmp_path = self.manifest_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Failed to save download manifest: {e}")
+
+    def _prepare_part_file(self):
+        manifest = self._load_manifest()
+        if manifest is not None:
+            segments = plan_segments(self.total_size, self.segment_size)
+            self._done = {i for i in manifest.get("done", []) if 0 <= i < len(segments)}
+            self.resumed_bytes = sum(end - start + 1 for i, (start, end) in enumerate(segments)
+                                     if i in self._done)
+            logger.info(f"Resuming download: {len(self._done)}/{len(segments)} segments "
+                        f"({self.resumed_bytes} bytes) already on disk")
+            return
+        self._done = set()
+        with open(self.part_path, "wb") as f:
+            f.truncate(self.total_size)
+        self._save_manifest()
+
+    # ---- 下载 ----
+
+    @property
+    def completed_bytes(self):
+        with self._lock:
+            return self.resumed_bytes + self.downloaded_bytes
+
+    def run(self, progress=None, poll_interval=0.1):
+        """下载所有缺的分片；progress(已完成字节, 总字节) 在调用线程里定期回调。
+
+        失败时抛 DownloadFailed / RangesNotSupported（.part 和清单保留，可续传）。
+        """
+        self._prepare_part_file()
+        segments = plan_segments(self.total_size, self.segment_size)
+        todo = queue.Queue()
+        for index, segment in enumerate(segments):
+            if index not in self._done:
+                todo.put((index, segment))
+
+        workers = [threading.Thread(target=self._worker, args=(todo, slot), daemon=True)
+                   for slot in range(min(self.connections, todo.qsize()))]
+        for worker in workers:
+            worker.start()
+        try:
+            alive = workers
+            while alive:
+                alive[0].join(poll_interval)
+                if progress is not None:
+                    progress(self.completed_bytes, self.total_size)
+                alive = [worker for worker in alive if worker.is_alive()]
+        finally:
+            # 调用方中断（例如 KeyboardInterrupt）时也让工作线程尽快退出
+            self._cancelled.set()
+            with self._lock:
+                self._save_manifest()
+
+        if self._error is not None:
+            raise self._error
+        if len(self._done) != len(segments):
+            raise DownloadFailed(f"{len(segments) - len(self._done)} segments missing")
+        os.replace(self.part_path, self.dest_path)
+        try:
+            os.remove(self.manifest_path)
+        except OSError:
+            pass
+        if progress is not None:
+            progress(self.total_size, self.total_size)
+
+    def _fail(self, error):
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._cancelled.set()
+
+    def _worker(self, todo, slot):
+        import requests
+
+        session = self.session or requests.Session()
+        try:
+            with open(self.part_path, "r+b") as part:
+                while not self._cancelled.is_set():
+                    try:
+                        index, segment = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        self._fetch_segment(session, part, segment, slot)
+                    except Exception as e:
+                        self._fail(e)
+                        return
+                    with self._lock:
+                        self._done.add(index)
+                        self._save_manifest()
+        except OSError as e:
+            self._fail(e)
+        finally:
+            if session is not self.session:
+                session.close()
+
+    def _fetch_segment(self, session, part, segment, slot):
+        start, end = segment
+        cursor = [start]   # _fetch_range 写到哪里就推进到哪里，重试只请求剩下的字节
+        last_error = None
+        for url in self._urls_for(slot):
+            for _ in range(MAX_ATTEMPTS_PER_URL):
+                if self._cancelled.is_set():
+                    raise DownloadFailed("cancelled")
+                try:
+                    self._fetch_range(session, part, url, cursor, end)
+                    return
+                except RangesNotSupported as e:
+                    if url == self.urls[0]:
+                        raise
+                    # 只是这个备用镜像不支持分段：重试也没用，直接换下一个地址
+                    last_error = e
+                    logger.warning(f"Segment {start}-{end}: {url[:60]} ignores Range, skipping it")
+                    break
+                except DownloadFailed:
+                    raise
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"Segment {start}-{end} failed at {cursor[0]} ({url[:60]}): {e}")
+        raise DownloadFailed(f"Segment {start}-{end} failed on all URLs: {last_error}")
+
+    def _urls_for(self, slot):
+        # 第一个地址（竞速胜者）已验证过，所有连接都先用它；失败后换其他镜像，
+        # 不同连接从不同的镜像开始轮换，避免一起挤到同一个备用镜像上
+        return self.urls[:1] + self.urls[1:][slot:] + self.urls[1:][:slot]
+
+    def _check_partial_response(self, resp, offset, end):
+        if resp.status_code == 200:
+            raise RangesNotSupported("server ignored Range header (HTTP 200)")
+        if resp.status_code != 206:
+            raise Exception(f"HTTP {resp.status_code}")
+        # Content-Range: bytes 0-1023/4096
+        content_range = resp.headers.get("Content-Range", "")
+        try:
+            span, total = content_range.split(" ", 1)[1].split("/")
+            first, last = (int(v) for v in span.split("-"))
+        except (IndexError, ValueError):
+            raise Exception(f"bad Content-Range: {content_range!r}")
+        if total != str(self.total_size) or (first, last) != (offset, end):
+            raise Exception(f"unexpected Content-Range: {content_range!r}")
+        etag = resp.headers.get("ETag")
+        if self.validator.get("etag") and etag and etag != self.validator["etag"]:
+            raise Exception(f"ETag changed: {etag} != {self.validator['etag']}")
+
+    def _fetch_range(self, session, part, url, cursor, end):
+        """请求 [cursor[0], end] 写进 part，边写边推进 cursor[0]。"""
+        offset = cursor[0]
+        headers = {"Range": f"bytes={offset}-{end}"}
+        with session.get(url, headers=headers, timeout=self.timeout, stream=True) as resp:
+            self._check_partial_response(resp, offset, end)
+            part.seek(offset)
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                if self._cancelled.is_set():
+                    raise DownloadFailed("cancelled")
+                chunk = chunk[:end + 1 - cursor[0]]
+                if not chunk:
+                    continue
+                part.write(chunk)
+                cursor[0] += len(chunk)
+                with self._lock:
+                    self.downloaded_bytes += len(chunk)
+                if cursor[0] > end:
+                    break
+        part.flush()
+        if cursor[0] <= end:
+            raise Exception(f"connection closed early ({end + 1 - cursor[0]} bytes short)")
@@ -0,0 +1,109 @@
+"""GitHub 最新版本信息的本地缓存：TTL 内不联网，过期后带条件请求头重新验证。
+
+每次自动检查更新都要完整 GET 一次 releases/latest 再解析 JSON，而绝大多数
+时候结果和上一次一模一样；同一出口 IP 的机器多了，还会撞上 GitHub API 的
+匿名限额（每小时 60 次）。ReleaseCache 把上一次的结果连同响应的
+ETag / Last-Modified 存到 ``release_cache.json``（与 settings.json 同目录）：
+
+- 距上次确认不到 TTL：直接用缓存，不发请求；
+- 超过 TTL：带 If-None-Match / If-Modified-Since 请求，304 表示没变，
+  沿用缓存并刷新确认时间（GitHub 的 304 不计入限额）；
+- 200：换成新结果。
+
+只缓存版本信息本身，“是否有更新”每次按当前版本重新比较，升级后不会
+拿旧结论误判。缓存按 URL 区分，换了仓库地址自动失效。
+"""
+import json
+import os
+import threading
+import time
+
+from app.config.constants import RELEASE_CACHE_FILE
+from app.utils.logger import logger
+
+CACHE_VERSION = 1
+
+
+class ReleaseCache:
+    """按 URL 保存一份响应数据和它的校验头。"""
+
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable release cache {self.path}: {e}")
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+            return None
+        return entry
+
+    def _write(self, entry):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save release cache: {e}")
+
+    def get(self, url):
+        """url 的缓存记录（含 data / etag / last_modified / checked_at），没有时返回 None。"""
+        with self._lock:
+            entry = self._read()
+        if entry is None or entry.get("url") != url:
+            return None
+        return entry
+
+    def is_fresh(self, entry, max_age):
+        """记录在 max_age 秒内确认过（max_age 为 0 时总是要重新验证）。"""
+        age = self._clock() - entry.get("checked_at", 0)
+        return max_age > 0 and 0 <= age < max_age
+
+    @staticmethod
+    def conditional_headers(entry):
+        """重新验证用的请求头；没有校验值时为空（退化成普通请求）。"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, data, headers):
+        """保存 200 响应的数据和 ETag / Last-Modified。"""
+        entry = {
+            "version": CACHE_VERSION,
+            "url": url,
+            "data": data,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "checked_at": self._clock(),
+        }
+        with self._lock:
+            self._write(entry)
+        return entry
+
+    def touch(self, entry):
+        """304：内容没变，只刷新确认时间。"""
+        entry = dict(entry, checked_at=self._clock())
+        with self._lock:
+            self._write(entry)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+release_cache = ReleaseCache(RELEASE_CACHE_FILE)
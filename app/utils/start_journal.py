@@ -0,0 +1,368 @@
+"""启动时间日志：定长二进制记录 + 按天的旁路索引。
+
+旧的 start_time.txt 每天追加一行，读取最新一条要 readlines() 整个文件，
+历史越长启动越慢。这里改成：
+
+- 日志文件（``*.journal``）：8 字节文件头 + 定长 16 字节记录，只追加。
+  最新一条就在文件末尾固定偏移处，一次 seek 即可读到；
+- 索引文件（``*.journal.idx``）：12 字节文件头 + 每天一个 4 字节槽位，
+  槽位下标 = 日期序数 - 基准日期序数，值 = 当天第一条记录序号 + 1（0 表示无）。
+  按日期查找同样是一次 seek。
+
+每条记录带 crc32，写到一半断电留下的残缺/损坏记录会被跳过。
+索引丢失或损坏时从日志重建（一次性线性扫描）：追加记录和按日期查找时
+发现索引文件不在、而日志里已有记录，都会先重建，不会只索引新的一天。
+"""
+import datetime
+import os
+import struct
+import zlib
+
+from app.utils.logger import logger
+
+JOURNAL_MAGIC = b"WDTJ"
+INDEX_MAGIC = b"WDTI"
+JOURNAL_VERSION = 1
+
+# 文件头：magic + 版本号
+_JOURNAL_HEADER = struct.Struct("<4sI")
+# 记录：自 0001-01-01 起的微秒数、日期序数、前 12 字节的 crc32
+_RECORD = struct.Struct("<qII")
+_RECORD_BODY = struct.Struct("<qI")
+_CRC = struct.Struct("<I")
+# 索引文件头：magic + 版本号 + 基准日期序数
+_INDEX_HEADER = struct.Struct("<4sII")
+_SLOT = struct.Struct("<I")
+
+RECORD_SIZE = _RECORD.size
+
+# 末尾连续损坏的记录最多回退这么多条，保证读取字节数有上界
+MAX_CORRUPT_SKIP = 64
+
+_TEXT_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+_TEXT_LENGTH = len("2026-01-01 00:00:00.000000")
+
+# 旧文本文件倒序读取：每次读一块，总量封顶（与文件大小无关）
+TAIL_BLOCK_SIZE = 4096
+TAIL_MAX_BYTES = 64 * 1024
+_MICROS_PER_DAY = 86400 * 1000000
+
+
+def _to_micros(dt):
+    delta = dt - datetime.datetime.min
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _from_micros(micros):
+    return datetime.datetime.min + datetime.timedelta(microseconds=micros)
+
+
+def pack_record(dt):
+    """datetime -> 16 字节记录（含校验）。"""
+    body = _RECORD_BODY.pack(_to_micros(dt), dt.toordinal())
+    return body + _CRC.pack(zlib.crc32(body))
+
+
+def unpack_record(data):
+    """16 字节记录 -> datetime；长度不对或校验失败返回 None。"""
+    if len(data) != RECORD_SIZE:
+        return None
+    micros, ordinal, crc = _RECORD.unpack(data)
+    if zlib.crc32(data[:12]) != crc or micros // _MICROS_PER_DAY + 1 != ordinal:
+        return None
+    try:
+        return _from_micros(micros)
+    except OverflowError:
+        return None
+
+
+def parse_text_line(line):
+    """解析旧 start_time.txt 的一行，失败返回 None。"""
+    line = line.strip()
+    if not line:
+        return None
+    # 旧版总是写满 6 位微秒；长度对得上才走快速路径，避免新版 fromisoformat
+    # 把截断的 "2026-07-28 09" 之类当成合法时间
+    if len(line) == _TEXT_LENGTH:
+        try:
+            return datetime.datetime.fromisoformat(line)
+        except ValueError:
+            pass
+    try:
+        return datetime.datetime.strptime(line, _TEXT_FORMAT)
+    except ValueError:
+        return None
+
+
+def read_last_text_entry(path, block_size=TAIL_BLOCK_SIZE, max_bytes=TAIL_MAX_BYTES):
+    """从文件末尾按块倒序读取旧 start_time.txt，返回最后一条合法时间。
+
+    末尾被截断或写坏的行会被跳过，继续向前找；最多读取 max_bytes 字节，
+    超出仍未找到（或文件为空）返回 None。文件不存在时抛 FileNotFoundError，
+    由调用方决定如何处理。
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        budget = max_bytes
+        carry = b""
+        while pos > 0 and budget > 0:
+            size = min(block_size, pos, budget)
+            pos -= size
+            budget -= size
+            f.seek(pos)
+            lines = (f.read(size) + carry).split(b"\n")
+            # 第一段可能是被块边界切开的半行，留到下一轮拼接；读到文件头时才算完整
+            carry = lines.pop(0) if pos > 0 else b""
+            for raw in reversed(lines):
+                if not raw.strip():
+                    continue
+                result = parse_text_line(raw.decode("utf-8", "replace"))
+                if result is not None:
+                    return result
+                logger.warning(f"Skipping invalid start time line: {raw[:40]!r}")
+        return None
+
+
+class StartTimeJournal:
+    """启动时间日志读写。所有读操作与历史长度无关（O(1) seek）。"""
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+
+    # ── 基础信息 ──────────────────────────────────────────
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _record_count(self, f):
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size < _JOURNAL_HEADER.size:
+            return 0
+        # 末尾不足一条的残缺字节（写到一半断电）直接忽略
+        return (size - _JOURNAL_HEADER.size) // RECORD_SIZE
+
+    def _read_record(self, f, number):
+        f.seek(_JOURNAL_HEADER.size + number * RECORD_SIZE)
+        return unpack_record(f.read(RECORD_SIZE))
+
+    def _check_header(self, f):
+        f.seek(0)
+        header = f.read(_JOURNAL_HEADER.size)
+        if len(header) < _JOURNAL_HEADER.size:
+            return False
+        magic, version = _JOURNAL_HEADER.unpack(header)
+        return magic == JOURNAL_MAGIC and version == JOURNAL_VERSION
+
+    def __len__(self):
+        try:
+            with open(self.path, "rb") as f:
+                return self._record_count(f) if self._check_header(f) else 0
+        except FileNotFoundError:
+            return 0
+
+    # ── 读 ────────────────────────────────────────────────
+
+    def last(self):
+        """返回最新一条有效记录；没有则返回 None。
+
+        末尾记录损坏时向前回退，最多跳过 MAX_CORRUPT_SKIP 条。
+        """
+        try:
+            with open(self.path, "rb") as f:
+                if not self._check_header(f):
+                    logger.warning(f"Start time journal header invalid: {self.path}")
+                    return None
+                count = self._record_count(f)
+                for number in range(count - 1, max(-1, count - 1 - MAX_CORRUPT_SKIP), -1):
+                    result = self._read_record(f, number)
+                    if result is not None:
+                        return result
+                    logger.warning(f"Skipping corrupt start time record #{number}")
+                return None
+        except FileNotFoundError:
+            return None
+
+    def find(self, date):
+        """返回 date 当天的第一条启动记录；没有则返回 None。"""
+        ordinal = date.toordinal()
+        try:
+            with open(self.path, "rb") as f:
+                if not self._check_header(f):
+                    return None
+                if not os.path.exists(self.index_path) and self._record_count(f):
+                    logger.warning("Start time index missing, rebuilding from journal")
+                    self.rebuild_index()
+                number = self._lookup_index(ordinal)
+                if number is not None:
+                    result = self._read_record(f, number)
+                    if result is not None and result.toordinal() == ordinal:
+                        return result
+                # 追加后、写索引前断电：索引里缺当天，但末尾记录可能就是
+                count = self._record_count(f)
+                if count:
+                    result = self._read_record(f, count - 1)
+                    if result is not None and result.toordinal() == ordinal:
+                        return result
+                return None
+        except FileNotFoundError:
+            return None
+
+    def _lookup_index(self, ordinal):
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+                if len(header) < _INDEX_HEADER.size:
+                    return None
+                magic, version, base = _INDEX_HEADER.unpack(header)
+                if magic != INDEX_MAGIC or version != JOURNAL_VERSION or ordinal < base:
+                    return None
+                f.seek(_INDEX_HEADER.size + (ordinal - base) * _SLOT.size)
+                slot = f.read(_SLOT.size)
+                if len(slot) < _SLOT.size:
+                    return None
+                value = _SLOT.unpack(slot)[0]
+                return value - 1 if value else None
+        except FileNotFoundError:
+            return None
+
+    def iter_records(self):
+        """顺序遍历所有有效记录（仅用于迁移/重建索引等一次性操作）。"""
+        try:
+            with open(self.path, "rb") as f:
+                if not self._check_header(f):
+                    return
+                f.seek(_JOURNAL_HEADER.size)
+                number = 0
+                while True:
+                    data = f.read(RECORD_SIZE)
+                    if len(data) < RECORD_SIZE:
+                        return
+                    result = unpack_record(data)
+                    if result is not None:
+                        yield number, result
+                    number += 1
+        except FileNotFoundError:
+            return
+
+    # ── 写 ────────────────────────────────────────────────
+
+    def append(self, dt):
+        """追加一条记录并更新当天索引槽位。"""
+        with open(self.path, "ab") as f:
+            if f.tell() < _JOURNAL_HEADER.size:
+                # 新文件（或只写了半个头）：从头写文件头
+                f.truncate(0)
+                f.write(_JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION))
+            else:
+                # 截掉末尾残缺字节，保证记录按 RECORD_SIZE 对齐
+                extra = (f.tell() - _JOURNAL_HEADER.size) % RECORD_SIZE
+                if extra:
+                    f.truncate(f.tell() - extra)
+            f.seek(0, os.SEEK_END)
+            number = (f.tell() - _JOURNAL_HEADER.size) // RECORD_SIZE
+            f.write(pack_record(dt))
+        self._index_record(number, dt.toordinal())
+        return number
+
+    def _index_record(self, number, ordinal):
+        """把记录序号写进索引；当天已有记录时保留第一条。"""
+        try:
+            exists = os.path.exists(self.index_path)
+            if not exists and number > 0:
+                # 日志里已有更早的记录：新建的索引只会从今天开始，之前的日期
+                # 全都查不到，所以整体重建（新记录也在日志里，一并索引）
+                logger.warning("Start time index missing, rebuilding from journal")
+                self.rebuild_index()
+                return
+            with open(self.index_path, "r+b" if exists else "w+b") as f:
+                header = f.read(_INDEX_HEADER.size)
+                if len(header) == _INDEX_HEADER.size:
+                    magic, version, base = _INDEX_HEADER.unpack(header)
+                    if magic != INDEX_MAGIC or version != JOURNAL_VERSION:
+                        raise ValueError("index header invalid")
+                elif number > 0:
+                    raise ValueError("index header truncated")
+                else:
+                    base = ordinal
+                    f.seek(0)
+                    f.truncate(0)
+                    f.write(_INDEX_HEADER.pack(INDEX_MAGIC, JOURNAL_VERSION, base))
+                if ordinal < base:
+                    # 系统时间被往前调过：不进索引，find() 查不到这一天
+                    logger.warning(f"Start time before index base, not indexed: ordinal={ordinal}")
+                    return
+                offset = _INDEX_HEADER.size + (ordinal - base) * _SLOT.size
+                f.seek(offset)
+                slot = f.read(_SLOT.size)
+                if len(slot) == _SLOT.size and _SLOT.unpack(slot)[0]:
+                    return
+                # 中间空缺的天由稀疏写入自动补零
+                f.seek(offset)
+                f.write(_SLOT.pack(number + 1))
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Start time index damaged ({e}), rebuilding")
+            self.rebuild_index()
+
+    def rebuild_index(self):
+        """从日志全量重建索引（索引丢失/损坏时调用，一次性线性）。"""
+        slots = {}
+        for number, dt in self.iter_records():
+            slots.setdefault(dt.toordinal(), number)
+        if not slots:
+            # 没有有效记录：不写基准为 0 的空索引，下次追加时按当天新建
+            try:
+                os.remove(self.index_path)
+            except OSError:
+                pass
+            return
+        self._write_index(slots)
+
+    def _write_index(self, slots):
+        """slots: {日期序数: 记录序号}，写临时文件再原子替换。"""
+        base = min(slots) if slots else 0
+        table = bytearray(_SLOT.size * ((max(slots) - base + 1) if slots else 0))
+        for ordinal, number in slots.items():
+            _SLOT.pack_into(table, (ordinal - base) * _SLOT.size, number + 1)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_INDEX_HEADER.pack(INDEX_MAGIC, JOURNAL_VERSION, base))
+            f.write(table)
+        os.replace(tmp_path, self.index_path)
+        logger.info(f"Start time index written: {len(slots)} days")
+
+    def write_all(self, datetimes):
+        """用给定记录整体重写日志与索引（迁移用；写临时文件再原子替换）。"""
+        slots = {}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION))
+            chunk = []
+            for number, dt in enumerate(datetimes):
+                chunk.append(pack_record(dt))
+                slots.setdefault(dt.toordinal(), number)
+                if len(chunk) >= 4096:
+                    f.write(b"".join(chunk))
+                    chunk.clear()
+            f.write(b"".join(chunk))
+        os.replace(tmp_path, self.path)
+        self._write_index(slots)
+
+    def migrate_from_text(self, text_path):
+        """一次性把旧 start_time.txt 转成日志；日志已存在时不做任何事。
+
+        返回迁移的记录条数（无旧文件 / 已迁移返回 0）。旧文件保留不删，
+        方便回退到旧版本。
+        """
+        if self.exists():
+            return 0
+        try:
+            with open(text_path, "r") as f:
+                records = [dt for dt in map(parse_text_line, f) if dt is not None]
+        except FileNotFoundError:
+            return 0
+        self.write_all(records)
+        logger.info(f"Migrated {len(records)} start time entries from {text_path}")
+        return len(records)
@@ -0,0 +1,102 @@
+"""构建时预处理内置图片，打包后的程序运行时不再做透明化。
+
+托盘 / 窗口图标和 images/timers 里的宠物图是随 exe 一起发布的，内容固定。
+原来每台机器第一次启动都要导入 numpy、把它们挨个去一遍白底，结果才进
+磁盘缓存。这里在打包前把它们按运行时会请求的参数处理好：
+
+- icon.png        : 原尺寸（transparent_icon 的用法）
+- timers/*        : PET_IMAGE_SIZE × 常见缩放比例（100% ~ 200%）
+
+结果存成 PNG，文件名就是运行时的缓存键（asset_cache_key：源文件内容 +
+处理参数的哈希），连同 manifest.json 写到 images/baked/，由 --add-data
+"images;images" 一起打包。运行时 transparent_image 先查这份清单，命中就
+直接解码 PNG；用户替换了同名图片、或者调整了透明化阈值，键对不上，自动
+回退到正常处理，不会用到过期的结果。
+
+在 convert_icon.py 之后、PyInstaller 之前运行：
+
+    python bake_assets.py
+"""
+import json
+import os
+
+from PyQt5.QtWidgets import QApplication
+
+from app.config.constants import PET_IMAGE_SIZE
+from app.utils.image import DISK_CACHE_VERSION, asset_cache_key, transparent_image
+from app.utils.image_cache import BAKED_MANIFEST, BAKED_MANIFEST_FORMAT
+from app.utils.image_index import IMAGE_EXTENSIONS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(HERE, "images")
+OUT_DIR = os.path.join(IMAGES_DIR, "baked")
+
+# Windows 常见的显示缩放比例；其他比例运行时照常处理并进磁盘缓存
+BAKE_DPRS = (1.0, 1.25, 1.5, 1.75, 2.0)
+
+
+def default_jobs(images_dir=IMAGES_DIR, dprs=BAKE_DPRS):
+    """[(源文件, target_size, dpr)]：图标原尺寸，宠物图按每个缩放比例各一份。"""
+    jobs = [(os.path.join(images_dir, "icon.png"), None, 1.0)]
+    pet_dir = os.path.join(images_dir, "timers")
+    names = sorted(os.listdir(pet_dir)) if os.path.isdir(pet_dir) else []
+    for name in names:
+        if os.path.splitext(name)[1].lower() not in IMAGE_EXTENSIONS:
+            continue
+        for dpr in dprs:
+            jobs.append((os.path.join(pet_dir, name), PET_IMAGE_SIZE, dpr))
+    return jobs
+
+
+def bake(jobs, out_dir=OUT_DIR, root=HERE):
+    """处理 jobs，写出 PNG 和 manifest.json 并返回清单；先清掉上一次的结果。"""
+    os.makedirs(out_dir, exist_ok=True)
+    for name in os.listdir(out_dir):
+        if name.endswith(".png") or name == BAKED_MANIFEST:
+            os.remove(os.path.join(out_dir, name))
+
+    assets = {}
+    for path, target_size, dpr in jobs:
+        key = asset_cache_key(path, target_size, dpr)
+        if key is None:
+            raise FileNotFoundError(f"找不到 {path}")
+        if key in assets:
+            continue  # 内容相同的文件只存一份
+        # 不走缓存：构建机上残留的磁盘缓存不应该混进安装包
+        image = transparent_image(path, target_size, dpr, use_cache=False)
+        file_name = key + ".png"
+        if image.isNull() or not image.save(os.path.join(out_dir, file_name)):
+            raise RuntimeError(f"处理 {path} 失败")
+        assets[key] = {
+            "file": file_name,
+            "source": os.path.relpath(path, root).replace(os.sep, "/"),
+            "target": list(target_size) if target_size is not None else None,
+            "dpr": dpr,
+            "width": image.width(),
+            "height": image.height(),
+        }
+
+    manifest = {
+        "format": BAKED_MANIFEST_FORMAT,
+        "version": repr(DISK_CACHE_VERSION),
+        "assets": assets,
+    }
+    tmp_path = os.path.join(out_dir, BAKED_MANIFEST + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, os.path.join(out_dir, BAKED_MANIFEST))
+    return manifest
+
+
+def main():
+    # 需要 Qt GUI 上下文（offscreen / 桌面均可），SVG 靠 Qt 的 svg 插件解码
+    app = QApplication.instance() or QApplication([])
+
+    manifest = bake(default_jobs())
+    total = sum(os.path.getsize(os.path.join(OUT_DIR, entry["file"]))
+                for entry in manifest["assets"].values())
+    print(f"已生成 {len(manifest['assets'])} 张预处理图片 → {OUT_DIR} ({total // 1024} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import json
 import os
 import tempfile
+import time
 import unittest
 
 from app.ui import ascii_art
@@ -226,5 +227,56 @@ class TestRenderFrame(unittest.TestCase):
         self.assertEqual(len(colors), 5)
 
 
+class TestRenderCache(unittest.TestCase):
+    """预渲染帧缓存：与逐行渲染结果一致、外部场景替换后失效、查表更快。"""
+
+    def test_cache_matches_uncached(self):
+        for name, scene in ascii_art.SCENES.items():
+            for i in range(len(scene['frames'])):
+                self.assertEqual(ascii_art.render_frame(scene, i),
+                                 ascii_art._render_frame_uncached(scene, i),
+                                 f"{name} frame {i}")
+
+    def test_cache_built_at_normalize(self):
+        for name, scene in ascii_art.SCENES.items():
+            self.assertEqual(len(scene.get('_rendered', [])), len(scene['frames']), name)
+
+    def test_external_override_invalidates_cache(self):
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, "cache_probe.txt"), "w", encoding="utf-8") as f:
+                f.write("===\nold\n")
+            ascii_art.load_external_scenes(directory=d)
+            try:
+                self.assertEqual(ascii_art.render_frame(ascii_art.SCENES["cache_probe"], 0), "old")
+                with open(os.path.join(d, "cache_probe.txt"), "w", encoding="utf-8") as f:
+                    f.write("===\nnew\n")
+                ascii_art.load_external_scenes(directory=d)
+                self.assertEqual(ascii_art.render_frame(ascii_art.SCENES["cache_probe"], 0), "new")
+            finally:
+                ascii_art.SCENES.pop("cache_probe", None)
+                if "cache_probe" in ascii_art.IDLE_SCENES:
+                    ascii_art.IDLE_SCENES.remove("cache_probe")
+
+    def test_benchmark_cached_vs_uncached(self):
+        """微基准：遍历所有场景的所有帧，缓存查表应明显快于逐行渲染。"""
+        jobs = [(scene, i) for scene in ascii_art.SCENES.values()
+                for i in range(len(scene['frames']))]
+
+        def run(render):
+            best = float("inf")
+            for _ in range(20):
+                start = time.perf_counter()
+                for scene, i in jobs:
+                    render(scene, i)
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        uncached = run(ascii_art._render_frame_uncached)
+        cached = run(ascii_art.render_frame)
+        print(f"\nrender {len(jobs)} frames: uncached {uncached * 1e6:.0f}us, "
+              f"cached {cached * 1e6:.0f}us ({uncached / cached:.1f}x)")
+        self.assertLess(cached, uncached)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,143 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QImage
+from PyQt5.QtWidgets import QApplication
+
+import bake_assets
+from app.utils import image as image_module
+from app.utils.image import asset_cache_key, transparent_image
+from app.utils.image_cache import BAKED_MANIFEST, BakedAssets, DiskImageCache
+
+
+def _make_png(path, w=80, h=60, color=QColor(200, 40, 40)):
+    image = QImage(w, h, QImage.Format_RGB32)
+    image.fill(Qt.white)
+    for y in range(h // 4, h * 3 // 4):
+        for x in range(w // 4, w * 3 // 4):
+            image.setPixelColor(x, y, color)
+    image.save(path)
+    return path
+
+
+def _rgba(image):
+    return image.convertToFormat(QImage.Format_RGBA8888)
+
+
+class TestBakeAssets(unittest.TestCase):
+    """构建时烘焙：清单内容、运行时命中、键对不上时回退。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.images_dir = os.path.join(self.tmpdir, 'images')
+        self.out_dir = os.path.join(self.images_dir, 'baked')
+        os.makedirs(os.path.join(self.images_dir, 'timers'))
+        self.icon = _make_png(os.path.join(self.images_dir, 'icon.png'), 64, 64)
+        self.pet = _make_png(os.path.join(self.images_dir, 'timers', 'cat.png'), 240, 200)
+        # 内容相同的两张图只烘焙一份
+        shutil.copy(self.pet, os.path.join(self.images_dir, 'timers', 'cat_copy.png'))
+        with open(os.path.join(self.images_dir, 'timers', 'notes.txt'), 'w') as f:
+            f.write('not an image')
+
+        # 磁盘缓存指向临时目录，且上限为 0：任何命中都只能来自烘焙结果
+        self.patch = mock.patch.multiple(
+            image_module,
+            disk_image_cache=DiskImageCache(os.path.join(self.tmpdir, 'cache'), max_bytes=0),
+            baked_assets=BakedAssets(self.out_dir))
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _bake(self, dprs=(1.0, 2.0)):
+        return bake_assets.bake(bake_assets.default_jobs(self.images_dir, dprs),
+                                out_dir=self.out_dir, root=self.tmpdir)
+
+    def test_default_jobs(self):
+        jobs = bake_assets.default_jobs(self.images_dir, dprs=(1.0, 1.5))
+        self.assertEqual(jobs[0], (self.icon, None, 1.0))
+        pets = [(os.path.basename(path), size, dpr) for path, size, dpr in jobs[1:]]
+        self.assertEqual(pets, [
+            ('cat.png', bake_assets.PET_IMAGE_SIZE, 1.0),
+            ('cat.png', bake_assets.PET_IMAGE_SIZE, 1.5),
+            ('cat_copy.png', bake_assets.PET_IMAGE_SIZE, 1.0),
+            ('cat_copy.png', bake_assets.PET_IMAGE_SIZE, 1.5),
+        ])
+
+    def test_manifest(self):
+        manifest = self._bake()
+        assets = manifest['assets']
+        self.assertEqual(len(assets), 3)   # 图标 1 + 宠物图 2 个 DPR（副本去重）
+        with open(os.path.join(self.out_dir, BAKED_MANIFEST), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), manifest)
+
+        key = asset_cache_key(self.pet, (60, 60), 2.0)
+        entry = assets[key]
+        self.assertEqual(entry['source'], 'images/timers/cat.png')
+        self.assertEqual((entry['target'], entry['dpr']), ([60, 60], 2.0))
+        self.assertEqual((entry['width'], entry['height']), (120, 100))
+        self.assertTrue(os.path.isfile(os.path.join(self.out_dir, entry['file'])))
+
+    def test_rebake_replaces_old_output(self):
+        self._bake(dprs=(1.0, 1.25, 1.5))
+        self._bake(dprs=(1.0,))
+        pngs = [n for n in os.listdir(self.out_dir) if n.endswith('.png')]
+        self.assertEqual(len(pngs), 2)
+
+    def test_runtime_uses_baked_asset_without_processing(self):
+        self._bake()
+        expected = _rgba(transparent_image(self.pet, (60, 60), 2.0, use_cache=False))
+        with mock.patch.object(image_module, '_process',
+                               side_effect=AssertionError('should not process')):
+            image = transparent_image(self.pet, (60, 60), 2.0)
+            icon = transparent_image(self.icon)
+        self.assertEqual(_rgba(image), expected)
+        self.assertEqual(image.devicePixelRatio(), 2.0)
+        self.assertFalse(icon.isNull())
+        self.assertEqual(image_module.baked_assets.stats(), {'hits': 2, 'misses': 0})
+
+    def test_changed_source_falls_back_to_processing(self):
+        self._bake()
+        # 用户替换了同名图片：内容变了，键对不上，重新处理
+        _make_png(self.pet, 240, 200, color=QColor(30, 160, 60))
+        image = transparent_image(self.pet, (60, 60), 1.0)
+        self.assertEqual(image_module.baked_assets.hits, 0)
+        self.assertEqual(image.pixelColor(30, 25).green(), 160)
+
+    def test_unbaked_dpr_falls_back_to_processing(self):
+        self._bake()
+        image = transparent_image(self.pet, (60, 60), 1.5)
+        self.assertEqual((image.width(), image.height()), (90, 75))
+        self.assertEqual(image_module.baked_assets.hits, 0)
+
+    def test_missing_or_unknown_manifest_is_empty(self):
+        self.assertEqual(len(BakedAssets(self.out_dir)), 0)
+        os.makedirs(self.out_dir)
+        with open(os.path.join(self.out_dir, BAKED_MANIFEST), 'w') as f:
+            json.dump({'format': 999, 'assets': {'k': {'file': 'k.png'}}}, f)
+        self.assertEqual(len(BakedAssets(self.out_dir)), 0)
+        with open(os.path.join(self.out_dir, BAKED_MANIFEST), 'w') as f:
+            f.write('{broken')
+        self.assertEqual(len(BakedAssets(self.out_dir)), 0)
+
+    def test_listed_but_missing_file_is_a_miss(self):
+        manifest = self._bake()
+        key = asset_cache_key(self.pet, (60, 60), 1.0)
+        os.remove(os.path.join(self.out_dir, manifest['assets'][key]['file']))
+        image = transparent_image(self.pet, (60, 60), 1.0)
+        self.assertFalse(image.isNull())
+        self.assertEqual(image_module.baked_assets.stats(), {'hits': 0, 'misses': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
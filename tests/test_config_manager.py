@@ -1,24 +1,41 @@
+import json
+import os
+import shutil
+import tempfile
+import time
 import unittest
 from unittest.mock import patch, mock_open
 from app.config.manager import ConfigManager
 
 class TestConfigManager(unittest.TestCase):
+    """每个用例用临时目录里的 settings.json 并同步写盘：
+    延迟写入的定时器不会在用例结束后把默认值写进仓库里的 settings.json。"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "settings.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make(self):
+        return ConfigManager(settings_file=self.path, save_delay=0)
+
     def test_default_reminder_settings(self):
-        with patch('builtins.open', side_effect=FileNotFoundError):
-            config = ConfigManager()
-            self.assertTrue(config.get_reminder_setting('checkin_reminder'))
-            self.assertTrue(config.get_reminder_setting('job_record_reminder'))
-            self.assertTrue(config.get_reminder_setting('checkout_reminder'))
+        config = self._make()
+        self.assertTrue(config.get_reminder_setting('checkin_reminder'))
+        self.assertTrue(config.get_reminder_setting('job_record_reminder'))
+        self.assertTrue(config.get_reminder_setting('checkout_reminder'))
 
     def test_set_reminder_setting(self):
-        config = ConfigManager()
+        config = self._make()
         original_value = config.get_reminder_setting('checkin_reminder')
         
         config.set_reminder_setting('checkin_reminder', not original_value)
         self.assertEqual(config.get_reminder_setting('checkin_reminder'), not original_value)
 
     def test_toggle_reminder_setting(self):
-        config = ConfigManager()
+        config = self._make()
         original_value = config.get_reminder_setting('job_record_reminder')
         
         new_value = config.toggle_reminder_setting('job_record_reminder')
@@ -28,42 +45,153 @@ class TestConfigManager(unittest.TestCase):
         self.assertEqual(new_value, original_value)
 
     def test_get_reminder_setting_invalid_key(self):
-        config = ConfigManager()
+        config = self._make()
         
         with self.assertRaises(ValueError):
             config.set_reminder_setting('invalid_key', True)
 
     def test_toggle_reminder_setting_invalid_key(self):
-        config = ConfigManager()
+        config = self._make()
         
         with self.assertRaises(ValueError):
             config.toggle_reminder_setting('invalid_key')
 
     def test_flexible_mode_default(self):
-        with patch('builtins.open', side_effect=FileNotFoundError):
-            config = ConfigManager()
-            self.assertFalse(config.is_flexible)
+        config = self._make()
+        self.assertFalse(config.is_flexible)
 
     def test_work_hours_default(self):
-        with patch('builtins.open', side_effect=FileNotFoundError):
-            config = ConfigManager()
-            self.assertEqual(config.work_hours, 8.5)
+        config = self._make()
+        self.assertEqual(config.work_hours, 8.5)
 
     def test_work_hours_set_get(self):
-        with patch('builtins.open', side_effect=FileNotFoundError):
-            config = ConfigManager()
-            config.work_hours = 7.0
-            self.assertEqual(config.work_hours, 7.0)
+        config = self._make()
+        config.work_hours = 7.0
+        self.assertEqual(config.work_hours, 7.0)
 
     def test_fixed_start_hour_default(self):
-        with patch('builtins.open', side_effect=FileNotFoundError):
-            config = ConfigManager()
-            self.assertEqual(config.fixed_start_hour, 9.0)
+        config = self._make()
+        self.assertEqual(config.fixed_start_hour, 9.0)
 
     def test_job_record_before_end_minutes_default(self):
-        with patch('builtins.open', side_effect=FileNotFoundError):
-            config = ConfigManager()
-            self.assertEqual(config.job_record_before_end_minutes, 60)
+        config = self._make()
+        self.assertEqual(config.job_record_before_end_minutes, 60)
+
+    def test_update_check_ttl_default(self):
+        config = self._make()
+        self.assertEqual(config.update_check_ttl, 3600)
+
+
+class TestConfigPersistence(unittest.TestCase):
+    """写盘合并：窗口内多次修改只写一次，退出前 flush 立即落盘。"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "settings.json")
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"work_hours": 8.5}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _read(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_setters_coalesce_into_one_write(self):
+        config = ConfigManager(settings_file=self.path, save_delay=60)
+        config.work_hours = 7.0
+        config.fixed_start_hour = 10.0
+        config.is_flexible = True
+        config.toggle_reminder_setting('checkin_reminder')
+        self.assertEqual(config.save_count, 0)
+        self.assertEqual(self._read(), {"work_hours": 8.5})
+
+        config.flush()
+        self.assertEqual(config.save_count, 1)
+        data = self._read()
+        self.assertEqual(data["work_hours"], 7.0)
+        self.assertEqual(data["fixed_start_hour"], 10.0)
+        self.assertTrue(data["flexible_mode"])
+
+        # 没有新修改时 flush 不再写盘
+        config.flush()
+        self.assertEqual(config.save_count, 1)
+
+    def test_background_write_after_window(self):
+        config = ConfigManager(settings_file=self.path, save_delay=0.05)
+        for hours in (6.0, 7.0, 8.0):
+            config.work_hours = hours
+        deadline = time.monotonic() + 5
+        while config.save_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(config.save_count, 1)
+        self.assertEqual(self._read()["work_hours"], 8.0)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_zero_delay_writes_synchronously(self):
+        config = ConfigManager(settings_file=self.path, save_delay=0)
+        config.work_hours = 6.5
+        self.assertEqual(config.save_count, 1)
+        self.assertEqual(self._read()["work_hours"], 6.5)
+
+
+class TestConfigHotReload(unittest.TestCase):
+    """热加载：文件签名变化才重新解析，并逐键通知订阅者。"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "settings.json")
+        self._write_external({"work_hours": 8.5})
+        self.config = ConfigManager(settings_file=self.path, save_delay=0)
+        self.events = []
+        self.config.subscribe(lambda key, old, new: self.events.append((key, old, new)))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write_external(self, data, mtime_offset=0):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + mtime_offset))
+
+    def test_unchanged_file_is_not_reparsed(self):
+        with patch.object(self.config, '_read_file') as mock_read:
+            self.assertEqual(self.config.reload_if_changed(), [])
+            mock_read.assert_not_called()
+
+    def test_external_edit_emits_per_key_events(self):
+        self._write_external({"work_hours": 9.0,
+                              "reminders": {"checkout_reminder": False}}, mtime_offset=10 ** 9)
+        changed = self.config.reload_if_changed()
+        self.assertEqual(changed, ["reminders.checkout_reminder", "work_hours"])
+        self.assertIn(("work_hours", 8.5, 9.0), self.events)
+        self.assertIn(("reminders.checkout_reminder", True, False), self.events)
+        self.assertEqual(self.config.work_hours, 9.0)
+        self.assertFalse(self.config.get_reminder_setting('checkout_reminder'))
+        # 再次轮询：签名没变，不再通知
+        self.assertEqual(self.config.reload_if_changed(), [])
+        self.assertEqual(len(self.events), 2)
+
+    def test_own_writes_are_not_reported(self):
+        self.config.work_hours = 6.0
+        self.assertEqual(self.config.reload_if_changed(), [])
+        self.assertEqual(self.events, [])
+
+    def test_unreadable_file_retried_later(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{broken")
+        self.assertEqual(self.config.reload_if_changed(), [])
+        self._write_external({"work_hours": 7.5}, mtime_offset=10 ** 9)
+        self.assertEqual(self.config.reload_if_changed(), ["work_hours"])
+
+    def test_listener_errors_do_not_stop_others(self):
+        self.config.subscribe(lambda *args: 1 / 0)
+        self.config.unsubscribe(self.events.append)  # 未订阅的回调忽略
+        self._write_external({"work_hours": 7.0}, mtime_offset=10 ** 9)
+        self.config.reload_if_changed()
+        self.assertEqual(self.events, [("work_hours", 8.5, 7.0)])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import MagicMock
+
+from app.ui.display_state import DisplayState
+
+
+class TestDisplayState(unittest.TestCase):
+    """脏检查：相同内容跳过，变化才应用，并统计应用 / 跳过次数。"""
+
+    def test_skips_unchanged_value(self):
+        state = DisplayState()
+        apply = MagicMock()
+        # 模拟 100ms 刷新 10 次，秒数只变一次
+        for text in ['⏳ 10s'] * 9 + ['⏳ 9s']:
+            state.update('time_label', text, apply)
+        self.assertEqual(apply.call_count, 2)
+        self.assertEqual((state.applied, state.skipped), (2, 8))
+        self.assertEqual(state.stats(), {'time_label': {'applied': 2, 'skipped': 8}})
+
+    def test_keys_are_independent(self):
+        state = DisplayState()
+        apply = MagicMock()
+        self.assertTrue(state.update('a', 'x', apply))
+        self.assertTrue(state.update('b', 'x', apply))
+        self.assertFalse(state.update('a', 'x', apply))
+
+    def test_token_used_for_comparison(self):
+        state = DisplayState()
+        apply = MagicMock()
+        state.update('pixmap', 'obj-1', apply, token='cat.png')
+        self.assertFalse(state.update('pixmap', 'obj-2', apply, token='cat.png'))
+        apply.assert_called_once_with('obj-1')
+
+    def test_none_is_a_real_value(self):
+        state = DisplayState()
+        apply = MagicMock()
+        self.assertTrue(state.update('k', None, apply))
+        self.assertFalse(state.update('k', None, apply))
+
+    def test_invalidate_forces_reapply(self):
+        state = DisplayState()
+        apply = MagicMock()
+        state.update('a', 1, apply)
+        state.update('b', 1, apply)
+        state.invalidate('a')
+        self.assertTrue(state.update('a', 1, apply))
+        self.assertFalse(state.update('b', 1, apply))
+        state.invalidate()
+        self.assertTrue(state.update('b', 1, apply))
+
+
+if __name__ == '__main__':
+    unittest.main()
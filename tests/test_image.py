@@ -0,0 +1,531 @@
+import os
+import shutil
+import tempfile
+import gc
+import time
+import tracemalloc
+import unittest
+from unittest import mock
+
+import numpy as np
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QImage, QPainter, QPixmap
+from PyQt5.QtWidgets import QApplication
+
+from app.utils import image as image_module
+from app.utils.image import (
+    OPAQUE_DIST, TRANSPARENT_DIST, PixmapCache, _flood_fill_background, _to_rgba_array,
+    pixmap_cache, rasterize_svg, remove_white_background, rgba_view, transparent_icon,
+    transparent_pixmap,
+)
+from app.utils.image_cache import BakedAssets, DiskImageCache
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_disk_cache_dir = None
+_disk_cache_patch = None
+
+
+def setUpModule():
+    # 磁盘缓存指向临时目录且上限为 0（写入即淘汰）：不污染项目目录，
+    # 也不让上次运行留下的结果影响耗时对比
+    global _disk_cache_dir, _disk_cache_patch
+    _disk_cache_dir = tempfile.mkdtemp()
+    _disk_cache_patch = mock.patch.multiple(
+        image_module,
+        disk_image_cache=DiskImageCache(_disk_cache_dir, max_bytes=0),
+        # 空目录没有清单：本地跑过 bake_assets.py 也不影响这里的处理结果
+        baked_assets=BakedAssets(_disk_cache_dir))
+    _disk_cache_patch.start()
+
+
+def tearDownModule():
+    _disk_cache_patch.stop()
+    shutil.rmtree(_disk_cache_dir, ignore_errors=True)
+
+
+def _flood_fill_by_dilation(white_mask):
+    """旧实现（逐轮膨胀），作为等价性对照。"""
+    h, w = white_mask.shape
+    bg = np.zeros((h, w), dtype=bool)
+    bg[0, :] = white_mask[0, :]
+    bg[-1, :] = white_mask[-1, :]
+    bg[:, 0] = white_mask[:, 0]
+    bg[:, -1] = white_mask[:, -1]
+    for _ in range(h + w):
+        expanded = np.zeros_like(bg)
+        expanded[1:, :] |= bg[:-1, :]
+        expanded[:-1, :] |= bg[1:, :]
+        expanded[:, 1:] |= bg[:, :-1]
+        expanded[:, :-1] |= bg[:, 1:]
+        expanded &= white_mask
+        new_bg = bg | expanded
+        if np.array_equal(new_bg, bg):
+            break
+        bg = new_bg
+    return bg
+
+
+def _ring_image(h, w, rng):
+    """白底中间一个黑色圆环（环内白色不与边缘连通），再撒一些白色噪点。"""
+    yy, xx = np.ogrid[:h, :w]
+    r2 = (yy - h / 2) ** 2 + (xx - w / 2) ** 2
+    radius = min(h, w) / 3
+    mask = (r2 > radius ** 2) | (r2 < (radius * 0.6) ** 2)
+    return mask | (rng.random((h, w)) < 0.02)
+
+
+class TestFloodFillBackground(unittest.TestCase):
+    """连通分量版 flood fill 与旧的膨胀实现逐位一致。"""
+
+    def test_matches_dilation_on_random_masks(self):
+        rng = np.random.default_rng(0)
+        shapes = [(1, 1), (1, 9), (9, 1), (2, 2), (13, 17), (64, 64), (100, 37)]
+        for density in (0.0, 0.3, 0.5, 0.6, 0.7, 0.9, 1.0):
+            for shape in shapes:
+                for _ in range(5):
+                    mask = rng.random(shape) < density
+                    np.testing.assert_array_equal(
+                        _flood_fill_background(mask), _flood_fill_by_dilation(mask),
+                        err_msg=f"density={density} shape={shape}")
+
+    def test_interior_white_is_not_background(self):
+        mask = np.ones((7, 7), dtype=bool)
+        mask[1:6, 1:6] = False
+        mask[3, 3] = True
+        bg = _flood_fill_background(mask)
+        self.assertFalse(bg[3, 3])
+        self.assertTrue(bg[0, 0])
+        self.assertEqual(int(bg.sum()), 24)
+
+    def test_diagonal_is_not_connected(self):
+        mask = np.zeros((3, 3), dtype=bool)
+        mask[0, 0] = mask[1, 1] = True
+        bg = _flood_fill_background(mask)
+        self.assertTrue(bg[0, 0])
+        self.assertFalse(bg[1, 1])
+
+    def test_long_corridor_is_fully_filled(self):
+        # 蛇形通道的测地距离远超 h+w：旧实现膨胀 h+w 轮后截断，只填了入口一段
+        n = 41
+        mask = np.zeros((n, n), dtype=bool)
+        mask[1, 0] = True
+        for r in range(1, n - 1, 2):
+            mask[r, 1:n - 1] = True
+            if r + 2 < n - 1:
+                mask[r + 1, n - 2 if (r // 2) % 2 == 0 else 1] = True
+        np.testing.assert_array_equal(_flood_fill_background(mask), mask)
+        self.assertLess(int(_flood_fill_by_dilation(mask).sum()), int(mask.sum()))
+
+    def test_matches_dilation_on_ring(self):
+        mask = _ring_image(300, 400, np.random.default_rng(1))
+        np.testing.assert_array_equal(_flood_fill_background(mask), _flood_fill_by_dilation(mask))
+
+
+class TestFloodFillBenchmark(unittest.TestCase):
+    """不同尺寸下新旧实现的耗时对比；大图只跑新实现。"""
+
+    def test_benchmark(self):
+        rng = np.random.default_rng(2)
+        lines = []
+        for h, w in ((200, 200), (600, 800), (1500, 2000), (3000, 4000)):
+            mask = _ring_image(h, w, rng)
+            start = time.perf_counter()
+            fast = _flood_fill_background(mask)
+            fast_t = time.perf_counter() - start
+            if h * w <= 600 * 800:
+                start = time.perf_counter()
+                slow = _flood_fill_by_dilation(mask)
+                slow_t = time.perf_counter() - start
+                np.testing.assert_array_equal(fast, slow)
+                lines.append(f"{w}x{h}: dilation {slow_t * 1000:.0f}ms, components {fast_t * 1000:.0f}ms")
+            else:
+                lines.append(f"{w}x{h}: components {fast_t * 1000:.0f}ms")
+            # 4000x3000 也应在 1 秒内完成（旧实现要数十秒）
+            self.assertLess(fast_t, 1.0)
+        print("\nflood fill " + "; ".join(lines))
+
+
+def _draw_pet(path, w, h):
+    """白底宠物图：抗锯齿的红色圆 + 内部白色高光 + 蓝色矩形。"""
+    image = QImage(w, h, QImage.Format_RGB32)
+    image.fill(Qt.white)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor(200, 40, 40))
+    painter.drawEllipse(QRectF(w * 0.15, h * 0.15, w * 0.7, h * 0.7))
+    painter.setBrush(QColor(255, 255, 255))
+    painter.drawEllipse(QRectF(w * 0.4, h * 0.4, w * 0.2, h * 0.2))
+    painter.setBrush(QColor(30, 30, 160))
+    painter.drawRect(QRectF(w * 0.05, h * 0.8, w * 0.3, h * 0.1))
+    painter.end()
+    image.save(path)
+    return path
+
+
+class TestTransparentPixmapTargetSize(unittest.TestCase):
+    """target_size 模式：先缩小再去背景，结果与全分辨率处理后再缩放接近。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.tmpdir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
+
+    def _both(self, path, size=60):
+        full = transparent_pixmap(path).scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        fast = transparent_pixmap(path, target_size=size)
+        return full, fast
+
+    def test_matches_full_resolution_result(self):
+        for ext in ('png', 'jpg'):
+            path = _draw_pet(os.path.join(self.tmpdir, f'pet.{ext}'), 1600, 1200)
+            full, fast = self._both(path)
+            self.assertEqual(fast.size(), full.size())
+            a = _to_rgba_array(full.toImage()).astype(int)
+            b = _to_rgba_array(fast.toImage()).astype(int)
+            alpha_diff = np.abs(a[..., 3] - b[..., 3])
+            # 只有抗锯齿边缘的少数像素略有差异
+            self.assertLess(alpha_diff.mean(), 2.0, ext)
+            self.assertLess(np.percentile(alpha_diff, 99), 40, ext)
+            # 背景透明、主体和内部白色高光不透明
+            h, w = b.shape[:2]
+            self.assertEqual(b[0, 0, 3], 0)
+            self.assertEqual(b[h // 2, w // 2, 3], 255)
+            self.assertEqual(b[h // 4, w // 2, 3], 255)
+
+    def test_target_size_forms(self):
+        path = _draw_pet(os.path.join(self.tmpdir, 'forms.png'), 300, 200)
+        self.assertEqual(transparent_pixmap(path, target_size=60).size().width(), 60)
+        self.assertEqual(transparent_pixmap(path, target_size=(60, 30)).size().height(), 30)
+        pixmap = transparent_pixmap(QPixmap(path), target_size=(60, 60))
+        self.assertEqual((pixmap.width(), pixmap.height()), (60, 40))
+
+    def test_small_source_is_scaled_up_like_before(self):
+        path = _draw_pet(os.path.join(self.tmpdir, 'small.png'), 30, 30)
+        full, fast = self._both(path)
+        self.assertEqual(fast.size(), full.size())
+
+    def test_missing_file_returns_null(self):
+        self.assertTrue(transparent_pixmap(os.path.join(self.tmpdir, 'nope.png'), target_size=60).isNull())
+
+    def test_benchmark_large_input(self):
+        lines = []
+        for ext in ('png', 'jpg'):
+            path = _draw_pet(os.path.join(self.tmpdir, f'big.{ext}'), 4000, 3000)
+            start = time.perf_counter()
+            transparent_pixmap(path).scaled(60, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            full_t = time.perf_counter() - start
+            start = time.perf_counter()
+            transparent_pixmap(path, target_size=60)
+            fast_t = time.perf_counter() - start
+            lines.append(f"{ext} 4000x3000: full {full_t * 1000:.0f}ms, "
+                         f"target_size {fast_t * 1000:.0f}ms ({full_t / fast_t:.1f}x)")
+            self.assertLess(fast_t, full_t)
+        print("\ntransparent_pixmap " + "; ".join(lines))
+
+
+class TestPixmapCache(unittest.TestCase):
+    """按 (路径, mtime, 大小, 目标尺寸, DPR) 缓存处理结果，带字节预算。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        pixmap_cache.clear()
+        self._hits, self._misses = pixmap_cache.hits, pixmap_cache.misses
+
+    def tearDown(self):
+        pixmap_cache.clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _counts(self):
+        return pixmap_cache.hits - self._hits, pixmap_cache.misses - self._misses
+
+    def test_repeat_request_hits(self):
+        path = _draw_pet(os.path.join(self.tmpdir, 'a.png'), 400, 300)
+        first = transparent_pixmap(path, target_size=60)
+        second = transparent_pixmap(path, target_size=60)
+        self.assertEqual(self._counts(), (1, 1))
+        self.assertEqual(first.cacheKey(), second.cacheKey())
+
+    def test_key_includes_target_and_dpr(self):
+        path = _draw_pet(os.path.join(self.tmpdir, 'a.png'), 400, 300)
+        transparent_pixmap(path, target_size=60)
+        transparent_pixmap(path, target_size=30)
+        hidpi = transparent_pixmap(path, target_size=60, device_pixel_ratio=2.0)
+        self.assertEqual(self._counts(), (0, 3))
+        self.assertEqual(hidpi.devicePixelRatio(), 2.0)
+        self.assertEqual(hidpi.width(), 120)
+
+    def test_modified_file_misses(self):
+        path = _draw_pet(os.path.join(self.tmpdir, 'a.png'), 400, 300)
+        transparent_pixmap(path, target_size=60)
+        _draw_pet(path, 200, 300)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertEqual(transparent_pixmap(path, target_size=60).height(), 60)
+        self.assertEqual(self._counts(), (0, 2))
+
+    def test_icons_share_cache(self):
+        path = _draw_pet(os.path.join(self.tmpdir, 'icon.png'), 64, 64)
+        transparent_icon(path)
+        transparent_icon(path)
+        self.assertEqual(self._counts(), (1, 1))
+
+    def test_missing_file_not_cached(self):
+        transparent_pixmap(os.path.join(self.tmpdir, 'nope.png'), target_size=60)
+        self.assertEqual(len(pixmap_cache), 0)
+
+    def test_byte_budget_evicts_lru(self):
+        cache = PixmapCache(max_bytes=3 * 10 * 10 * 4)
+        for name in 'abc':
+            pixmap = QPixmap(10, 10)
+            cache.put(name, pixmap)
+        cache.get('a')              # a 变成最近使用
+        cache.put('d', QPixmap(10, 10))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(len(cache), 3)
+        self.assertLessEqual(cache.current_bytes, cache.max_bytes)
+        cache.put('huge', QPixmap(100, 100))
+        self.assertIsNone(cache.get('huge'))
+        self.assertEqual(cache.stats()['entries'], 3)
+
+
+def _remove_background_float(arr):
+    """旧的浮点实现（每个通道一份 float32 拷贝），作为对照。"""
+    arr = arr.copy()
+    r = arr[..., 0].astype(np.float32)
+    g = arr[..., 1].astype(np.float32)
+    b = arr[..., 2].astype(np.float32)
+    dist = np.sqrt((255.0 - r) ** 2 + (255.0 - g) ** 2 + (255.0 - b) ** 2)
+    alpha_factor = np.clip((dist - TRANSPARENT_DIST) / (OPAQUE_DIST - TRANSPARENT_DIST), 0.0, 1.0)
+    is_background = _flood_fill_background(dist < OPAQUE_DIST)
+    orig_alpha = arr[..., 3].astype(np.float32)
+    arr[..., 3] = np.where(is_background, (orig_alpha * alpha_factor).astype(np.uint8), arr[..., 3])
+    return arr
+
+
+def _sample_rgba(h, w, seed):
+    """白底 + 渐变过渡的彩色块 + 随机 alpha，覆盖整个阈值区间。"""
+    rng = np.random.default_rng(seed)
+    arr = np.full((h, w, 4), 255, dtype=np.uint8)
+    yy, xx = np.mgrid[:h, :w]
+    r = np.hypot(yy - h / 2, xx - w / 2) / (min(h, w) / 2)
+    shade = np.clip((1.2 - r) * 255, 0, 255).astype(np.uint8)
+    arr[..., 0] = 255 - shade
+    arr[..., 1] = 255 - shade // 2
+    arr[..., 2] = 255 - shade // 3
+    noise = rng.random((h, w)) < 0.05
+    arr[noise, :3] = rng.integers(0, 256, size=(int(noise.sum()), 3), dtype=np.uint8)
+    arr[..., 3] = rng.integers(0, 256, size=(h, w), dtype=np.uint8)
+    return arr
+
+
+class TestIntegerKernel(unittest.TestCase):
+    """整数原地核与旧浮点实现逐像素最多差 1 个 alpha 级，RGB 不变。"""
+
+    def test_matches_float_kernel(self):
+        for h, w, seed in ((1, 1, 0), (7, 13, 1), (64, 48, 2), (300, 200, 3)):
+            arr = _sample_rgba(h, w, seed)
+            expected = _remove_background_float(arr)
+            result = remove_white_background(arr.copy())
+            np.testing.assert_array_equal(result[..., :3], expected[..., :3])
+            diff = np.abs(result[..., 3].astype(int) - expected[..., 3].astype(int))
+            self.assertLessEqual(int(diff.max()), 1, (h, w))
+
+    def test_all_squared_distances(self):
+        # 把每一种 d2 都覆盖到：一行像素，左端为白色以保证全部与边缘连通
+        values = np.arange(256, dtype=np.uint8)
+        grid = np.stack(np.meshgrid(values, values, indexing='ij'), -1).reshape(-1, 2)
+        arr = np.empty((1, grid.shape[0], 4), dtype=np.uint8)
+        arr[0, :, 0] = grid[:, 0]
+        arr[0, :, 1] = grid[:, 1]
+        arr[0, :, 2] = 255
+        arr[0, :, 3] = 255
+        diff = np.abs(remove_white_background(arr.copy())[..., 3].astype(int)
+                      - _remove_background_float(arr)[..., 3].astype(int))
+        self.assertLessEqual(int(diff.max()), 1)
+
+    def test_out_reuse_leaves_input_untouched(self):
+        arr = _sample_rgba(40, 30, 4)
+        original = arr.copy()
+        out = np.empty_like(arr)
+        first = remove_white_background(arr, out=out)
+        self.assertIs(first, out)
+        np.testing.assert_array_equal(arr, original)
+        other = _sample_rgba(40, 30, 5)
+        remove_white_background(other, out=out)
+        np.testing.assert_array_equal(out, remove_white_background(other.copy()))
+
+    def test_peak_memory(self):
+        h, w = 1000, 1000
+        arr = _sample_rgba(h, w, 6)
+        remove_white_background(arr.copy())   # 预热查表和线程缓冲
+
+        def peak(fn):
+            work = arr.copy()
+            tracemalloc.start()
+            try:
+                fn(work)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        float_peak = peak(_remove_background_float)
+        int_peak = peak(remove_white_background)
+        print(f"\nbackground removal {w}x{h} peak temporaries: float {float_peak / (h * w):.1f} B/px, "
+              f"integer in-place {int_peak / (h * w):.1f} B/px")
+        self.assertLess(int_peak, float_peak / 2)
+
+
+class TestRgbaView(unittest.TestCase):
+    """QImage <-> numpy 零拷贝桥：行跨度 / 填充 / 奇数宽度 / 生命周期。"""
+
+    def _pattern(self, w, h, fmt):
+        image = QImage(w, h, fmt)
+        for y in range(h):
+            for x in range(w):
+                image.setPixelColor(x, y, QColor((x * 37) % 256, (y * 59) % 256, (x + y) % 256))
+        return image
+
+    def _assert_matches(self, image, view):
+        h, w = view.shape[:2]
+        self.assertEqual((w, h), (image.width(), image.height()))
+        for y in range(h):
+            for x in range(w):
+                c = image.pixelColor(x, y)
+                self.assertEqual(tuple(view[y, x]), (c.red(), c.green(), c.blue(), c.alpha()), (x, y))
+
+    def test_odd_widths_with_padded_source_rows(self):
+        # RGB888 每行 3w 字节，按 4 字节对齐后行尾有填充
+        for w in (1, 3, 5, 7, 33):
+            source = self._pattern(w, 4, QImage.Format_RGB888)
+            if w % 4:
+                self.assertGreater(source.bytesPerLine(), w * 3)
+            image, view = rgba_view(source)
+            self.assertEqual(view.shape, (4, w, 4))
+            self._assert_matches(source, view)
+
+    def test_external_buffer_with_row_padding(self):
+        w, h, stride = 5, 3, 5 * 4 + 12
+        data = bytearray(stride * h)
+        for y in range(h):
+            for x in range(w):
+                data[y * stride + x * 4:y * stride + x * 4 + 4] = bytes((x * 50, y * 80, 7, 255))
+            data[y * stride + w * 4:(y + 1) * stride] = b'\xee' * 12   # 填充字节
+        source = QImage(bytes(data), w, h, stride, QImage.Format_RGBA8888)
+        image, view = rgba_view(source)
+        self.assertEqual(view.strides[0], image.bytesPerLine())
+        self.assertEqual(tuple(view[2, 4]), (200, 160, 7, 255))
+        self.assertNotIn(0xee, view[..., 2].ravel().tolist())
+
+    def test_view_is_zero_copy_and_writable(self):
+        source = self._pattern(7, 3, QImage.Format_RGBA8888)
+        image, view = rgba_view(source)
+        self.assertEqual(view.__array_interface__['data'][0], int(image.constBits()))
+        view[1, 2] = (1, 2, 3, 4)
+        self.assertEqual(image.pixelColor(2, 1), QColor(1, 2, 3, 4))
+        # 原图与 image 不共享像素（bits() 触发了 detach）
+        self.assertNotEqual(source.pixelColor(2, 1), QColor(1, 2, 3, 4))
+        self.assertIs(QPixmap.fromImage(image).isNull(), False)
+
+    def test_view_keeps_image_alive(self):
+        _, view = rgba_view(self._pattern(9, 5, QImage.Format_ARGB32))
+        gc.collect()
+        QImage(9, 5, QImage.Format_RGBA8888).fill(0)   # 若内存已释放，这里可能复用
+        self.assertEqual(tuple(view[4, 8][:3]), ((8 * 37) % 256, (4 * 59) % 256, 12))
+
+    def test_null_image(self):
+        image, view = rgba_view(QImage())
+        self.assertTrue(image.isNull())
+        self.assertEqual(view.shape, (0, 0, 4))
+
+
+_SVG = """<?xml version="1.0" encoding="UTF-8"?>
+<svg width="24" height="12" viewBox="0 0 24 12" xmlns="http://www.w3.org/2000/svg">
+  <rect x="0" y="0" width="12" height="12" fill="#4CAF50"/>
+  <rect x="3" y="3" width="6" height="6" fill="white"/>
+</svg>
+"""
+
+
+class TestSvgRasterizer(unittest.TestCase):
+    """SVG 宠物图：按 (文件, 尺寸, DPR) 渲染一次，之后复用缓存，不重新解析。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.svg = os.path.join(self.tmpdir, 'pet.svg')
+        with open(self.svg, 'w', encoding='utf-8') as f:
+            f.write(_SVG)
+        pixmap_cache.clear()
+
+    def tearDown(self):
+        pixmap_cache.clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _count_parses(self):
+        from PyQt5 import QtSvg
+        return mock.patch.object(QtSvg, 'QSvgRenderer', wraps=QtSvg.QSvgRenderer)
+
+    def test_renders_at_physical_size_keeping_aspect(self):
+        image = rasterize_svg(self.svg, (60, 60), 2.0)
+        self.assertEqual((image.width(), image.height()), (120, 60))
+        self.assertEqual(image.devicePixelRatio(), 2.0)
+        natural = rasterize_svg(self.svg)
+        self.assertEqual((natural.width(), natural.height()), (24, 12))
+
+    def test_transparent_background_and_white_kept(self):
+        image = rasterize_svg(self.svg, (60, 60))
+        self.assertEqual(image.pixelColor(45, 15).alpha(), 0)          # 画布空白处透明
+        self.assertEqual(image.pixelColor(15, 15), QColor(255, 255, 255))  # 图里的白色保留
+        self.assertEqual(image.pixelColor(2, 2).green(), 175)
+
+    def test_invalid_svg_returns_null(self):
+        broken = os.path.join(self.tmpdir, 'broken.svg')
+        with open(broken, 'w') as f:
+            f.write('<svg')
+        self.assertTrue(rasterize_svg(broken, (60, 60)).isNull())
+        self.assertTrue(transparent_pixmap(broken, target_size=60).isNull())
+
+    def test_rerolls_and_dpr_changes_reuse_cache(self):
+        with self._count_parses() as renderer:
+            for _ in range(3):
+                for dpr in (1.0, 1.5, 2.0):
+                    pixmap = transparent_pixmap(self.svg, target_size=60, device_pixel_ratio=dpr)
+                    self.assertEqual(pixmap.width(), int(60 * dpr))
+        self.assertEqual(renderer.call_count, 3)   # 每个 DPR 只解析一次
+
+    def test_no_background_removal(self):
+        with mock.patch.object(image_module, '_remove_background',
+                               side_effect=AssertionError('svg should not be processed')):
+            self.assertFalse(transparent_pixmap(self.svg, target_size=60).isNull())
+
+    def test_benchmark_first_vs_cached(self):
+        pet = os.path.join(PROJECT_ROOT, 'images', 'timers', 'play2.svg')
+        start = time.perf_counter()
+        transparent_pixmap(pet, target_size=60, device_pixel_ratio=2.0)
+        first_t = time.perf_counter() - start
+        rounds = 200
+        start = time.perf_counter()
+        for _ in range(rounds):
+            transparent_pixmap(pet, target_size=60, device_pixel_ratio=2.0)
+        cached_t = (time.perf_counter() - start) / rounds
+        print(f"\nsvg 60x60@2x: first render {first_t * 1000:.2f}ms, "
+              f"cached {cached_t * 1e6:.0f}us ({first_t / cached_t:.0f}x)")
+        self.assertLess(cached_t, first_t)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QImage
+from PyQt5.QtWidgets import QApplication
+
+from app.utils import image as image_module
+from app.utils.image import pixmap_cache, transparent_pixmap
+from app.utils.image_cache import DiskImageCache
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _make_png(path, w=80, h=60):
+    image = QImage(w, h, QImage.Format_RGB32)
+    image.fill(Qt.white)
+    for y in range(h // 4, h * 3 // 4):
+        for x in range(w // 4, w * 3 // 4):
+            image.setPixelColor(x, y, QColor(200, 40, 40))
+    image.save(path)
+    return path
+
+
+class TestDiskImageCache(unittest.TestCase):
+    """RGBA 磁盘缓存：往返、损坏容错、按大小 LRU 淘汰。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmpdir, 'cache')
+        self.cache = DiskImageCache(self.cache_dir)
+        self.src = _make_png(os.path.join(self.tmpdir, 'pet.png'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _image(self, w=20, h=10):
+        image = QImage(w, h, QImage.Format_RGBA8888)
+        image.fill(QColor(10, 20, 30, 128))
+        return image
+
+    def test_round_trip(self):
+        key = self.cache.make_key(self.src, ('v1', (60, 60)))
+        self.assertIsNone(self.cache.load(key))
+        self.cache.store(key, self._image())
+        loaded = self.cache.load(key)
+        self.assertEqual((loaded.width(), loaded.height()), (20, 10))
+        self.assertEqual(loaded.pixelColor(3, 3), QColor(10, 20, 30, 128))
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "corrupt": 0})
+
+    def test_key_depends_on_content_and_params(self):
+        key = self.cache.make_key(self.src, ('v1', (60, 60)))
+        self.assertNotEqual(key, self.cache.make_key(self.src, ('v2', (60, 60))))
+        self.assertNotEqual(key, self.cache.make_key(self.src, ('v1', (30, 30))))
+        copy = shutil.copy(self.src, os.path.join(self.tmpdir, 'copy.png'))
+        self.assertEqual(key, self.cache.make_key(copy, ('v1', (60, 60))))
+        _make_png(self.src, 81, 60)
+        self.assertNotEqual(key, self.cache.make_key(self.src, ('v1', (60, 60))))
+        self.assertIsNone(self.cache.make_key(os.path.join(self.tmpdir, 'nope.png'), 'v1'))
+
+    def test_corrupt_entries_are_discarded(self):
+        for damage in ('truncate', 'flip', 'garbage'):
+            key = self.cache.make_key(self.src, damage)
+            self.cache.store(key, self._image())
+            path = self.cache._entry_path(key)
+            with open(path, 'rb') as f:
+                blob = bytearray(f.read())
+            if damage == 'truncate':
+                blob = blob[:len(blob) // 2]
+            elif damage == 'flip':
+                blob[-1] ^= 0xFF
+            else:
+                blob = bytearray(b'not an image')
+            with open(path, 'wb') as f:
+                f.write(blob)
+            self.assertIsNone(self.cache.load(key), damage)
+            self.assertFalse(os.path.exists(path), damage)
+        self.assertEqual(self.cache.corrupt, 3)
+
+    def test_size_cap_evicts_least_recently_used(self):
+        entry_size = 20 * 10 * 4 + 20
+        self.cache.max_bytes = 3 * entry_size
+        keys = [self.cache.make_key(self.src, i) for i in range(4)]
+        now = time.time()
+        for i, key in enumerate(keys[:3]):
+            self.cache.store(key, self._image())
+            os.utime(self.cache._entry_path(key), (now - 100 + i, now - 100 + i))
+        self.assertIsNotNone(self.cache.load(keys[0]))   # 0 变成最近使用
+        self.cache.store(keys[3], self._image())
+        self.assertFalse(os.path.exists(self.cache._entry_path(keys[1])))
+        for key in (keys[0], keys[2], keys[3]):
+            self.assertTrue(os.path.exists(self.cache._entry_path(key)))
+        self.assertLessEqual(self.cache.total_bytes(), self.cache.max_bytes)
+
+    def test_transparent_pixmap_uses_disk_cache(self):
+        with mock.patch.object(image_module, 'disk_image_cache', self.cache):
+            pixmap_cache.clear()
+            first = transparent_pixmap(self.src, target_size=40)
+            pixmap_cache.clear()
+            second = transparent_pixmap(self.src, target_size=40)
+            pixmap_cache.clear()
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(first.toImage().convertToFormat(QImage.Format_RGBA8888),
+                         second.toImage().convertToFormat(QImage.Format_RGBA8888))
+        self.assertEqual(second.toImage().pixelColor(0, 0).alpha(), 0)
+
+
+_WARM_PROBE = """
+import sys
+from PyQt5.QtWidgets import QApplication
+app = QApplication([])
+from app.utils import image
+from app.utils.image_cache import DiskImageCache
+image.disk_image_cache = DiskImageCache(sys.argv[1])
+pixmap = image.transparent_pixmap(sys.argv[2], target_size=40)
+print("null=%s hits=%d numpy=%s" % (pixmap.isNull(), image.disk_image_cache.hits,
+                                    "numpy" in sys.modules))
+"""
+
+
+class TestWarmStartWithoutNumpy(unittest.TestCase):
+    """第二次启动命中磁盘缓存，整个进程都不导入 numpy。"""
+
+    def test_warm_start(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            src = _make_png(os.path.join(tmpdir, 'pet.png'))
+            cache_dir = os.path.join(tmpdir, 'cache')
+            env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+            outputs = []
+            for _ in range(2):
+                proc = subprocess.run(
+                    [sys.executable, '-c', _WARM_PROBE, cache_dir, src],
+                    cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120)
+                self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+                outputs.append(proc.stdout.strip().splitlines()[-1])
+            self.assertEqual(outputs[0], "null=False hits=0 numpy=True")
+            self.assertEqual(outputs[1], "null=False hits=1 numpy=False")
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
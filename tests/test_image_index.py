@@ -0,0 +1,125 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from PyQt5.QtWidgets import QApplication
+
+from app.utils.image_index import ImageDirectoryIndex
+
+
+def _touch(path, data=b'x'):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+class TestImageDirectoryIndex(unittest.TestCase):
+    """图片目录索引：递归 / SVG / 只在目录变化时重新扫描。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        _touch(os.path.join(self.root, 'a.png'), b'png!')
+        _touch(os.path.join(self.root, 'B.JPG'))
+        _touch(os.path.join(self.root, 'clock.svg'))
+        _touch(os.path.join(self.root, 'notes.txt'))
+        _touch(os.path.join(self.root, 'sub', 'deep', 'c.jpeg'))
+        _touch(os.path.join(self.root, '.hidden', 'd.png'))
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _index(self, **kwargs):
+        kwargs.setdefault('watch', False)
+        return ImageDirectoryIndex(self.root, **kwargs)
+
+    def test_recursive_scan_with_svg(self):
+        index = self._index()
+        names = sorted(e.name for e in index.entries)
+        self.assertEqual(names, ['B.JPG', 'a.png', 'c.jpeg', 'clock.svg'])
+        formats = {e.name: e.format for e in index.entries}
+        self.assertEqual(formats['clock.svg'], 'svg')
+        self.assertEqual(formats['B.JPG'], 'jpg')
+        entry = next(e for e in index.entries if e.name == 'a.png')
+        self.assertEqual(entry.size, 4)
+        self.assertEqual(entry.path, os.path.join(self.root, 'a.png'))
+
+    def test_non_recursive(self):
+        index = self._index(recursive=False)
+        self.assertEqual(len(index), 3)
+
+    def test_choice_does_not_touch_filesystem_when_fresh(self):
+        index = self._index()
+        index.choice()
+        with mock.patch('os.scandir', side_effect=AssertionError('scandir')), \
+                mock.patch('os.stat', side_effect=AssertionError('stat')):
+            for _ in range(100):
+                self.assertIsNotNone(index.choice(random.Random(1)))
+        self.assertEqual(index.scan_count, 1)
+
+    def test_discard_until_rescan(self):
+        index = self._index()
+        self.assertEqual(len(index), 4)
+        bad = os.path.join(self.root, 'a.png')
+        self.assertTrue(index.discard(bad))
+        self.assertFalse(index.discard(bad))
+        for _ in range(50):
+            self.assertNotEqual(index.choice().path, bad)
+        index.invalidate()
+        self.assertIn(bad, [e.path for e in index.entries])
+
+    def test_choice_never_stats_without_change_notice(self):
+        """兜底检查在定时器上，取图路径无论隔多久都不碰文件系统。"""
+        index = self._index()
+        index.choice()
+        with mock.patch('os.scandir', side_effect=AssertionError('scandir')), \
+                mock.patch('os.stat', side_effect=AssertionError('stat')):
+            self.assertIsNotNone(index.choice())
+        self.assertEqual(index._recheck_timer.interval(), 30000)
+        self.assertTrue(index._recheck_timer.isActive())
+
+    def test_directory_mtime_change_triggers_rescan(self):
+        index = self._index()
+        self.assertEqual(len(index), 4)
+        _touch(os.path.join(self.root, 'sub', 'new.png'))
+        sub = os.path.join(self.root, 'sub')
+        st = os.stat(sub)
+        os.utime(sub, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertEqual(len(index), 4)          # 兜底检查还没跑
+        index.recheck()
+        self.assertEqual(index.scan_count, 1)    # 只标记，下次取图才扫描
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.scan_count, 2)
+        index.recheck()
+        self.assertEqual(len(index), 5)          # 目录没变：只 stat，不重新扫描
+        self.assertEqual(index.scan_count, 2)
+
+    def test_missing_directory(self):
+        shutil.rmtree(self.root)
+        index = self._index()
+        self.assertIsNone(index.choice())
+        _touch(os.path.join(self.root, 'late.png'))
+        index.recheck()
+        self.assertEqual(index.choice().name, 'late.png')
+
+    def test_watcher_marks_dirty(self):
+        index = self._index(watch=True, recheck_interval=3600)
+        self.assertEqual(len(index), 4)
+        self.assertIn(os.path.join(self.root, 'sub', 'deep'), index._watcher.directories())
+        _touch(os.path.join(self.root, 'sub', 'deep', 'e.png'))
+        deadline = time.monotonic() + 2.0
+        while index._dirty is False and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+        self.assertEqual(len(index), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
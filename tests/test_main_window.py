@@ -0,0 +1,110 @@
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from PyQt5.QtWidgets import QApplication
+
+from app.config.manager import ConfigManager
+from app.services import keyboard_service, time_service, update_service
+
+
+class TestSettingHotReloadReminders(unittest.TestCase):
+    """配置热加载重排下班 / 日志提醒：已过点或今天已弹过的提醒不会被改配置再次触发。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        import app.main_window  # noqa: F401  需要 QApplication 之后再导入
+        cls.mw_module = sys.modules["app.main_window"]
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "settings.json")
+        # 弹性模式：截止时间只取决于 _start_time，与当前钟点无关
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"flexible_mode": True, "auto_check_update": False}, f)
+        self.config = ConfigManager(settings_file=self.path, save_delay=0)
+
+        dialog = self.mw_module.ReminderDialog
+        patchers = [
+            patch.object(self.mw_module, "config_manager", self.config),
+            # time_service 按工时计算截止时间，同样要读临时配置
+            patch.object(sys.modules["app.services.time_service"], "config_manager", self.config),
+            patch.object(time_service, "is_first_start_of_day", return_value=False),
+            patch.object(keyboard_service, "start_listening"),
+            patch.object(update_service, "check_for_updates", return_value=(False, None, None)),
+            patch.object(dialog, "show_checkout"),
+            patch.object(dialog, "show_job_record"),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+        self.show_checkout = dialog.show_checkout
+        self.show_job_record = dialog.show_job_record
+
+        self.window = self.mw_module.MainWindow(self.app)
+        self.app.processEvents()
+
+    def tearDown(self):
+        self.window._settings_watch_timer.stop()
+        self.window._pet_loader.shutdown()
+        self.window.deleteLater()
+        self.app.processEvents()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write_external(self, **changes):
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for key, value in changes.items():
+            if key.startswith("reminders."):
+                data.setdefault("reminders", {})[key.split(".", 1)[1]] = value
+            else:
+                data[key] = value
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.config.reload_if_changed()
+        self.app.processEvents()
+
+    def _reminders(self):
+        return self.window._reminders
+
+    def test_future_deadline_is_rescheduled(self):
+        self._write_external(work_hours=9.0)
+        remaining = self._reminders().remaining(self.mw_module.REMINDER_CHECKOUT)
+        # 弹性模式会把开始时间往前取整（最多约 2.5 分钟）
+        self.assertGreater(remaining, 9 * 3600 - 180)
+        self.show_checkout.assert_not_called()
+
+    def test_passed_deadline_does_not_fire_on_edit(self):
+        self.window._start_time = datetime.datetime.now() - datetime.timedelta(hours=12)
+        self._write_external(work_hours=9.0)
+        self.show_checkout.assert_not_called()
+        self.show_job_record.assert_not_called()
+        self.assertNotIn(self.mw_module.REMINDER_CHECKOUT, self._reminders())
+        self.assertNotIn(self.mw_module.REMINDER_JOB_RECORD, self._reminders())
+
+    def test_toggling_checkout_after_end_of_day_does_not_fire(self):
+        self.window._start_time = datetime.datetime.now() - datetime.timedelta(hours=12)
+        self._write_external(**{"reminders.checkout_reminder": False})
+        self._write_external(**{"reminders.checkout_reminder": True})
+        self.show_checkout.assert_not_called()
+
+    def test_fired_reminder_is_not_rescheduled_today(self):
+        self.window.show_checkout_reminder()
+        self.assertEqual(self.show_checkout.call_count, 1)
+        # 截止时间被改到将来：今天已经弹过，不再安排
+        self._write_external(work_hours=9.0)
+        self.assertNotIn(self.mw_module.REMINDER_CHECKOUT, self._reminders())
+        self.assertIn(self.mw_module.REMINDER_JOB_RECORD, self._reminders())
+        self.assertEqual(self.show_checkout.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
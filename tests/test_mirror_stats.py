@@ -0,0 +1,170 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from PyQt5.QtWidgets import QApplication
+
+from app.utils import mirror_stats
+from app.utils.mirror_stats import (
+    BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS, MirrorScoreboard,
+)
+
+
+class _Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestMirrorScoreboard(unittest.TestCase):
+    """镜像记分板：排序、退避、持久化、表格输出。"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "mirror_stats.json")
+        self.clock = _Clock()
+        self.board = MirrorScoreboard(self.path, clock=self.clock)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_no_data_keeps_original_order(self):
+        keys = ["direct", "a", "b", "c"]
+        self.assertEqual(self.board.rank(keys), keys)
+        self.assertFalse(os.path.exists(self.path))   # 只读不写
+
+    def test_fast_mirrors_first_then_unknown_then_backoff(self):
+        self.board.record_success("b", ttfb=0.2)
+        self.board.record_success("c", ttfb=1.5)
+        self.board.record_failure("direct", "HTTP 502")
+        self.assertEqual(self.board.rank(["direct", "a", "b", "c", "d"]),
+                         ["b", "c", "a", "d", "direct"])
+
+    def test_throughput_counts_towards_cost(self):
+        self.board.record_success("a", ttfb=0.1)
+        self.board.record_throughput("a", 100 * 1024, 1.0)       # 100KB/s
+        self.board.record_success("b", ttfb=0.4)
+        self.board.record_throughput("b", 10 * 1024 * 1024, 1.0)  # 10MB/s
+        self.assertEqual(self.board.rank(["a", "b"]), ["b", "a"])
+
+    def test_occasional_failure_is_smoothed(self):
+        for _ in range(5):
+            self.board.record_success("a", ttfb=0.2)
+        self.board.record_failure("a", "timeout")
+        self.clock.now += BACKOFF_BASE_SECONDS + 1
+        self.board.record_success("b", ttfb=0.3)
+        # 5/6 成功、首字节更快的 a 仍排在只成功过一次的 b 前面
+        self.assertEqual(self.board.rank(["b", "a"]), ["a", "b"])
+
+    def test_backoff_doubles_and_caps(self):
+        start = self.clock.now
+        expected = []
+        for _ in range(12):
+            self.board.record_failure("a", "refused")
+            expected.append(self.board.get("a")["backoff_until"] - start)
+        self.assertEqual(expected[:3], [BACKOFF_BASE_SECONDS, 2 * BACKOFF_BASE_SECONDS,
+                                        4 * BACKOFF_BASE_SECONDS])
+        self.assertEqual(expected[-1], BACKOFF_MAX_SECONDS)
+
+    def test_backoff_expires_and_success_resets(self):
+        self.board.record_failure("a", "refused")
+        self.assertTrue(self.board.in_backoff("a"))
+        self.clock.now += BACKOFF_BASE_SECONDS + 1
+        self.assertFalse(self.board.in_backoff("a"))
+        # 退避过期但从没成功过：与没有记录的镜像同等对待
+        self.assertEqual(self.board.rank(["b", "a"]), ["b", "a"])
+
+        self.board.record_failure("a", "refused")
+        self.board.record_success("a", ttfb=0.5)
+        entry = self.board.get("a")
+        self.assertEqual(entry["consecutive_failures"], 0)
+        self.assertIsNone(entry["backoff_until"])
+        self.assertEqual(entry["last_error"], "refused")
+
+    def test_save_and_reload(self):
+        self.board.record_success("a", ttfb=0.25)
+        self.board.record_throughput("a", 2048, 2.0)
+        self.board.record_failure("b", "HTTP 404 " + "x" * 500)
+        self.board.save()
+
+        reloaded = MirrorScoreboard(self.path, clock=self.clock)
+        self.assertEqual(reloaded.get("a")["ttfb"], 0.25)
+        self.assertEqual(reloaded.get("a")["throughput"], 1024)
+        self.assertLessEqual(len(reloaded.get("b")["last_error"]), 200)
+        self.assertEqual(reloaded.rank(["b", "a"]), ["a", "b"])
+        self.assertEqual(os.listdir(self.tmpdir), ["mirror_stats.json"])
+
+    def test_unreadable_or_old_file_starts_empty(self):
+        with open(self.path, "w") as f:
+            f.write("{broken")
+        self.assertIsNone(MirrorScoreboard(self.path).get("a"))
+        with open(self.path, "w") as f:
+            json.dump({"version": 999, "mirrors": {"a": {}}}, f)
+        self.assertIsNone(MirrorScoreboard(self.path).get("a"))
+
+    def test_reset(self):
+        self.board.record_failure("a", "refused")
+        self.board.save()
+        self.board.reset()
+        self.assertIsNone(MirrorScoreboard(self.path).get("a"))
+
+    def test_format_table(self):
+        self.board.record_success("https://fast.example/", ttfb=0.12)
+        self.board.record_throughput("https://fast.example/", 3 * 1024 * 1024, 1.0)
+        self.board.record_failure("direct", "HTTP 502")
+        lines = self.board.format_table(["direct", "https://fast.example/", "unknown"]).splitlines()
+        self.assertIn("mirror", lines[0])
+        rows = lines[2:]
+        self.assertTrue(rows[0].startswith("https://fast.example/"))
+        self.assertIn("120ms", rows[0])
+        self.assertIn("3.0MB/s", rows[0])
+        self.assertTrue(rows[1].startswith("unknown"))
+        self.assertIn("no data", rows[1])
+        self.assertTrue(rows[2].startswith("direct"))
+        self.assertIn("backoff 5min", rows[2])
+        self.assertIn("HTTP 502", rows[2])
+
+
+class TestMirrorStatusDialog(unittest.TestCase):
+    """托盘诊断对话框显示记分板，重置会清空记录。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.board = MirrorScoreboard(os.path.join(self.tmpdir, "mirror_stats.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_shows_and_resets_table(self):
+        from app.ui.dialogs import mirror_status
+        from app.ui.dialogs.mirror_status import MirrorStatusDialog
+
+        self.board.record_failure("direct", "HTTP 502")
+        dialog = MirrorStatusDialog(mirrors=["direct", "https://a.example/"],
+                                    scoreboard=self.board)
+        self.assertIn("HTTP 502", dialog.table_text())
+        self.assertIn("https://a.example/", dialog.table_text())
+
+        with mock.patch.object(mirror_status.QMessageBox, "question",
+                               return_value=mirror_status.QMessageBox.Yes):
+            dialog._reset()
+        self.assertNotIn("HTTP 502", dialog.table_text())
+        self.assertIsNone(self.board.get("direct"))
+        dialog.close()
+
+    def test_module_instance_uses_settings_dir(self):
+        self.assertEqual(os.path.basename(mirror_stats.mirror_scoreboard.path),
+                         "mirror_stats.json")
+
+
+if __name__ == '__main__':
+    unittest.main()
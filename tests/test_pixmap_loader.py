@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QImage
+from PyQt5.QtWidgets import QApplication
+
+from app.ui import pixmap_loader
+from app.ui.pixmap_loader import AsyncPixmapLoader
+from app.utils import image as image_module
+from app.utils.image import pixmap_cache
+from app.utils.image_cache import DiskImageCache
+
+
+def _make_png(path, w=120, h=90):
+    image = QImage(w, h, QImage.Format_RGB32)
+    image.fill(Qt.white)
+    for y in range(h // 4, h * 3 // 4):
+        for x in range(w // 4, w * 3 // 4):
+            image.setPixelColor(x, y, QColor(40, 120, 40))
+    image.save(path)
+    return path
+
+
+class TestAsyncPixmapLoader(unittest.TestCase):
+    """线程池加载：结果经排队信号回到 GUI 线程，同槽位旧请求作废。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.disk_patch = mock.patch.object(
+            image_module, 'disk_image_cache', DiskImageCache(os.path.join(self.tmpdir, 'cache')))
+        self.disk_patch.start()
+        pixmap_cache.clear()
+        self.a = _make_png(os.path.join(self.tmpdir, 'a.png'))
+        self.b = _make_png(os.path.join(self.tmpdir, 'b.png'), 90, 120)
+        self.loader = AsyncPixmapLoader()
+        self.results = []
+        self.loader.ready.connect(
+            lambda slot, path, pixmap: self.results.append(
+                (slot, os.path.basename(path), pixmap.width(), pixmap.height(),
+                 threading.current_thread() is threading.main_thread())))
+        self.failures = []
+        self.loader.failed.connect(lambda slot, path: self.failures.append(os.path.basename(path)))
+
+    def tearDown(self):
+        self.loader.shutdown()
+        self.disk_patch.stop()
+        pixmap_cache.clear()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _wait(self, predicate, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while not predicate() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+        self.app.processEvents()
+
+    def test_delivers_on_gui_thread(self):
+        self.loader.request('pet', self.a, target_size=60)
+        self._wait(lambda: self.results)
+        self.assertEqual(self.results, [('pet', 'a.png', 60, 45, True)])
+        self.assertEqual(self.loader.pending_count, 0)
+
+    def test_newer_request_supersedes_older(self):
+        self.loader.request('pet', self.a, target_size=60)
+        self.loader.request('pet', self.b, target_size=60)
+        self._wait(lambda: self.results)
+        time.sleep(0.1)
+        self.app.processEvents()
+        self.assertEqual([r[1] for r in self.results], ['b.png'])
+        self.assertEqual(self.loader.stale_count, 1)
+
+    def test_cancel(self):
+        self.loader.request('pet', self.a, target_size=60)
+        self.assertTrue(self.loader.cancel('pet'))
+        self.assertFalse(self.loader.cancel('pet'))
+        self.loader._pool.waitForDone(2000)
+        self._wait(lambda: False, timeout=0.05)
+        self.assertEqual(self.results, [])
+
+    def test_request_does_not_block_gui_thread(self):
+        def slow(*args, **kwargs):
+            time.sleep(0.3)
+            return QImage(10, 10, QImage.Format_RGBA8888)
+        with mock.patch.object(pixmap_loader, 'transparent_image', slow):
+            start = time.perf_counter()
+            self.loader.request('pet', self.a, target_size=60)
+            elapsed = time.perf_counter() - start
+            self.assertLess(elapsed, 0.1)
+            self._wait(lambda: self.results)
+        self.assertEqual(len(self.results), 1)
+
+    def test_memory_cache_hit_is_delivered_async(self):
+        self.loader.request('pet', self.a, target_size=60)
+        self._wait(lambda: self.results)
+        hits = pixmap_cache.hits
+        self.loader.request('pet', self.a, target_size=60)
+        self.assertEqual(len(self.results), 1)   # 不在 request() 里同步回调
+        self._wait(lambda: len(self.results) == 2)
+        self.assertEqual(pixmap_cache.hits, hits + 1)
+
+    def test_missing_file_reports_failure(self):
+        self.loader.request('pet', os.path.join(self.tmpdir, 'nope.png'), target_size=60)
+        self._wait(lambda: self.failures)
+        self.assertEqual(self.failures, ['nope.png'])
+        self.assertEqual(self.results, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import datetime
+import time
+import unittest
+
+from PyQt5.QtWidgets import QApplication
+
+from app.ui.reminder_scheduler import ReminderScheduler
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestReminderScheduler(unittest.TestCase):
+    """最小堆提醒调度：按墙上时间触发，支持取消 / 改期 / 共用唤醒。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = ReminderScheduler(clock=self.clock)
+        self.fired = []
+
+    def _cb(self, name):
+        return lambda: self.fired.append(name)
+
+    def test_fires_in_deadline_order(self):
+        self.scheduler.add('b', 1020, self._cb('b'))
+        self.scheduler.add('a', 1010, self._cb('a'))
+        self.scheduler.add('c', 1030, self._cb('c'))
+        self.clock.now = 1025
+        self.scheduler.recheck()
+        self.assertEqual(self.fired, ['a', 'b'])
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertIn('c', self.scheduler)
+
+    def test_cancel_and_reschedule(self):
+        self.scheduler.add('a', 1010, self._cb('a'))
+        self.scheduler.add('b', 1010, self._cb('b'))
+        self.assertTrue(self.scheduler.cancel('a'))
+        self.assertFalse(self.scheduler.cancel('a'))
+        self.scheduler.reschedule('b', 1100)
+        self.clock.now = 1050
+        self.scheduler.recheck()
+        self.assertEqual(self.fired, [])
+        self.assertAlmostEqual(self.scheduler.remaining('b'), 50)
+        self.clock.now = 1100
+        self.scheduler.recheck()
+        self.assertEqual(self.fired, ['b'])
+        with self.assertRaises(KeyError):
+            self.scheduler.reschedule('b', 1200)
+
+    def test_add_replaces_existing_name(self):
+        self.scheduler.add('a', 1010, self._cb('old'))
+        self.scheduler.add('a', 1020, self._cb('new'))
+        self.clock.now = 1030
+        self.scheduler.recheck()
+        self.assertEqual(self.fired, ['new'])
+
+    def test_accepts_datetime_deadline(self):
+        deadline = datetime.datetime.fromtimestamp(1010)
+        self.scheduler.add('a', deadline, self._cb('a'))
+        self.assertAlmostEqual(self.scheduler.deadline('a'), 1010)
+
+    def test_wall_clock_jump_fires_overdue(self):
+        # 模拟休眠：墙上时间一下子跳过了多个截止点，醒来一次全部补发
+        for i in range(5):
+            self.scheduler.add(f'r{i}', 1000 + 60 * (i + 1), self._cb(i))
+        self.clock.now = 1000 + 3600
+        self.scheduler.recheck()
+        self.assertEqual(self.fired, [0, 1, 2, 3, 4])
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertFalse(self.scheduler._timer.isActive())
+
+    def test_sleep_is_capped(self):
+        self.scheduler.add('far', 1000 + 8 * 3600, self._cb('far'))
+        self.assertEqual(self.scheduler._timer.interval(), self.scheduler._max_sleep_ms)
+
+    def test_callback_may_reschedule_itself(self):
+        def again():
+            self.fired.append('tick')
+            if len(self.fired) < 3:
+                self.scheduler.add_after('tick', 10, again)
+        self.scheduler.add_after('tick', 10, again)
+        for _ in range(5):
+            self.clock.now += 10
+            self.scheduler.recheck()
+        self.assertEqual(self.fired, ['tick'] * 3)
+
+    def test_repeated_cancel_keeps_heap_bounded(self):
+        for i in range(1000):
+            self.scheduler.add('a', 2000 + i, self._cb('a'))
+        self.assertLess(len(self.scheduler._heap), 40)
+
+
+class TestReminderSchedulerTimer(unittest.TestCase):
+    """真实时钟：多个同时到期的提醒共用一次唤醒。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_shared_wakeup(self):
+        scheduler = ReminderScheduler()
+        fired = []
+        deadline = time.time() + 0.05
+        for name in ('a', 'b', 'c'):
+            scheduler.add(name, deadline, lambda n=name: fired.append(n))
+        end = time.monotonic() + 1.0
+        while len(fired) < 3 and time.monotonic() < end:
+            self.app.processEvents()
+            time.sleep(0.005)
+        self.assertEqual(sorted(fired), ['a', 'b', 'c'])
+        self.assertEqual(scheduler.wakeup_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,278 @@
+import datetime
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from app.utils import start_journal
+from app.utils.start_journal import StartTimeJournal, RECORD_SIZE, read_last_text_entry
+
+
+class TestStartTimeJournal(unittest.TestCase):
+    """启动时间日志：追加、读取最新、按日期查找、损坏容错、迁移。"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "start_time.journal")
+        self.journal = StartTimeJournal(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_empty_journal(self):
+        self.assertIsNone(self.journal.last())
+        self.assertIsNone(self.journal.find(datetime.date(2026, 7, 27)))
+        self.assertEqual(len(self.journal), 0)
+
+    def test_append_and_last(self):
+        t1 = datetime.datetime(2026, 7, 27, 9, 0, 1, 123456)
+        t2 = datetime.datetime(2026, 7, 28, 8, 59, 59, 1)
+        self.journal.append(t1)
+        self.journal.append(t2)
+        self.assertEqual(self.journal.last(), t2)
+        self.assertEqual(len(self.journal), 2)
+
+    def test_find_keeps_first_start_of_day(self):
+        first = datetime.datetime(2026, 7, 27, 9, 0, 0)
+        self.journal.append(first)
+        self.journal.append(datetime.datetime(2026, 7, 27, 13, 0, 0))
+        self.journal.append(datetime.datetime(2026, 7, 30, 9, 0, 0))
+        self.assertEqual(self.journal.find(datetime.date(2026, 7, 27)), first)
+        self.assertIsNone(self.journal.find(datetime.date(2026, 7, 28)))
+        self.assertIsNone(self.journal.find(datetime.date(2026, 7, 1)))
+
+    def test_truncated_tail_is_ignored(self):
+        """写到一半断电：末尾残缺字节被忽略，下次追加先对齐。"""
+        t1 = datetime.datetime(2026, 7, 27, 9, 0, 0)
+        self.journal.append(t1)
+        with open(self.path, "ab") as f:
+            f.write(b"\x01\x02\x03")
+        self.assertEqual(self.journal.last(), t1)
+        t2 = datetime.datetime(2026, 7, 28, 9, 0, 0)
+        self.journal.append(t2)
+        self.assertEqual(self.journal.last(), t2)
+        self.assertEqual(len(self.journal), 2)
+
+    def test_corrupt_last_record_falls_back(self):
+        t1 = datetime.datetime(2026, 7, 27, 9, 0, 0)
+        self.journal.append(t1)
+        with open(self.path, "ab") as f:
+            f.write(b"\xff" * RECORD_SIZE)
+        self.assertEqual(self.journal.last(), t1)
+
+    def test_find_without_index_entry_uses_tail(self):
+        """追加后、写索引前断电：当天记录仍能通过末尾记录找到。"""
+        t1 = datetime.datetime(2026, 7, 27, 9, 0, 0)
+        self.journal.append(t1)
+        os.remove(self.journal.index_path)
+        self.assertEqual(self.journal.find(t1.date()), t1)
+
+    def test_damaged_index_is_rebuilt(self):
+        t1 = datetime.datetime(2026, 7, 27, 9, 0, 0)
+        self.journal.append(t1)
+        with open(self.journal.index_path, "wb") as f:
+            f.write(b"garbage-header")
+        t2 = datetime.datetime(2026, 7, 29, 9, 0, 0)
+        self.journal.append(t2)
+        self.assertEqual(self.journal.find(t1.date()), t1)
+        self.assertEqual(self.journal.find(t2.date()), t2)
+
+    def test_lost_index_rebuilt_on_append(self):
+        """索引文件丢了：追加新记录时整体重建，更早的日期仍能查到。"""
+        t1 = datetime.datetime(2026, 7, 27, 9, 0, 0)
+        t2 = datetime.datetime(2026, 7, 28, 9, 0, 0)
+        self.journal.append(t1)
+        self.journal.append(t2)
+        os.remove(self.journal.index_path)
+        t3 = datetime.datetime(2026, 7, 30, 9, 0, 0)
+        self.journal.append(t3)
+        self.assertEqual(self.journal.find(t1.date()), t1)
+        self.assertEqual(self.journal.find(t2.date()), t2)
+        self.assertEqual(self.journal.find(t3.date()), t3)
+
+    def test_lost_index_rebuilt_on_find(self):
+        t1 = datetime.datetime(2026, 7, 27, 9, 0, 0)
+        t2 = datetime.datetime(2026, 7, 28, 9, 0, 0)
+        self.journal.append(t1)
+        self.journal.append(t2)
+        os.remove(self.journal.index_path)
+        self.assertEqual(self.journal.find(t1.date()), t1)
+        self.assertTrue(os.path.exists(self.journal.index_path))
+
+    def test_migrate_from_text(self):
+        text_path = os.path.join(self.tmp, "start_time.txt")
+        with open(text_path, "w") as f:
+            f.write("2026-07-27 09:00:00.000001\n")
+            f.write("not a date\n")
+            f.write("2026-07-28 09:30:00.500000\n")
+        self.assertEqual(self.journal.migrate_from_text(text_path), 2)
+        self.assertEqual(self.journal.last(), datetime.datetime(2026, 7, 28, 9, 30, 0, 500000))
+        self.assertEqual(self.journal.find(datetime.date(2026, 7, 27)),
+                         datetime.datetime(2026, 7, 27, 9, 0, 0, 1))
+        # 旧文件保留；日志已存在时不再重复迁移
+        self.assertTrue(os.path.exists(text_path))
+        self.assertEqual(self.journal.migrate_from_text(text_path), 0)
+
+    def test_migrate_missing_text_file(self):
+        self.assertEqual(self.journal.migrate_from_text(os.path.join(self.tmp, "nope.txt")), 0)
+        self.assertFalse(self.journal.exists())
+
+
+class TestStartTimeJournalScaling(unittest.TestCase):
+    """100 万条历史下读取最新 / 按日期查找的耗时应与 10 条历史相当。"""
+
+    HISTORY = 1000000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        base = datetime.datetime(1, 1, 1, 9, 0, 0, 123)
+        cls.small = StartTimeJournal(os.path.join(cls.tmp, "small.journal"))
+        cls.small.write_all(base + datetime.timedelta(days=i) for i in range(10))
+        cls.large = StartTimeJournal(os.path.join(cls.tmp, "large.journal"))
+        cls.large.write_all(base + datetime.timedelta(days=i) for i in range(cls.HISTORY))
+        cls.large_last = base + datetime.timedelta(days=cls.HISTORY - 1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
+    def _best_of(self, func, repeat=50):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_large_history_correct(self):
+        self.assertEqual(len(self.large), self.HISTORY)
+        self.assertEqual(self.large.last(), self.large_last)
+        probe = datetime.date(1000, 3, 1)
+        self.assertEqual(self.large.find(probe).date(), probe)
+
+    def test_read_is_constant_time(self):
+        probe = datetime.date(1, 1, 5)
+        small_last = self._best_of(self.small.last)
+        large_last = self._best_of(self.large.last)
+        small_find = self._best_of(lambda: self.small.find(probe))
+        large_find = self._best_of(lambda: self.large.find(probe))
+        # 线性实现在 100 万条上会慢几个数量级；这里留足抖动余量
+        self.assertLess(large_last, small_last * 5 + 0.001)
+        self.assertLess(large_find, small_find * 5 + 0.001)
+
+    def test_read_touches_bounded_bytes(self):
+        """读取最新记录只读文件头 + 一条记录，不随历史增长。"""
+        reads = []
+        real_open = open
+
+        class _Counting:
+            def __init__(self, f):
+                self._f = f
+
+            def read(self, n=-1):
+                data = self._f.read(n)
+                reads.append(len(data))
+                return data
+
+            def __getattr__(self, name):
+                return getattr(self._f, name)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self._f.close()
+
+        def counting_open(path, mode="r", *args, **kwargs):
+            return _Counting(real_open(path, mode, *args, **kwargs))
+
+        start_journal.open = counting_open
+        try:
+            self.assertEqual(self.large.last(), self.large_last)
+        finally:
+            del start_journal.open
+        self.assertLessEqual(sum(reads), 64)
+
+
+class TestReadLastTextEntry(unittest.TestCase):
+    """旧 start_time.txt 倒序读取：跳过坏行、块边界、读取上限。"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "start_time.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write(self, content):
+        with open(self.path, "wb") as f:
+            f.write(content)
+
+    def test_last_valid_line(self):
+        self._write(b"2026-07-26 08:00:00.000000\n2026-07-27 09:00:00.000000\n")
+        self.assertEqual(read_last_text_entry(self.path), datetime.datetime(2026, 7, 27, 9, 0))
+
+    def test_skips_truncated_and_garbage_tail(self):
+        self._write(b"2026-07-26 08:00:00.000000\n"
+                    b"2026-07-27 09:00:00.000000\n"
+                    b"\x00\x00garbage\n\n"
+                    b"2026-07-28 09")
+        self.assertEqual(read_last_text_entry(self.path), datetime.datetime(2026, 7, 27, 9, 0))
+
+    def test_line_split_across_blocks(self):
+        self._write(b"2026-07-26 08:00:00.000000\n2026-07-27 09:00:00.123456\n")
+        self.assertEqual(read_last_text_entry(self.path, block_size=5),
+                         datetime.datetime(2026, 7, 27, 9, 0, 0, 123456))
+
+    def test_empty_file(self):
+        self._write(b"")
+        self.assertIsNone(read_last_text_entry(self.path))
+
+    def test_gives_up_after_max_bytes(self):
+        self._write(b"2026-07-26 08:00:00.000000\n" + b"x" * 100 + b"\n")
+        self.assertIsNone(read_last_text_entry(self.path, block_size=16, max_bytes=64))
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            read_last_text_entry(self.path)
+
+
+class TestReadLastTextEntryBenchmark(unittest.TestCase):
+    """基准：10 MB 历史文件上倒序读取与 10 行文件耗时相当，读取字节数有上界。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        line = b"2026-07-27 09:00:00.000000\n"
+        cls.small = os.path.join(cls.tmp, "small.txt")
+        with open(cls.small, "wb") as f:
+            f.write(line * 10)
+        cls.large = os.path.join(cls.tmp, "large.txt")
+        with open(cls.large, "wb") as f:
+            f.write(line * (10 * 1024 * 1024 // len(line) + 1))
+            f.write(b"2026-07-28 09:00:00.000000\n")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
+    def _best_of(self, func, repeat=50):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_large_history(self):
+        self.assertGreater(os.path.getsize(self.large), 10 * 1024 * 1024)
+        self.assertEqual(read_last_text_entry(self.large), datetime.datetime(2026, 7, 28, 9, 0))
+        small = self._best_of(lambda: read_last_text_entry(self.small))
+        large = self._best_of(lambda: read_last_text_entry(self.large))
+        self.assertLess(large, small * 5 + 0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
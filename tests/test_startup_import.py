@@ -0,0 +1,79 @@
+"""冷启动导入预算：``python -X importtime`` 统计导入 app.main_window 的耗时。
+
+开机自启时机器最忙，导入阶段不应做文件 I/O、场景归一化，也不应拉起
+numpy / requests 这类重量级依赖（它们在真正用到时才导入）。
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 本项目自身模块（app.*）的导入自耗时总和上限（微秒）；PyQt5 等第三方不计入
+APP_IMPORT_BUDGET_US = 250 * 1000
+
+_PROBE = """
+import sys
+import app.main_window
+from app.config.manager import config_manager
+from app.ui import ascii_art
+print("config_initialized=%s" % config_manager.is_initialized)
+print("scenes_loaded=%s" % ("SCENES" in vars(ascii_art)))
+print("heavy=%s" % ",".join(m for m in ("numpy", "requests") if m in sys.modules))
+"""
+
+
+def _run_probe():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    if proc.returncode != 0:
+        raise AssertionError(f"import probe failed:\n{proc.stderr[-2000:]}")
+    return proc.stdout, proc.stderr
+
+
+def _parse_importtime(stderr):
+    """解析 importtime 输出，返回 {模块名: 自耗时微秒}。"""
+    self_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_times[parts[2].strip()] = int(parts[0])
+        except ValueError:
+            continue
+    return self_times
+
+
+class TestStartupImport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stdout, cls.stderr = _run_probe()
+        cls.self_times = _parse_importtime(cls.stderr)
+
+    def test_import_does_not_initialize_singletons(self):
+        self.assertIn("config_initialized=False", self.stdout)
+        self.assertIn("scenes_loaded=False", self.stdout)
+
+    def test_import_skips_heavy_dependencies(self):
+        self.assertIn("heavy=\n", self.stdout)
+
+    def test_app_import_within_budget(self):
+        app_modules = {name: us for name, us in self.self_times.items()
+                       if name == "app" or name.startswith("app.")}
+        self.assertIn("app.main_window", app_modules)
+        total = sum(app_modules.values())
+        slowest = sorted(app_modules.items(), key=lambda kv: -kv[1])[:5]
+        self.assertLess(total, APP_IMPORT_BUDGET_US,
+                        f"app.* import took {total / 1000:.1f}ms, slowest: {slowest}")
+
+
+if __name__ == '__main__':
+    unittest.main()
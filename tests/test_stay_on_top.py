@@ -0,0 +1,86 @@
+import unittest
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from app.ui.stay_on_top import StayOnTopGuardian
+
+FLAGS = Qt.FramelessWindowHint | Qt.Tool | Qt.WindowStaysOnTopHint
+
+
+class TestStayOnTopGuardian(unittest.TestCase):
+    """置顶守护：不重复重建原生窗口，隐藏后自动恢复，标志丢失才重设。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.window = QWidget()
+        self.window.setWindowFlags(FLAGS)
+        self.window.show()
+        self.window.winId()
+        self.guardian = StayOnTopGuardian(self.window, FLAGS, watchdog_interval_ms=60000)
+        self.app.processEvents()
+
+    def tearDown(self):
+        self.window.removeEventFilter(self.guardian)
+        self.window.deleteLater()
+        self.app.processEvents()
+
+    def test_check_with_flags_intact_does_not_recreate(self):
+        for _ in range(10):
+            self.guardian.check()
+        self.app.processEvents()
+        self.assertEqual(self.guardian.reapply_count, 0)
+        self.assertEqual(self.guardian.recreate_count, 0)
+        self.assertEqual(self.guardian.raise_count, 10)
+
+    def test_hidden_window_is_restored(self):
+        self.window.hide()
+        self.app.processEvents()
+        self.assertTrue(self.window.isVisible())
+        self.assertEqual(self.guardian.restore_count, 1)
+
+    def test_app_requested_hide_is_not_restored(self):
+        self.guardian.hide_window()
+        self.app.processEvents()
+        self.guardian.check()
+        self.app.processEvents()
+        self.assertFalse(self.window.isVisible())
+        self.assertEqual(self.guardian.restore_count, 0)
+
+        # 程序重新显示后恢复守护：之后被外部隐藏仍会找回来
+        self.window.show()
+        self.app.processEvents()
+        self.assertFalse(self.guardian.hidden_by_app)
+        self.window.hide()
+        self.app.processEvents()
+        self.assertTrue(self.window.isVisible())
+        self.assertEqual(self.guardian.restore_count, 1)
+
+    def test_app_requested_minimize_is_not_restored(self):
+        self.guardian.minimize_window()
+        self.app.processEvents()
+        self.guardian.check()
+        self.app.processEvents()
+        self.assertTrue(self.window.isMinimized())
+        self.assertEqual(self.guardian.restore_count, 0)
+
+    def test_lost_flags_are_reapplied_once(self):
+        self.window.setWindowFlags(Qt.FramelessWindowHint | Qt.Tool)
+        self.window.show()
+        self.app.processEvents()
+        recreated_before = self.guardian.recreate_count
+        self.guardian.check()
+        self.app.processEvents()
+        self.assertEqual(self.guardian.reapply_count, 1)
+        self.assertTrue(self.window.windowFlags() & Qt.WindowStaysOnTopHint)
+        self.assertTrue(self.window.isVisible())
+        self.assertEqual(self.guardian.recreate_count, recreated_before + 1)
+        self.guardian.check()
+        self.assertEqual(self.guardian.reapply_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
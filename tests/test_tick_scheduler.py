@@ -0,0 +1,95 @@
+import time
+import unittest
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from app.ui.tick_scheduler import TickScheduler, ms_until_display_change
+
+
+class TestMsUntilDisplayChange(unittest.TestCase):
+    """秒数跳变对齐：醒来时 '{:.0f}' 显示值恰好已经变化。"""
+
+    def test_values(self):
+        self.assertEqual(ms_until_display_change(10400), 901)
+        self.assertEqual(ms_until_display_change(10500), 1)
+        self.assertEqual(ms_until_display_change(10501), 2)
+        self.assertEqual(ms_until_display_change(499), 500)
+        self.assertEqual(ms_until_display_change(0), 1)
+
+    def test_display_changes_after_wait(self):
+        # 恰好 .5 秒时 format 按银行家舍入，显示值可能不变，跳过这些点
+        for remaining in range(501, 5000, 37):
+            before = '{:.0f}'.format(remaining / 1000.0)
+            after = '{:.0f}'.format((remaining - ms_until_display_change(remaining)) / 1000.0)
+            self.assertNotEqual(before, after, remaining)
+
+
+class TestTickScheduler(unittest.TestCase):
+    """单次定时器按回调返回的延迟唤醒，窗口隐藏时停摆。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.widget = QWidget()
+        self.widget.show()
+        self.app.processEvents()
+        self.ticks = []
+        self.delay = 30
+        self.scheduler = TickScheduler(self.widget, self._callback)
+
+    def tearDown(self):
+        self.widget.removeEventFilter(self.scheduler)
+        self.widget.deleteLater()
+        self.app.processEvents()
+
+    def _callback(self):
+        self.ticks.append(time.monotonic())
+        return self.delay
+
+    def _spin(self, seconds):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def test_ticks_follow_returned_delay(self):
+        self.delay = 10 ** 6  # 回调要求很久以后再醒（会被 MAX_TICK_MS 截断）
+        self.scheduler.start()
+        self._spin(0.2)
+        self.assertEqual(len(self.ticks), 1)
+
+    def test_wake_forces_tick(self):
+        self.delay = 10 ** 6
+        self.scheduler.start()
+        self._spin(0.05)
+        self.scheduler.wake()
+        self._spin(0.05)
+        self.assertEqual(len(self.ticks), 2)
+
+    def test_suspends_when_hidden_and_resumes_on_show(self):
+        suspended, resumed = [], []
+        self.scheduler.suspended.connect(lambda: suspended.append(1))
+        self.scheduler.resumed.connect(lambda: resumed.append(1))
+        self.scheduler.start()
+        self._spin(0.1)
+        self.assertGreater(len(self.ticks), 1)
+
+        self.widget.hide()
+        self._spin(0.02)
+        self.assertTrue(self.scheduler.is_suspended)
+        count = len(self.ticks)
+        self._spin(0.15)
+        self.assertEqual(len(self.ticks), count)
+        self.assertEqual(suspended, [1])
+
+        self.widget.show()
+        self._spin(0.1)
+        self.assertFalse(self.scheduler.is_suspended)
+        self.assertEqual(resumed, [1])
+        self.assertGreater(len(self.ticks), count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
+import os
 import sys
+import shutil
+import tempfile
 import unittest
 import datetime
 from unittest.mock import patch, MagicMock
-from app.services.time_service import time_service
+from app.services.time_service import TimeService, time_service
 
 
 class TestTimeService(unittest.TestCase):
@@ -123,5 +126,68 @@ class TestTimeService(unittest.TestCase):
             self.assertTrue(result)
 
 
+class TestTimeServiceJournal(unittest.TestCase):
+    """启动时间持久化：二进制日志读写与旧 start_time.txt 迁移。"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.text_path = os.path.join(self.tmp, "start_time.txt")
+        self.service = TimeService(start_time_file=self.text_path,
+                                   journal_file=os.path.join(self.tmp, "start_time.journal"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_write_then_read(self):
+        start = datetime.datetime(2026, 7, 27, 9, 0, 0, 42)
+        self.service.write_start_time(start)
+        self.assertEqual(self.service.get_last_start_time(), start)
+        self.assertEqual(self.service.get_start_time_for_date(start.date()), start)
+
+    def test_migrates_legacy_text_file(self):
+        with open(self.text_path, "w") as f:
+            f.write("2026-07-26 08:00:00.000000\n2026-07-27 09:15:00.000000\n")
+        self.assertEqual(self.service.get_last_start_time(),
+                         datetime.datetime(2026, 7, 27, 9, 15))
+        self.assertEqual(self.service.get_start_time_for_date(datetime.date(2026, 7, 26)),
+                         datetime.datetime(2026, 7, 26, 8, 0))
+
+    def test_falls_back_to_text_file_without_journal(self):
+        """日志无法创建时，倒序读取旧文本文件，末尾坏行不会导致重置。"""
+        with open(self.text_path, "w") as f:
+            f.write("2026-07-27 09:15:00.000000\ngarbage\n")
+        with patch.object(self.service.journal, "write_all", side_effect=OSError("read-only")):
+            self.assertEqual(self.service.get_last_start_time(),
+                             datetime.datetime(2026, 7, 27, 9, 15))
+
+    def test_unusable_journal_falls_back_to_text_file(self):
+        """日志文件存在但文件头损坏 / 没有有效记录：仍退回旧文本文件。"""
+        with open(self.text_path, "w") as f:
+            f.write("2026-07-27 09:15:00.000000\n")
+        with open(self.service.journal.path, "wb") as f:
+            f.write(b"garbage header")
+        self.assertEqual(self.service.get_last_start_time(),
+                         datetime.datetime(2026, 7, 27, 9, 15))
+
+    def test_failed_migration_is_retried(self):
+        """迁移失败时不新建只有今天的日志，下次调用重试并带上旧历史。"""
+        with open(self.text_path, "w") as f:
+            f.write("2026-07-26 08:00:00.000000\n")
+        today = datetime.datetime(2026, 7, 27, 9, 15, 0, 7)
+        with patch.object(self.service.journal, "write_all", side_effect=OSError("disk full")):
+            self.service.write_start_time(today)
+        self.assertFalse(self.service.journal.exists())
+
+        self.assertEqual(self.service.get_last_start_time(), today)
+        self.assertEqual(self.service.get_start_time_for_date(datetime.date(2026, 7, 26)),
+                         datetime.datetime(2026, 7, 26, 8, 0))
+        self.assertEqual(len(self.service.journal), 2)
+
+    def test_is_first_start_of_day_after_write(self):
+        self.assertTrue(self.service.is_first_start_of_day())
+        self.service.write_start_time(datetime.datetime.now())
+        self.assertFalse(self.service.is_first_start_of_day())
+
+
 if __name__ == '__main__':
     unittest.main()
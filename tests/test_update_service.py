@@ -0,0 +1,722 @@
+import importlib
+import json
+import os
+import random
+import shutil
+import socket
+import ssl
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from app.services.update_service import API_RETRY, HttpClient, UpdateService, _race_request
+from app.utils.mirror_stats import MirrorScoreboard
+from app.utils.release_cache import ReleaseCache
+from app.utils.ranged_download import DownloadFailed, SegmentedDownload
+
+# app.services 把同名的模块级实例导出了，属性访问拿到的是实例而不是模块
+update_module = importlib.import_module("app.services.update_service")
+
+PAYLOAD = b"MZ" + bytes(range(256)) * 400   # 假 exe：PE 文件头 + 约 100KB 内容
+
+
+class _MirrorHandler(BaseHTTPRequestHandler):
+    """按路径第一段模拟不同状态的镜像：/healthy /slow /hang /stall /html /error。"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_exe(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def do_GET(self):
+        server = self.server
+        kind = self.path.strip("/").split("/", 1)[0]
+        server.hits.append(kind)
+        if kind == "healthy":
+            self._send_exe()
+        elif kind == "slow":
+            # 连上了但迟迟不给响应（被限速的直连）
+            if not server.stop.wait(server.slow_delay):
+                self._send_exe()
+        elif kind == "hang":
+            server.stop.wait(10)   # 接受连接后不再有任何回应
+        elif kind == "stall":
+            # 响应头马上给，正文卡住；客户端放弃后连接会被关闭
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(PAYLOAD)))
+            self.end_headers()
+            self.wfile.flush()
+            self.connection.settimeout(10)
+            try:
+                self.connection.recv(1)
+            except OSError:
+                pass
+            server.stall_closed.set()
+        elif kind == "html":
+            body = b"<html><body>rate limited</body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(502)
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass   # 竞速输家 / 分段重试会主动断开连接，服务端写失败是预期内的
+
+
+def _use_temp_scoreboard(test):
+    """每个用例一份空的镜像记分板，不碰真实的 mirror_stats.json，用例之间互不影响。
+
+    要在替换 tempfile.gettempdir 之前调用，否则目录会建在下载目录里。
+    """
+    stats_dir = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, stats_dir, ignore_errors=True)
+    scoreboard = MirrorScoreboard(os.path.join(stats_dir, "mirror_stats.json"))
+    patch = mock.patch.object(update_module, "mirror_scoreboard", scoreboard)
+    patch.start()
+    test.addCleanup(patch.stop)
+    return scoreboard
+
+
+def _use_temp_release_cache(test, clock=time.time):
+    """每个用例一份空的版本信息缓存（同样要在替换 gettempdir 之前调用）。"""
+    cache_dir = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+    cache = ReleaseCache(os.path.join(cache_dir, "release_cache.json"), clock=clock)
+    patch = mock.patch.object(update_module, "release_cache", cache)
+    patch.start()
+    test.addCleanup(patch.stop)
+    return cache
+
+
+def _use_fresh_http_client(test, **kwargs):
+    """每个用例一个新的共享会话，连接池不会留着别的用例里已关掉的服务器。"""
+    client = HttpClient(**kwargs)
+    patch = mock.patch.object(update_module, "http_client", client)
+    patch.start()
+    test.addCleanup(patch.stop)
+    test.addCleanup(client.close)
+    return client
+
+
+def _refused_url():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"http://127.0.0.1:{port}"
+
+
+class TestMirrorRace(unittest.TestCase):
+    """本地 HTTP 替身服务器模拟慢 / 死 / 健康的镜像，验证竞速下载。"""
+
+    def setUp(self):
+        self.server = _QuietServer(("127.0.0.1", 0), _MirrorHandler)
+        self.server.hits = []
+        self.server.stop = threading.Event()
+        self.server.stall_closed = threading.Event()
+        self.server.slow_delay = 3.0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.tmpdir = tempfile.mkdtemp()
+        self.scoreboard = _use_temp_scoreboard(self)
+        _use_fresh_http_client(self)
+        self.temp_patch = mock.patch.object(update_module.tempfile, "gettempdir",
+                                            return_value=self.tmpdir)
+        self.temp_patch.start()
+
+    def tearDown(self):
+        self.temp_patch.stop()
+        self.server.stop.set()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _url(self, kind):
+        return f"{self.base}/{kind}"
+
+    def _download(self, direct, mirrors, **kwargs):
+        """直连地址 direct，镜像 mirrors（都是路径类型名或完整 URL）。"""
+        direct_url = (direct if "://" in direct else self._url(direct)) + "/MiniTools.exe"
+        mirror_urls = [m if "://" in m else self._url(m) for m in mirrors]
+        service = UpdateService()
+        with mock.patch.object(UpdateService, "GITHUB_DOWNLOAD_URL", direct_url), \
+                mock.patch.object(update_module, "GITHUB_PROXY_MIRRORS", mirror_urls):
+            start = time.monotonic()
+            result = service.download_update(**kwargs)
+            return result, time.monotonic() - start
+
+    def _assert_downloaded(self, result):
+        ok, path, error = result
+        self.assertTrue(ok, error)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), PAYLOAD)
+
+    def test_healthy_mirror_beats_slow_direct(self):
+        result, elapsed = self._download("slow", ["healthy"])
+        self._assert_downloaded(result)
+        self.assertLess(elapsed, 2.0)   # 不等慢直连的 3 秒
+
+    def test_dead_and_bad_mirrors_are_skipped(self):
+        result, elapsed = self._download(_refused_url(), ["hang", "html", "error", "healthy"])
+        self._assert_downloaded(result)
+        self.assertLess(elapsed, 2.0)   # 不等挂起的镜像超时
+
+    def test_sequential_mode_waits_for_slow_direct(self):
+        self.server.slow_delay = 0.5
+        result, elapsed = self._download("slow", ["healthy"], race=False)
+        self._assert_downloaded(result)
+        self.assertGreaterEqual(elapsed, 0.5)
+        self.assertEqual(self.server.hits, ["slow"])
+
+    def test_all_mirrors_invalid(self):
+        (ok, path, error), _ = self._download("html", ["error"])
+        self.assertFalse(ok)
+        self.assertIsNone(path)
+        self.assertRegex(error, "HTTP 502|Invalid content")
+        self.assertFalse(os.listdir(self.tmpdir))
+
+    def test_window_refills_after_failures(self):
+        urls = [self._url("error"), self._url("html"), self._url("error"), self._url("healthy")]
+        validate = lambda data: data.startswith(b"MZ")   # noqa: E731
+        response, url, first, chunks = _race_request(urls, timeout=5, width=2, validate=validate)
+        with response:
+            self.assertEqual(url, urls[3])
+            self.assertEqual(first + b"".join(chunks), PAYLOAD)
+
+        # 宽度为 1 时退化成顺序尝试：前一个失败了才发出下一个
+        self.server.hits.clear()
+        response, url, _, _ = _race_request(urls, timeout=5, width=1, validate=validate)
+        response.close()
+        self.assertEqual(self.server.hits, ["error", "html", "error", "healthy"])
+
+    def test_losers_are_cancelled(self):
+        self.server.slow_delay = 0.3
+        result, _ = self._download("stall", ["slow"])
+        self._assert_downloaded(result)
+        # 卡住的直连已经送来响应头，胜者决出后它的连接被主动关闭
+        # （服务器端自己的超时是 10 秒）
+        self.assertTrue(self.server.stall_closed.wait(5))
+
+    def test_losers_are_cancelled_keep_alive(self):
+        # HTTP/1.1 长连接下 socket 还挂在连接对象上，走另一条关闭路径
+        with mock.patch.object(_MirrorHandler, "protocol_version", "HTTP/1.1"):
+            self.test_losers_are_cancelled()
+
+    def test_scoreboard_moves_failing_direct_behind_mirror(self):
+        result, _ = self._download("error", ["healthy"], race=False)
+        self._assert_downloaded(result)
+        self.assertEqual(self.server.hits, ["error", "healthy"])
+
+        mirror = self._url("healthy")
+        self.assertTrue(self.scoreboard.in_backoff("direct"))
+        stats = self.scoreboard.get(mirror)
+        self.assertEqual((stats["successes"], stats["attempts"]), (1, 1))
+        self.assertIsNotNone(stats["ttfb"])
+        self.assertGreater(stats["throughput"], 0)
+        # 下载结束时已写盘，重新加载也能看到
+        reloaded = MirrorScoreboard(self.scoreboard.path)
+        self.assertEqual(reloaded.get("direct")["consecutive_failures"], 1)
+
+        # 下一次先试表现好的镜像，退避中的直连排到最后
+        self.server.hits.clear()
+        result, _ = self._download("error", ["healthy"], race=False)
+        self._assert_downloaded(result)
+        self.assertEqual(self.server.hits, ["healthy"])
+
+
+BIG_PAYLOAD = b"MZ" + random.Random(7).randbytes(1024 * 1024)
+SEGMENT = 64 * 1024
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """支持 Range 的镜像，可注入断线 / 故障。
+
+    /ranged    正常分段；/norange 不声明 Accept-Ranges；
+    /liar      声明支持但对 Range 请求仍返回 200 全量；
+    /rangefail 普通 GET 正常，Range 请求一律 503；
+    /drop      每个 Range 请求都只发一半就断开。
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_full(self, kind):
+        server = self.server
+        self.send_response(200)
+        if kind != "norange":
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(server.payload)))
+        self.end_headers()
+        self.wfile.write(server.payload)
+
+    def do_GET(self):
+        server = self.server
+        kind = self.path.strip("/").split("/", 1)[0]
+        header = self.headers.get("Range")
+        if header is None or kind in ("norange", "liar"):
+            with server.lock:
+                server.full_requests.append((kind, header))
+            self._send_full(kind)
+            return
+        with server.lock:
+            server.range_requests.append((kind, header))
+            failing = kind == "rangefail" or (
+                server.fail_after is not None and len(server.range_requests) > server.fail_after)
+            drop = not failing and (kind == "drop" or server.drop_next > 0)
+            if drop and kind != "drop":
+                server.drop_next -= 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if failing:
+                self.send_error(503)
+                return
+            start, end = (int(v) for v in header.split("=", 1)[1].split("-"))
+            body = server.payload[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(server.payload)}")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", server.etag)
+            self.end_headers()
+            time.sleep(0.005)   # 让几条连接有机会同时在途
+            if drop:
+                body = body[:len(body) // 2]   # 发一半就断开
+                self.close_connection = True
+            self.wfile.write(body)
+            self.wfile.flush()
+            with server.lock:
+                server.range_bytes += len(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+class TestSegmentedDownload(unittest.TestCase):
+    """本地支持 Range 的替身服务器：多连接、断线续传、清单续传、回退单连接。"""
+
+    def setUp(self):
+        self.server = _QuietServer(("127.0.0.1", 0), _RangeHandler)
+        self.server.lock = threading.Lock()
+        self.server.payload = BIG_PAYLOAD
+        self.server.etag = '"v1"'
+        self._reset_counters()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.tmpdir = tempfile.mkdtemp()
+        _use_temp_scoreboard(self)
+        _use_fresh_http_client(self)
+        self.patches = [
+            mock.patch.object(update_module.tempfile, "gettempdir", return_value=self.tmpdir),
+            mock.patch.object(update_module, "DOWNLOAD_SEGMENT_SIZE", SEGMENT),
+            mock.patch.object(update_module, "SEGMENTED_MIN_BYTES", 2 * SEGMENT),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _reset_counters(self):
+        server = self.server
+        server.full_requests = []
+        server.range_requests = []
+        server.range_bytes = 0
+        server.drop_next = 0
+        server.fail_after = None
+        server.active = 0
+        server.max_active = 0
+
+    def _download(self, direct, mirrors=()):
+        direct_url = f"{self.base}/{direct}/MiniTools.exe"
+        mirror_urls = [f"{self.base}/{m}" for m in mirrors]
+        with mock.patch.object(UpdateService, "GITHUB_DOWNLOAD_URL", direct_url), \
+                mock.patch.object(update_module, "GITHUB_PROXY_MIRRORS", mirror_urls):
+            return UpdateService().download_update()
+
+    def _assert_downloaded(self, result, payload=BIG_PAYLOAD):
+        ok, path, error = result
+        self.assertTrue(ok, error)
+        with open(path, "rb") as f:
+            self.assertTrue(f.read() == payload, "downloaded bytes differ from payload")
+        # 完成后只留下最终文件
+        self.assertEqual(os.listdir(self.tmpdir), [os.path.basename(path)])
+
+    def _manifest(self):
+        path = os.path.join(self.tmpdir, "MiniTools_new.exe.part.json")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _manifest_at(self, dest):
+        with open(dest + ".part.json", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_parallel_segments(self):
+        self._assert_downloaded(self._download("ranged"))
+        self.assertEqual(len(self.server.range_requests), len(BIG_PAYLOAD) // SEGMENT + 1)
+        self.assertGreater(self.server.max_active, 1)
+        self.assertEqual(self.server.range_bytes, len(BIG_PAYLOAD))
+
+    def test_disconnects_resume_from_offset(self):
+        self.server.drop_next = 5
+        self._assert_downloaded(self._download("ranged"))
+        # 断线后从断点续传：不是分片起点的 Range 请求出现了，而且没有整片重下
+        starts = [int(h.split("=")[1].split("-")[0]) for _, h in self.server.range_requests]
+        self.assertTrue(any(start % SEGMENT for start in starts))
+        self.assertLess(self.server.range_bytes, len(BIG_PAYLOAD) + 5 * SEGMENT // 2 + 1)
+
+    def test_resume_after_outage(self):
+        self.server.fail_after = 6
+        ok, path, error = self._download("ranged")
+        self.assertFalse(ok)
+        self.assertIn("resume", error)
+        done = self._manifest()["done"]
+        self.assertGreaterEqual(len(done), 1)
+
+        self._reset_counters()
+        self._assert_downloaded(self._download("ranged"))
+        # 第二次只下载缺的分片
+        self.assertLessEqual(self.server.range_bytes, len(BIG_PAYLOAD) - len(done) * SEGMENT)
+
+    def test_remote_change_discards_partial(self):
+        self.server.fail_after = 6
+        self.assertFalse(self._download("ranged")[0])
+        self.server.payload = b"MZ" + random.Random(8).randbytes(len(BIG_PAYLOAD) - 2)
+        self.server.etag = '"v2"'
+        self._reset_counters()
+        self._assert_downloaded(self._download("ranged"), payload=self.server.payload)
+        self.assertEqual(self.server.range_bytes, len(BIG_PAYLOAD))
+
+    def test_failover_to_other_mirror(self):
+        # 第一个地址的 Range 请求全部失败，分片改从下一个镜像下载
+        # （直接用 SegmentedDownload：经过竞速的话胜者不一定是第一个地址）
+        dest = os.path.join(self.tmpdir, "file.bin")
+        urls = [f"{self.base}/rangefail/file.bin", f"{self.base}/ranged/file.bin"]
+        SegmentedDownload(urls, dest, len(BIG_PAYLOAD), {"etag": '"v1"', "last_modified": None},
+                          segment_size=SEGMENT).run()
+        with open(dest, "rb") as f:
+            self.assertTrue(f.read() == BIG_PAYLOAD)
+        kinds = {kind for kind, _ in self.server.range_requests}
+        self.assertEqual(kinds, {"rangefail", "ranged"})
+
+    def test_fallback_mirror_ignoring_range_is_skipped(self):
+        # 第一个地址一直断线，分片换到备用镜像；不支持 Range 的备用镜像只算这个地址失败，
+        # 不会结束整个下载（更不会删掉已下载的分片）
+        dest = os.path.join(self.tmpdir, "file.bin")
+        urls = [f"{self.base}/drop/file.bin", f"{self.base}/liar/file.bin",
+                f"{self.base}/ranged/file.bin"]
+        SegmentedDownload(urls, dest, len(BIG_PAYLOAD), {"etag": '"v1"', "last_modified": None},
+                          connections=1, segment_size=SEGMENT).run()
+        with open(dest, "rb") as f:
+            self.assertTrue(f.read() == BIG_PAYLOAD)
+        self.assertIn("liar", {kind for kind, _ in self.server.full_requests})
+        self.assertIn("ranged", {kind for kind, _ in self.server.range_requests})
+
+    def test_fallback_ignoring_range_keeps_partial(self):
+        dest = os.path.join(self.tmpdir, "file.bin")
+        validator = {"etag": '"v1"', "last_modified": None}
+        self.server.fail_after = 4
+        with self.assertRaises(DownloadFailed):
+            SegmentedDownload([f"{self.base}/ranged/file.bin"], dest, len(BIG_PAYLOAD), validator,
+                              connections=1, segment_size=SEGMENT).run()
+        done = self._manifest_at(dest)["done"]
+        self.assertTrue(done)
+
+        self._reset_counters()
+        urls = [f"{self.base}/drop/file.bin", f"{self.base}/liar/file.bin"]
+        with self.assertRaises(DownloadFailed):
+            SegmentedDownload(urls, dest, len(BIG_PAYLOAD), validator,
+                              connections=1, segment_size=SEGMENT).run()
+        # 仍然可以续传：清单和 .part 都还在，已完成的分片一个没少
+        self.assertTrue(set(done) <= set(self._manifest_at(dest)["done"]))
+        self.assertTrue(os.path.exists(dest + ".part"))
+
+    def test_falls_back_when_range_ignored(self):
+        self._assert_downloaded(self._download("liar"))
+        # 探测一次 + 分段试探一次（拿到 200）+ 退回单连接一次
+        self.assertGreaterEqual(len(self.server.full_requests), 2)
+
+    def test_no_accept_ranges_streams(self):
+        self._assert_downloaded(self._download("norange"))
+        self.assertEqual(self.server.range_requests, [])
+        self.assertEqual(self.server.full_requests, [("norange", None)])
+
+    def test_manifest_cross_run_segments(self):
+        # 直接用 SegmentedDownload：清单里标记完成的分片不会再请求
+        dest = os.path.join(self.tmpdir, "file.bin")
+        url = f"{self.base}/ranged/file.bin"
+        first = SegmentedDownload([url], dest, len(BIG_PAYLOAD), {"etag": '"v1"', "last_modified": None},
+                                  connections=2, segment_size=SEGMENT)
+        self.server.fail_after = 4
+        with self.assertRaises(Exception):
+            first.run()
+        self._reset_counters()
+        second = SegmentedDownload([url], dest, len(BIG_PAYLOAD), {"etag": '"v1"', "last_modified": None},
+                                   connections=2, segment_size=SEGMENT)
+        second.run()
+        self.assertEqual(second.resumed_bytes + second.downloaded_bytes, len(BIG_PAYLOAD))
+        self.assertGreater(second.resumed_bytes, 0)
+        with open(dest, "rb") as f:
+            self.assertTrue(f.read() == BIG_PAYLOAD)
+
+
+CERT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "localhost.pem")
+
+
+class _TlsHandler(_RangeHandler):
+    """_RangeHandler 加上 /api：模拟 GitHub releases 接口，可注入 503。"""
+
+    def do_GET(self):
+        server = self.server
+        if not self.path.startswith("/api"):
+            super().do_GET()
+            return
+        with server.lock:
+            server.api_requests += 1
+            failing = server.api_failures > 0
+            if failing:
+                server.api_failures -= 1
+        if failing:
+            self.send_error(503)
+            return
+        body = json.dumps({"tag_name": "v99.0.0"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _TlsServer(_QuietServer):
+    """HTTPS 替身服务器，每完成一次 TLS 握手计一次数（= 客户端新建的连接数）。"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _TlsHandler)
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(CERT_FILE)
+        self.lock = threading.Lock()
+        self.handshakes = 0
+        self.api_requests = 0
+        self.api_failures = 0
+
+    def get_request(self):
+        sock, address = super().get_request()
+        # 握手失败抛出的 OSError 由 socketserver 忽略，不计数
+        tls_sock = self.context.wrap_socket(sock, server_side=True)
+        with self.lock:
+            self.handshakes += 1
+        return tls_sock, address
+
+
+class TestConnectionReuse(unittest.TestCase):
+    """共享会话：重复检查、下载复用已握手的连接；接口失败按策略退避重试。"""
+
+    def setUp(self):
+        self.server = _TlsServer()
+        self.server.payload = BIG_PAYLOAD
+        self.server.etag = '"v1"'
+        TestSegmentedDownload._reset_counters(self)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"https://127.0.0.1:{self.server.server_address[1]}"
+        self.tmpdir = tempfile.mkdtemp()
+        _use_temp_scoreboard(self)
+        _use_temp_release_cache(self)
+        # 重试不等待，用例不被退避拖慢
+        self.client = _use_fresh_http_client(
+            self, verify=CERT_FILE, api_retry=dict(API_RETRY, backoff_factor=0))
+        self.patches = [
+            mock.patch.object(update_module.tempfile, "gettempdir", return_value=self.tmpdir),
+            mock.patch.object(update_module, "DOWNLOAD_SEGMENT_SIZE", SEGMENT),
+            mock.patch.object(update_module, "SEGMENTED_MIN_BYTES", 2 * SEGMENT),
+            mock.patch.object(update_module, "GITHUB_PROXY_MIRRORS", []),
+            mock.patch.object(UpdateService, "GITHUB_API_URL", f"{self.base}/api/releases/latest"),
+            mock.patch.object(UpdateService, "get_current_version", return_value="1.0.0"),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _download(self, kind):
+        with mock.patch.object(UpdateService, "GITHUB_DOWNLOAD_URL",
+                               f"{self.base}/{kind}/MiniTools.exe"):
+            ok, path, error = UpdateService().download_update()
+        self.assertTrue(ok, error)
+        with open(path, "rb") as f:
+            self.assertTrue(f.read() == self.server.payload, "downloaded bytes differ from payload")
+
+    def test_repeated_checks_use_one_handshake(self):
+        service = UpdateService()
+        for _ in range(3):
+            self.assertEqual(service.check_for_updates(max_age=0), (True, "99.0.0", "1.0.0"))
+        self.assertEqual(self.server.api_requests, 3)
+        self.assertEqual(self.server.handshakes, 1)
+
+        # 对照：不带会话的 requests.get 每次都重新握手
+        import requests
+        for _ in range(2):
+            requests.get(f"{self.base}/api/releases/latest", verify=CERT_FILE, timeout=5).close()
+        self.assertEqual(self.server.handshakes, 3)
+
+    def test_check_and_stream_downloads_share_connection(self):
+        self.server.payload = PAYLOAD   # 小于 SEGMENTED_MIN_BYTES，单连接下载
+        self.assertTrue(UpdateService().check_for_updates(max_age=0)[0])
+        self._download("norange")
+        self._download("norange")
+        self.assertTrue(UpdateService().check_for_updates(max_age=0)[0])
+        # 这里接口和下载是同一个主机：检查、竞速、下载全程只握手一次
+        self.assertEqual(self.server.handshakes, 1)
+
+    def test_segmented_downloads_reuse_pool(self):
+        self._download("ranged")
+        first = self.server.handshakes
+        # 竞速探测连接被主动断开 + 分段连接最多 DOWNLOAD_CONNECTIONS 条
+        self.assertLessEqual(first, 1 + update_module.DOWNLOAD_CONNECTIONS)
+        self._download("ranged")
+        # 第二次下载用池里的空闲连接，只需补上被断开的探测连接
+        self.assertLessEqual(self.server.handshakes - first, 1)
+        self.assertEqual(len(self.server.range_requests), 2 * (len(BIG_PAYLOAD) // SEGMENT + 1))
+
+    def test_api_retries_on_503(self):
+        self.server.api_failures = 2
+        self.assertTrue(UpdateService().check_for_updates(max_age=0)[0])
+        self.assertEqual(self.server.api_requests, 3)
+
+    def test_api_gives_up_after_retry_budget(self):
+        self.server.api_failures = 10
+        self.assertEqual(UpdateService().check_for_updates(max_age=0), (False, None, "1.0.0"))
+        self.assertEqual(self.server.api_requests, 1 + API_RETRY["status"])
+
+
+class _ReleaseHandler(BaseHTTPRequestHandler):
+    """模拟 releases/latest：带 ETag / Last-Modified，支持条件请求。"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.headers.get("If-None-Match"),
+                                self.headers.get("If-Modified-Since")))
+        if self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"tag_name": server.tag, "assets": [], "body": "notes"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", server.etag)
+        self.send_header("Last-Modified", "Sat, 17 Oct 2026 08:00:00 GMT")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestReleaseCheckCache(unittest.TestCase):
+    """版本检查缓存：TTL 内不联网，过期后条件请求，304 沿用缓存。"""
+
+    TTL = 3600
+
+    def setUp(self):
+        self.server = _QuietServer(("127.0.0.1", 0), _ReleaseHandler)
+        self.server.requests = []
+        self.server.tag = "v99.0.0"
+        self.server.etag = '"r1"'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/repos/x/releases/latest"
+        self.now = 1_000_000.0
+        self.cache = _use_temp_release_cache(self, clock=lambda: self.now)
+        _use_fresh_http_client(self)
+        self.patches = [
+            mock.patch.object(UpdateService, "GITHUB_API_URL", self.url),
+            mock.patch.object(UpdateService, "get_current_version", return_value="1.0.0"),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _check(self):
+        return UpdateService().check_for_updates(max_age=self.TTL)
+
+    def test_checks_within_ttl_skip_network(self):
+        for _ in range(3):
+            self.assertEqual(self._check(), (True, "99.0.0", "1.0.0"))
+        self.assertEqual(self.server.requests, [(None, None)])
+        # 换一个实例（相当于重启应用）读到同一份缓存
+        entry = ReleaseCache(self.cache.path).get(self.url)
+        self.assertEqual(entry["data"], {"tag_name": "v99.0.0"})
+        self.assertEqual(entry["etag"], '"r1"')
+
+    def test_expired_cache_revalidates_with_304(self):
+        self._check()
+        self.now += self.TTL + 1
+        self.assertEqual(self._check(), (True, "99.0.0", "1.0.0"))
+        self.assertEqual(self.server.requests[1],
+                         ('"r1"', "Sat, 17 Oct 2026 08:00:00 GMT"))
+        # 304 刷新了确认时间，紧接着的检查又不联网了
+        self.now += 10
+        self._check()
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_new_release_replaces_cache(self):
+        self._check()
+        self.server.tag, self.server.etag = "v100.0.0", '"r2"'
+        self.now += self.TTL + 1
+        self.assertEqual(self._check(), (True, "100.0.0", "1.0.0"))
+        self.assertEqual(self.cache.get(self.url)["etag"], '"r2"')
+
+    def test_zero_ttl_always_revalidates(self):
+        UpdateService().check_for_updates(max_age=0)
+        UpdateService().check_for_updates(max_age=0)
+        self.assertEqual(self.server.requests, [(None, None), ('"r1"', "Sat, 17 Oct 2026 08:00:00 GMT")])
+
+    def test_cached_release_compared_with_current_version(self):
+        self._check()
+        with mock.patch.object(UpdateService, "get_current_version", return_value="99.0.0"):
+            self.assertEqual(self._check(), (False, "99.0.0", "99.0.0"))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_cache_for_other_url_is_ignored(self):
+        self.cache.store("https://api.github.com/repos/other/releases/latest",
+                         {"tag_name": "v1.0.0"}, {"ETag": '"r1"'})
+        self.assertEqual(self._check(), (True, "99.0.0", "1.0.0"))
+        self.assertEqual(self.server.requests, [(None, None)])
+
+
+if __name__ == "__main__":
+    unittest.main()